@@ -3,10 +3,19 @@
 from functools import lru_cache
 from pathlib import Path
 
+from core.data.resample import BarResampler
+
 from ...config import get_settings
 from ...config.settings import AppSettings
 from ...services.registry import ServiceRegistry
-from ...services import BacktestingService, InstrumentsService, TradingService, MotilalBrokerService
+from ...services import (
+    BacktestingService,
+    BacktestJobService,
+    HistorySyncService,
+    InstrumentsService,
+    MotilalBrokerService,
+    TradingService,
+)
 from ...services.webhooks import WebhookService
 
 
@@ -32,6 +41,10 @@ def get_backtesting_service() -> BacktestingService:
     return _get_registry().backtesting_service
 
 
+def get_backtest_job_service() -> BacktestJobService:
+    return _get_registry().backtest_job_service
+
+
 def get_instruments_service() -> InstrumentsService:
     return _get_registry().instruments_service
 
@@ -44,3 +57,9 @@ def get_motilal_service() -> MotilalBrokerService:
     return _get_registry().motilal_service
 
 
+def get_history_sync_service() -> HistorySyncService:
+    return _get_registry().history_sync_service
+
+
+def get_bar_resampler() -> BarResampler:
+    return _get_registry().bar_resampler
@@ -7,6 +7,7 @@ from . import (
     routes_backtests,
     routes_brokers,
     routes_health,
+    routes_history,
     routes_instruments,
     routes_orders,
     routes_webhooks,
@@ -20,5 +21,6 @@ router.include_router(routes_orders.router, prefix="/orders", tags=["orders"])
 router.include_router(routes_backtests.router, prefix="/backtests", tags=["backtests"])
 router.include_router(routes_webhooks.router, prefix="/webhooks", tags=["webhooks"])
 router.include_router(routes_brokers.router, prefix="/brokers", tags=["brokers"])
+router.include_router(routes_history.router, prefix="/history", tags=["history"])
 
 
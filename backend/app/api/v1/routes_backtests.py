@@ -1,9 +1,22 @@
 """Backtest endpoints."""
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 
-from ...schemas.backtests import BacktestRequest, BacktestResponse
-from ..deps.dependencies import get_backtesting_service
+from ...schemas.backtests import (
+    BacktestCacheStats,
+    BacktestJob,
+    BacktestJobStatus,
+    BacktestRequest,
+    BacktestResponse,
+    BacktestSweepRequest,
+    BacktestSweepResponse,
+    MonteCarloRequest,
+    MonteCarloResponse,
+)
+from ...services.backtesting import BacktestNotFound
+from ...services.jobs import BacktestQueueFull
+from ..deps.dependencies import get_backtest_job_service, get_backtesting_service
 
 router = APIRouter()
 
@@ -13,3 +26,78 @@ def run_backtest(request: BacktestRequest, service=Depends(get_backtesting_servi
     return service.run_backtest(request)
 
 
+@router.get("/cache", response_model=BacktestCacheStats)
+def backtest_cache_stats(service=Depends(get_backtesting_service)) -> BacktestCacheStats:
+    return service.cache_stats()
+
+
+@router.post("/sweeps", response_model=BacktestSweepResponse)
+def run_sweep(request: BacktestSweepRequest, service=Depends(get_backtesting_service)) -> BacktestSweepResponse:
+    try:
+        return service.run_sweep(request)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.post("/monte-carlo", response_model=MonteCarloResponse)
+def run_monte_carlo(request: MonteCarloRequest, service=Depends(get_backtesting_service)) -> MonteCarloResponse:
+    try:
+        return service.run_monte_carlo(request)
+    except BacktestNotFound as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.post("/jobs", response_model=BacktestJob, status_code=status.HTTP_202_ACCEPTED)
+def submit_backtest_job(request: BacktestRequest, jobs=Depends(get_backtest_job_service)) -> BacktestJob:
+    try:
+        return jobs.submit(request)
+    except BacktestQueueFull as exc:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(exc)) from exc
+
+
+@router.get("/jobs", response_model=list[BacktestJob])
+def list_backtest_jobs(jobs=Depends(get_backtest_job_service)) -> list[BacktestJob]:
+    return jobs.list_jobs()
+
+
+@router.get("/jobs/{job_id}", response_model=BacktestJob)
+def get_backtest_job(job_id: str, jobs=Depends(get_backtest_job_service)) -> BacktestJob:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Backtest job not found.")
+    return job
+
+
+@router.get("/jobs/{job_id}/events")
+def stream_backtest_job(job_id: str, jobs=Depends(get_backtest_job_service)) -> StreamingResponse:
+    """Server-sent events with the job's progress, ending with its terminal status."""
+    if jobs.get(job_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Backtest job not found.")
+    return StreamingResponse(
+        jobs.stream(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/jobs/{job_id}/result", response_model=BacktestResponse)
+def get_backtest_job_result(job_id: str, jobs=Depends(get_backtest_job_service)) -> BacktestResponse:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Backtest job not found.")
+    if job.status != BacktestJobStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Backtest job is {job.status.value}; no result available.",
+        )
+    return jobs.result(job_id)
+
+
+@router.delete("/jobs/{job_id}", response_model=BacktestJob)
+def cancel_backtest_job(job_id: str, jobs=Depends(get_backtest_job_service)) -> BacktestJob:
+    job = jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Backtest job not found.")
+    return job
@@ -0,0 +1,40 @@
+"""Historical data endpoints."""
+
+import asyncio
+from datetime import datetime
+
+from core.data.bars import Timeframe
+from core.data.resample import BarResampler
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from ...schemas.history import BarRecord, BarsResponse, HistorySyncRequest, HistorySyncResponse
+from ...services.history_sync import HistorySyncService, HistorySyncUnavailable
+from ..deps.dependencies import get_bar_resampler, get_history_sync_service
+
+router = APIRouter()
+
+
+@router.post("/sync", response_model=HistorySyncResponse)
+async def sync_history(
+    request: HistorySyncRequest,
+    service: HistorySyncService = Depends(get_history_sync_service),
+) -> HistorySyncResponse:
+    try:
+        return await service.sync(request.symbols, request.lookback_days)
+    except HistorySyncUnavailable as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.get("/bars/{symbol}", response_model=BarsResponse)
+async def get_bars(
+    symbol: str,
+    start: datetime,
+    end: datetime,
+    timeframe: Timeframe = Query(default=Timeframe.M1),
+    resampler: BarResampler = Depends(get_bar_resampler),
+) -> BarsResponse:
+    try:
+        bars = await asyncio.to_thread(resampler.bars, symbol, timeframe, start, end)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return BarsResponse(symbol=symbol, timeframe=timeframe, bars=[BarRecord(**row) for row in bars.iter_rows(named=True)])
@@ -1,5 +1,7 @@
 """Instrument endpoints."""
 
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from ...schemas.instruments import Instrument, InstrumentCreate
@@ -25,7 +27,7 @@ def upsert_instrument(
 
 
 @router.post("/refresh/nifty100", response_model=list[Instrument])
-def refresh_nifty100(
+async def refresh_nifty100(
     instrument_service=Depends(get_instruments_service),
     motilal_service: MotilalBrokerService = Depends(get_motilal_service),
     settings: AppSettings = Depends(get_settings_dep),
@@ -44,9 +46,9 @@ def refresh_nifty100(
         lookback_days=settings.motilal.historical_lookback_days,
     )
     try:
-        symbols = provider.get_nifty100_symbols()
-        instruments = instrument_service.refresh_from_motilal(provider, symbols)
-        return instruments
+        symbols = await asyncio.to_thread(provider.get_nifty100_symbols)
     finally:
         provider.close()
+    async with motilal_service.async_client() as client:
+        return await instrument_service.refresh_from_motilal_async(client, symbols)
 
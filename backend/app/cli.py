@@ -0,0 +1,74 @@
+"""Command-line entry points for maintenance tasks.
+
+Run ``python -m app.cli --help`` from ``backend/`` (or the ``signals`` script
+installed by Poetry) to list the commands.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Sequence
+
+from core.data.csv_cache import CSVConversionCache
+
+from .config import get_settings
+from .services.brokers import MotilalBrokerService
+from .services.history_sync import HistorySyncService, HistorySyncUnavailable
+
+
+def _sync_history(args: argparse.Namespace) -> int:
+    settings = get_settings()
+    service = HistorySyncService(settings, MotilalBrokerService(settings))
+    try:
+        report = asyncio.run(service.sync(args.symbols, args.days))
+    except HistorySyncUnavailable as exc:
+        print(f"error: {exc}")
+        return 2
+    for result in report.symbols:
+        status = f"error: {result.error}" if result.error else "ok"
+        print(f"{result.symbol:<16} gaps={result.gaps:<3} requests={result.requests:<3} rows={result.rows:<7} {status}")
+    print(
+        f"{len(report.symbols)} symbols, {report.requests} requests, {report.rows} rows, "
+        f"{len(report.failed)} failed in {report.seconds:.1f}s"
+    )
+    return 1 if report.failed else 0
+
+
+def _convert_csv(args: argparse.Namespace) -> int:
+    settings = get_settings()
+    cache = CSVConversionCache(args.directory or settings.mock_data_path, args.cache_dir or settings.csv_cache_path)
+    results = cache.convert_all(workers=args.workers)
+    failed = 0
+    for symbol, result in results.items():
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"{symbol:<16} error: {result}")
+        else:
+            print(f"{symbol:<16} {'converted' if result.converted else 'up to date':<10} {result.path}")
+    print(f"{len(results)} files, {failed} failed")
+    return 1 if failed else 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="signals", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync = commands.add_parser("sync-history", help="fetch the history missing from the local store")
+    sync.add_argument("symbols", nargs="*", help="symbols to sync (default: the NIFTY100 list)")
+    sync.add_argument("--days", type=int, default=None, help="lookback in days (default: the Motilal lookback)")
+    sync.set_defaults(handler=_sync_history)
+
+    convert = commands.add_parser("convert-csv", help="convert mock CSV files to memory-mappable Arrow files")
+    convert.add_argument("directory", nargs="?", type=Path, help="CSV directory (default: <data_path>/mock)")
+    convert.add_argument("--cache-dir", type=Path, default=None, help="output directory (default: <cache>/csv)")
+    convert.add_argument("--workers", type=int, default=4, help="files converted in parallel")
+    convert.set_defaults(handler=_convert_csv)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,6 @@
 """Application settings and configuration helpers."""
 
+from datetime import date
 from functools import lru_cache
 from pathlib import Path
 from typing import Annotated
@@ -35,6 +36,41 @@ class MotilalSettings(BaseModel):
     default_index_name: str = "NSE"
     historical_interval_minutes: int = 5
     historical_lookback_days: int = 60
+    requests_per_second: float = Field(default=10.0, gt=0.0)
+    burst: int = Field(default=10, ge=1)
+    max_concurrency: int = Field(default=8, gt=0)
+    max_retries: int = Field(default=3, ge=0)
+
+
+class BacktestJobSettings(BaseModel):
+    max_concurrent_jobs: int = Field(default=2, gt=0)
+    max_queued_jobs: int = Field(default=16, ge=0)
+    max_retained_jobs: int = Field(default=200, gt=0)
+    progress_interval_events: int = Field(default=10_000, gt=0)
+    progress_min_seconds: float = Field(default=0.25, ge=0.0)
+    stream_poll_seconds: float = Field(default=0.5, gt=0.0)
+    checkpoint_interval_events: int = Field(default=1_000_000, ge=0)  # 0 disables checkpoints
+    checkpoint_retention_seconds: float = Field(default=7 * 24 * 3600.0, gt=0.0)  # for checkpoints of unfinished jobs
+
+
+class BacktestCacheSettings(BaseModel):
+    enabled: bool = True
+    max_bytes: int = Field(default=512 * 1024 * 1024, gt=0)
+
+
+class IndicatorCacheSettings(BaseModel):
+    enabled: bool = True
+    max_bytes: int = Field(default=1024 * 1024 * 1024, gt=0)
+
+
+class CSVCacheSettings(BaseModel):
+    enabled: bool = True
+
+
+class HistoricalStoreSettings(BaseModel):
+    enabled: bool = True
+    holidays: list[date] = Field(default_factory=list)  # exchange holidays skipped when fetching history
+    sync_max_days_per_request: int = Field(default=30, gt=0)
 
 
 class AppSettings(BaseSettings):
@@ -58,6 +94,11 @@ class AppSettings(BaseSettings):
     redis: RedisSettings = Field(default_factory=RedisSettings)
     webhook_secrets: WebhookSecrets = Field(default_factory=WebhookSecrets)
     motilal: MotilalSettings = Field(default_factory=MotilalSettings)
+    backtest_jobs: BacktestJobSettings = Field(default_factory=BacktestJobSettings)
+    backtest_cache: BacktestCacheSettings = Field(default_factory=BacktestCacheSettings)
+    indicator_cache: IndicatorCacheSettings = Field(default_factory=IndicatorCacheSettings)
+    historical_store: HistoricalStoreSettings = Field(default_factory=HistoricalStoreSettings)
+    csv_cache: CSVCacheSettings = Field(default_factory=CSVCacheSettings)
 
     data_path: Path = Field(default=Path("data"))
     historical_cache_path: Path = Field(default=Path("data/cache"))
@@ -69,6 +110,14 @@ class AppSettings(BaseSettings):
         path.parent.mkdir(parents=True, exist_ok=True)
         return path
 
+    @property
+    def mock_data_path(self) -> Path:
+        return Path(self.data_path) / "mock"
+
+    @property
+    def csv_cache_path(self) -> Path:
+        return Path(self.historical_cache_path) / "csv"
+
 
 Settings = Annotated[AppSettings, "Application settings singleton"]
 
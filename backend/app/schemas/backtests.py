@@ -3,7 +3,13 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from core.backtesting.conditions import parse_condition
+from core.backtesting.equity import EquitySampling
+from core.backtesting.montecarlo import ResamplingMethod
+from core.backtesting.runner import ExecutionMode
+from core.data.bars import IntrabarPath, Timeframe
 
 
 class LegExitType(str, Enum):
@@ -22,7 +28,10 @@ class LegConfig(BaseModel):
     symbol: str = Field(..., description="Trading symbol for this leg")
     side: str = Field(..., description="BUY or SELL")
     quantity: int = Field(..., gt=0, description="Quantity for this leg")
-    entry_condition: str | None = Field(default=None, description="Optional entry condition expression")
+    entry_condition: str | None = Field(
+        default=None,
+        description="Optional entry condition, e.g. 'close > sma(20) and rsi(14) < 30 and time >= \"09:30\"'",
+    )
     exit_target: float | None = Field(default=None, description="Target profit in points/percentage")
     exit_stop_loss: float | None = Field(default=None, description="Stop loss in points/percentage")
     trailing_stop_points: float | None = Field(default=None, description="Trailing stop in points")
@@ -30,6 +39,13 @@ class LegConfig(BaseModel):
     partial_square_off_percent: float | None = Field(default=None, ge=0, le=100, description="Partial square-off percentage at target")
     time_based_exit_minutes: int | None = Field(default=None, gt=0, description="Time-based exit in minutes from entry")
 
+    @field_validator("entry_condition")
+    @classmethod
+    def _check_entry_condition(cls, value: str | None) -> str | None:
+        if value is not None:
+            parse_condition(value)  # raises ConditionError, a ValueError, for unsupported expressions
+        return value
+
 
 class BacktestRequest(BaseModel):
     strategy_id: str
@@ -38,16 +54,67 @@ class BacktestRequest(BaseModel):
     end: datetime
     initial_capital: float = Field(default=10_00_000.0)
     legs: list[LegConfig] | None = Field(default=None, description="Multi-leg strategy configuration")
+    execution_mode: ExecutionMode = Field(
+        default=ExecutionMode.EVENT,
+        description="EVENT replays every tick; VECTORIZED resolves leg exits over columnar history",
+    )
+    equity_sampling: EquitySampling = Field(
+        default=EquitySampling.EVENT,
+        description="Record equity on every EVENT, only ON_CHANGE, or once per BAR",
+    )
+    equity_bar_seconds: int = Field(default=60, gt=0, description="Bucket width when equity_sampling is BAR")
+    bar_timeframe: Timeframe | None = Field(
+        default=None,
+        description="Replay NSE-session bars of this timeframe instead of ticks (EVENT mode only)",
+    )
+    intrabar_path: IntrabarPath = Field(
+        default=IntrabarPath.NEAREST,
+        description="Assumed order of high and low inside a bar when resolving leg exits",
+    )
+
+    @model_validator(mode="after")
+    def _bars_need_event_mode(self) -> "BacktestRequest":
+        if self.bar_timeframe is not None and self.execution_mode != ExecutionMode.EVENT:
+            raise ValueError("bar_timeframe requires execution_mode EVENT")
+        return self
 
 
 class BacktestMetrics(BaseModel):
     total_return: float
     final_equity: float
-    total_trades: int = 0
+    total_trades: int = Field(default=0, description="Filled orders")
+    closed_trades: int = Field(default=0, description="Completed round trips, flat to flat per leg or symbol")
     winning_trades: int = 0
     losing_trades: int = 0
+    win_rate: float = 0.0
+    profit_factor: float | None = Field(default=None, description="Gross profit over gross loss; null without losing trades")
+    realized_pnl: float = 0.0
+    average_win: float = 0.0
+    average_loss: float = 0.0
+    expectancy: float = Field(default=0.0, description="Mean P&L per closed trade")
+    average_holding_seconds: float = 0.0
+    annualized_return: float = 0.0
+    volatility: float = 0.0
     max_drawdown: float = 0.0
+    max_drawdown_seconds: float = Field(default=0.0, description="Longest time spent below a previous equity peak")
     sharpe_ratio: float = 0.0
+    sortino_ratio: float = 0.0
+    calmar_ratio: float = 0.0
+    exposure: float = Field(default=0.0, description="Share of the backtest with an open position")
+
+
+class TradeBreakdown(BaseModel):
+    """Closed-trade statistics for one symbol or leg."""
+
+    key: str
+    closed_trades: int
+    winning_trades: int
+    losing_trades: int
+    win_rate: float
+    profit_factor: float | None = None
+    realized_pnl: float
+    expectancy: float
+    average_holding_seconds: float
 
 
 class LegResult(BaseModel):
@@ -66,5 +133,94 @@ class BacktestResponse(BaseModel):
     backtest_id: str
     metrics: BacktestMetrics
     leg_results: list[LegResult] | None = None
+    symbol_breakdown: list[TradeBreakdown] = Field(default_factory=list)
+    leg_breakdown: list[TradeBreakdown] = Field(default_factory=list)
 
 
+class BacktestSweepRequest(BaseModel):
+    """Grid of leg parameters to evaluate against a base backtest."""
+
+    base: BacktestRequest
+    parameter_grid: dict[str, list[float | int | None]] = Field(
+        ...,
+        description="Leg parameter -> candidate values; prefix with '<leg index>.' to target a single leg",
+    )
+    rank_by: str = Field(default="sharpe_ratio", description="BacktestMetrics field used to rank combinations")
+    ascending: bool = Field(default=False, description="Rank lowest values first")
+    max_workers: int | None = Field(default=None, gt=0, description="Worker processes; defaults to the CPU count")
+
+
+class SweepResult(BaseModel):
+    rank: int
+    parameters: dict[str, float | int | None]
+    metrics: BacktestMetrics
+
+
+class BacktestSweepResponse(BaseModel):
+    sweep_id: str
+    combinations: int
+    results: list[SweepResult]
+
+
+class MonteCarloRequest(BaseModel):
+    """Resample the closed trades of a completed backtest to gauge how robust its metrics are."""
+
+    backtest_id: str = Field(..., description="backtest_id of a completed run, made directly or as a job")
+    method: ResamplingMethod = ResamplingMethod.BOOTSTRAP
+    paths: int = Field(default=10_000, gt=0, le=200_000)
+    seed: int | None = Field(default=None, description="Seed for reproducible paths")
+    percentiles: list[float] = Field(default_factory=lambda: [5.0, 25.0, 50.0, 75.0, 95.0])
+    histogram_bins: int = Field(default=50, gt=0, le=1_000)
+    max_workers: int | None = Field(default=None, gt=0, description="Worker processes; defaults to the CPU count")
+
+
+class MetricDistribution(BaseModel):
+    observed: float = Field(..., description="Metric of the trades in their original order")
+    mean: float
+    std: float
+    percentiles: dict[str, float]
+    histogram_edges: list[float]
+    histogram_counts: list[int]
+
+
+class MonteCarloResponse(BaseModel):
+    backtest_id: str
+    method: ResamplingMethod
+    paths: int
+    trades: int
+    metrics: dict[str, MetricDistribution]
+    band_trades: list[int] = Field(..., description="Trade counts at which equity bands are sampled")
+    equity_bands: dict[str, list[float]] = Field(..., description="Equity percentile -> value at each band_trades point")
+
+
+class BacktestJobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+
+class BacktestJob(BaseModel):
+    job_id: str
+    status: BacktestJobStatus
+    progress: float = Field(default=0.0, ge=0.0, le=1.0, description="Share of the simulated window replayed")
+    events_processed: int = 0
+    simulated_time: datetime | None = None
+    equity: float | None = None
+    trade_count: int = 0
+    drawdown: float = Field(default=0.0, description="Current decline from peak equity, as a negative fraction of the peak")
+    max_drawdown: float = Field(default=0.0, description="Most negative drawdown so far, signed like the final metrics")
+    submitted_at: datetime
+    finished_at: datetime | None = None
+    error: str | None = None
+
+
+class BacktestCacheStats(BaseModel):
+    enabled: bool
+    entries: int = 0
+    size_bytes: int = 0
+    max_bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
@@ -0,0 +1,48 @@
+"""Historical data schemas."""
+
+from datetime import datetime
+
+from core.data.bars import Timeframe
+from pydantic import BaseModel, Field
+
+
+class HistorySyncRequest(BaseModel):
+    symbols: list[str] | None = Field(default=None, description="Symbols to sync; defaults to the NIFTY100 list.")
+    lookback_days: int | None = Field(
+        default=None, gt=0, description="Days of history to keep covered; defaults to the Motilal lookback."
+    )
+
+
+class SymbolSyncResult(BaseModel):
+    symbol: str
+    gaps: int = Field(..., description="Missing ranges found in the coverage index.")
+    requests: int = Field(..., description="Broker requests made for those ranges.")
+    rows: int
+    error: str | None = None
+
+
+class HistorySyncResponse(BaseModel):
+    start: datetime
+    end: datetime
+    requests: int
+    rows: int
+    failed: list[str]
+    seconds: float
+    symbols: list[SymbolSyncResult]
+
+
+class BarRecord(BaseModel):
+    start: datetime
+    end: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    ticks: int
+
+
+class BarsResponse(BaseModel):
+    symbol: str
+    timeframe: Timeframe
+    bars: list[BarRecord]
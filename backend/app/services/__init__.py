@@ -3,17 +3,21 @@
 from .registry import ServiceRegistry
 from .trading import TradingService
 from .backtesting import BacktestingService
+from .jobs import BacktestJobService
 from .instruments import InstrumentsService
 from .webhooks import WebhookService
 from .brokers import MotilalBrokerService
+from .history_sync import HistorySyncService
 
 __all__ = [
     "ServiceRegistry",
     "TradingService",
     "BacktestingService",
+    "BacktestJobService",
     "InstrumentsService",
     "WebhookService",
     "MotilalBrokerService",
+    "HistorySyncService",
 ]
 
 
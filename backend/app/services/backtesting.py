@@ -2,20 +2,142 @@
 
 from __future__ import annotations
 
+import itertools
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
 
 import numpy as np
+import polars as pl
+from pydantic import ValidationError
 
-from ..schemas.backtests import BacktestRequest, BacktestResponse, BacktestMetrics, LegResult
-from core.backtesting.runner import BacktestConfig
+from ..schemas.backtests import (
+    BacktestCacheStats,
+    BacktestMetrics,
+    BacktestRequest,
+    BacktestResponse,
+    BacktestSweepRequest,
+    BacktestSweepResponse,
+    LegResult,
+    MetricDistribution,
+    MonteCarloRequest,
+    MonteCarloResponse,
+    SweepResult,
+    TradeBreakdown,
+)
+from core.analytics import performance_metrics, round_trips, trade_breakdown, trade_stats
+from core.backtesting.checkpoint import BacktestCheckpoint
+from core.backtesting.montecarlo import (
+    RESAMPLED_METRICS,
+    ResampledPaths,
+    band_steps,
+    batch_sizes,
+    path_metrics,
+    simulate_paths,
+)
+from core.backtesting.runner import BacktestConfig, BacktestProgress, leg_id
+from core.backtesting.vectorized import load_history
+from core.data.fingerprint import VersionedMarketDataProvider, columns_fingerprint
+from core.data.frames import FrameMarketData
+from core.data.indicator_cache import IndicatorCache
+from core.execution.ledger import TradeLedger, leg_round_trips
 from core import BacktestRunner
+from .result_cache import BacktestArtifacts, BacktestResultCache
+
+SWEEPABLE_LEG_PARAMS = {
+    "exit_target",
+    "exit_stop_loss",
+    "trailing_stop_points",
+    "trailing_stop_percent",
+    "partial_square_off_percent",
+    "time_based_exit_minutes",
+}
+MAX_SWEEP_COMBINATIONS = 10_000
+
+
+class BacktestNotFound(RuntimeError):
+    """Raised when no stored results exist for a backtest id."""
+
+
+def _spawn_pool(workers: int, **kwargs: Any) -> ProcessPoolExecutor:
+    """Process pool for backtest work whose workers are spawned, never forked.
+
+    Polars' thread pool is not fork-safe: a forked child can inherit its locks
+    mid-use and deadlock on the first query.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"), **kwargs)
+
+
+# Per-process service used by sweep workers; built once from memory-mapped history.
+_SWEEP_SERVICE: "BacktestingService | None" = None
+
+
+def _init_sweep_worker(paths: dict[str, str], indicator_cache: tuple[str, int] | None = None) -> None:
+    global _SWEEP_SERVICE
+    # Each worker opens the shared indicator cache directory itself; columns are memory-mapped, not pickled.
+    cache = IndicatorCache(Path(indicator_cache[0]), indicator_cache[1]) if indicator_cache is not None else None
+    _SWEEP_SERVICE = BacktestingService(BacktestRunner(FrameMarketData.from_ipc(paths)), indicator_cache=cache)
+
+
+def _run_sweep_combination(payload: dict[str, Any]) -> dict[str, Any]:
+    assert _SWEEP_SERVICE is not None, "sweep worker not initialised"
+    response = _SWEEP_SERVICE.run_backtest(BacktestRequest.model_validate(payload))
+    return response.metrics.model_dump()
 
 
 class BacktestingService:
-    def __init__(self, runner: BacktestRunner) -> None:
+    def __init__(
+        self,
+        runner: BacktestRunner,
+        result_cache: BacktestResultCache | None = None,
+        indicator_cache: IndicatorCache | None = None,
+    ) -> None:
         self.runner = runner
+        self.result_cache = result_cache
+        self.indicator_cache = indicator_cache
+
+    def run_backtest(
+        self,
+        request: BacktestRequest,
+        progress_callback: Callable[[BacktestProgress], None] | None = None,
+        progress_interval: int = 10_000,
+        progress_min_seconds: float = 0.0,
+        checkpoint: BacktestCheckpoint | None = None,
+    ) -> BacktestResponse:
+        return self.run_with_artifacts(
+            request, progress_callback, progress_interval, progress_min_seconds, checkpoint
+        ).response
+
+    def run_with_artifacts(
+        self,
+        request: BacktestRequest,
+        progress_callback: Callable[[BacktestProgress], None] | None = None,
+        progress_interval: int = 10_000,
+        progress_min_seconds: float = 0.0,
+        checkpoint: BacktestCheckpoint | None = None,
+    ) -> BacktestArtifacts:
+        """Run a backtest, or return the stored response, equity curve and trades of an identical one.
+
+        With a ``checkpoint``, an event-mode run saves its state periodically
+        and resumes from the last save of an identical run that did not finish.
+        """
+        runner = self.runner
+        cache_key = None
+        if self.result_cache is not None:
+            fingerprint, frame_provider = self._data_fingerprint(request)
+            cache_key = self.result_cache.key(request, fingerprint)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            if frame_provider is not None:
+                # Reuse the history already loaded for fingerprinting.
+                runner = BacktestRunner(frame_provider)
 
-    def run_backtest(self, request: BacktestRequest) -> BacktestResponse:
         # Convert leg configs to dict format for runner
         legs = None
         if request.legs:
@@ -28,89 +150,272 @@ class BacktestingService:
             end=request.end,
             initial_capital=request.initial_capital,
             legs=legs,
+            execution_mode=request.execution_mode,
+            progress_callback=progress_callback,
+            progress_interval=progress_interval,
+            progress_min_seconds=progress_min_seconds,
+            equity_sampling=request.equity_sampling,
+            equity_bar_seconds=request.equity_bar_seconds,
+            bar_timeframe=request.bar_timeframe,
+            intrabar_path=request.intrabar_path,
+            indicator_cache=self.indicator_cache,
+            checkpoint=checkpoint,
+        )
+        result = runner.run(config)
+
+        # Trade statistics come from round trips over the columnar fill ledger,
+        # return and risk metrics from the recorder's equity arrays (no copy)
+        ledger = result.ledger.to_frame() if result.ledger is not None else TradeLedger().to_frame()
+        trips = round_trips(ledger)
+        stats = trade_stats(trips)
+        equity = result.equity
+        performance = performance_metrics(
+            equity.timestamps_ns if equity is not None else np.empty(0, dtype=np.int64),
+            equity.equity if equity is not None else np.empty(0),
+            equity.position_value if equity is not None else None,
+            initial_equity=request.initial_capital,
         )
-        result = self.runner.run(config)
-
-        # Calculate enhanced metrics
-        total_trades = len(result.trades)
-        winning_trades = sum(1 for trade in result.trades if trade.status.value == "FILLED" and len(trade.fills) > 0)
-        losing_trades = total_trades - winning_trades
-
-        # Calculate max drawdown from equity curve
-        max_drawdown = 0.0
-        sharpe_ratio = 0.0
-        if not result.equity_curve.is_empty() and "cash_balance" in result.equity_curve.columns:
-            equity_values = result.equity_curve["cash_balance"].to_numpy()
-            if len(equity_values) > 1:
-                running_max = np.maximum.accumulate(equity_values)
-                drawdowns = (equity_values - running_max) / running_max
-                max_drawdown = float(np.min(drawdowns)) if len(drawdowns) > 0 else 0.0
-
-                # Simple Sharpe ratio (assuming risk-free rate = 0)
-                returns = np.diff(equity_values) / equity_values[:-1]
-                if len(returns) > 0 and np.std(returns) > 0:
-                    sharpe_ratio = float(np.mean(returns) / np.std(returns) * np.sqrt(252))  # Annualized
 
         metrics = BacktestMetrics(
             total_return=result.total_return,
-            final_equity=result.final_state.cash_balance,
-            total_trades=total_trades,
-            winning_trades=winning_trades,
-            losing_trades=losing_trades,
-            max_drawdown=max_drawdown,
-            sharpe_ratio=sharpe_ratio,
+            final_equity=result.final_equity,
+            total_trades=ledger.height,
+            closed_trades=stats.closed_trades,
+            winning_trades=stats.winning_trades,
+            losing_trades=stats.losing_trades,
+            win_rate=stats.win_rate,
+            profit_factor=stats.profit_factor,
+            realized_pnl=stats.realized_pnl,
+            average_win=stats.average_win,
+            average_loss=stats.average_loss,
+            expectancy=stats.expectancy,
+            average_holding_seconds=stats.average_holding_seconds,
+            annualized_return=performance.annualized_return,
+            volatility=performance.volatility,
+            max_drawdown=performance.max_drawdown,
+            max_drawdown_seconds=performance.max_drawdown_seconds,
+            sharpe_ratio=performance.sharpe_ratio,
+            sortino_ratio=performance.sortino_ratio,
+            calmar_ratio=performance.calmar_ratio,
+            exposure=performance.exposure,
         )
 
         # Build leg results if legs were used
         leg_results = None
         if request.legs and result.trades:
-            leg_results = self._extract_leg_results(request.legs, result.trades)
+            leg_results = self._extract_leg_results(request.legs, leg_round_trips(ledger))
 
-        return BacktestResponse(
+        response = BacktestResponse(
             backtest_id=f"BT-{datetime.utcnow().timestamp()}",
             metrics=metrics,
             leg_results=leg_results,
+            symbol_breakdown=self._breakdown(trips, "symbol"),
+            leg_breakdown=self._breakdown(trips, "leg_id"),
+        )
+        artifacts = BacktestArtifacts(
+            response=response,
+            equity_curve=result.equity_curve,
+            trades=ledger,
+            initial_capital=request.initial_capital,
+        )
+        if cache_key is not None:
+            self.result_cache.put(cache_key, artifacts)
+        return artifacts
+
+    def cache_stats(self) -> BacktestCacheStats:
+        if self.result_cache is None:
+            return BacktestCacheStats(enabled=False)
+        return self.result_cache.stats()
+
+    def _data_fingerprint(self, request: BacktestRequest) -> tuple[str, FrameMarketData | None]:
+        """Version token for the requested history, plus the frames loaded to compute it.
+
+        Providers that report their own data version are not read at all;
+        otherwise the history is loaded once, hashed, and handed back so the
+        run does not fetch it again.
+        """
+        provider = self.runner.data_provider
+        if isinstance(provider, VersionedMarketDataProvider):
+            versions = [f"{symbol}={provider.data_version(symbol, request.start, request.end)}" for symbol in request.symbols]
+            return "|".join(versions), None
+        frames = {}
+        digests = []
+        for symbol in request.symbols:
+            history = load_history(provider, symbol, request.start, request.end)
+            frames[symbol] = history.frame
+            digests.append(f"{symbol}={columns_fingerprint(history.timestamps_ns, history.prices)}")
+        return "|".join(digests), FrameMarketData(frames)
+
+    def run_sweep(self, request: BacktestSweepRequest) -> BacktestSweepResponse:
+        """Run every combination of ``parameter_grid`` and rank the resulting metrics.
+
+        Market data is loaded once per symbol and written to uncompressed Arrow
+        IPC files that each worker process memory-maps, so only the small request
+        and metrics payloads are pickled.
+        """
+        if request.rank_by not in BacktestMetrics.model_fields:
+            raise ValueError(f"Unknown metric to rank by: {request.rank_by}")
+        combinations = self._expand_grid(request)
+
+        base = request.base
+        histories = {symbol: load_history(self.runner.data_provider, symbol, base.start, base.end) for symbol in base.symbols}
+        workers = min(request.max_workers or os.cpu_count() or 1, len(combinations))
+        payloads = [candidate.model_dump(mode="json") for _, candidate in combinations]
+
+        if workers <= 1:
+            frames = {symbol: history.frame for symbol, history in histories.items()}
+            service = BacktestingService(BacktestRunner(FrameMarketData(frames)), indicator_cache=self.indicator_cache)
+            metrics = [service.run_backtest(BacktestRequest.model_validate(payload)).metrics.model_dump() for payload in payloads]
+        else:
+            with tempfile.TemporaryDirectory(prefix="sweep-") as scratch:
+                paths: dict[str, str] = {}
+                for position, (symbol, history) in enumerate(histories.items()):
+                    path = Path(scratch) / f"{position}.arrow"
+                    history.frame.write_ipc(path, compression="uncompressed")
+                    paths[symbol] = str(path)
+                cache = self.indicator_cache
+                cache_location = (str(cache.root), cache.max_bytes) if cache is not None else None
+                with _spawn_pool(workers, initializer=_init_sweep_worker, initargs=(paths, cache_location)) as pool:
+                    metrics = list(pool.map(_run_sweep_combination, payloads))
+
+        scored = list(zip((parameters for parameters, _ in combinations), metrics))
+        # Undefined metrics (a profit factor without losing trades) rank last either way
+        ranked = sorted(
+            (item for item in scored if item[1][request.rank_by] is not None),
+            key=lambda item: item[1][request.rank_by],
+            reverse=not request.ascending,
+        ) + [item for item in scored if item[1][request.rank_by] is None]
+        return BacktestSweepResponse(
+            sweep_id=f"SW-{datetime.utcnow().timestamp()}",
+            combinations=len(combinations),
+            results=[
+                SweepResult(rank=position + 1, parameters=parameters, metrics=BacktestMetrics(**values))
+                for position, (parameters, values) in enumerate(ranked)
+            ],
+        )
+
+    def run_monte_carlo(self, request: MonteCarloRequest) -> MonteCarloResponse:
+        """Resample the closed round trips of a stored backtest and summarize the spread of its metrics.
+
+        The backtest is not run again: its fills are read back from the result
+        cache by ``backtest_id``, which covers runs made directly and through
+        background jobs. Paths are simulated in vectorized batches with
+        independent seeds, so results for a given seed do not depend on how
+        many workers run them. Batches only go to a process pool when there is
+        more than one.
+        """
+        if self.result_cache is None:
+            raise BacktestNotFound("Backtest results are not stored; enable the backtest cache to resample them")
+        artifacts = self.result_cache.find(request.backtest_id)
+        if artifacts is None:
+            raise BacktestNotFound(f"No stored results for backtest {request.backtest_id}")
+        pnls = round_trips(artifacts.trades)["pnl"].drop_nulls().to_numpy()
+        if not len(pnls):
+            raise ValueError("Backtest produced no closed trades to resample")
+        initial_capital = artifacts.initial_capital
+
+        steps = band_steps(len(pnls))
+        sizes = batch_sizes(request.paths, len(pnls))
+        seeds = np.random.SeedSequence(request.seed).spawn(len(sizes))
+        simulate = partial(simulate_paths, pnls, initial_capital, request.method, steps)
+        workers = min(request.max_workers or os.cpu_count() or 1, len(sizes))
+        if workers <= 1:
+            parts = [simulate(size, seed) for size, seed in zip(sizes, seeds)]
+        else:
+            with _spawn_pool(workers) as pool:
+                parts = list(pool.map(simulate, sizes, seeds))
+        paths = ResampledPaths.concatenate(parts)
+        observed = path_metrics(pnls[np.newaxis, :], initial_capital, steps)
+
+        labels = [f"p{q:g}" for q in request.percentiles]
+        metrics = {}
+        for name in RESAMPLED_METRICS:
+            values = getattr(paths, name)
+            counts, edges = np.histogram(values, bins=request.histogram_bins)
+            metrics[name] = MetricDistribution(
+                observed=float(getattr(observed, name)[0]),
+                mean=float(values.mean()),
+                std=float(values.std()),
+                percentiles=dict(zip(labels, np.percentile(values, request.percentiles).tolist())),
+                histogram_edges=edges.tolist(),
+                histogram_counts=counts.tolist(),
+            )
+        bands = np.percentile(paths.equity_at_steps, request.percentiles, axis=0)
+        return MonteCarloResponse(
+            backtest_id=request.backtest_id,
+            method=request.method,
+            paths=request.paths,
+            trades=len(pnls),
+            metrics=metrics,
+            band_trades=steps.tolist(),
+            equity_bands={label: band.tolist() for label, band in zip(labels, bands)},
         )
 
-    def _extract_leg_results(self, leg_configs: list, trades: list) -> list[LegResult]:
-        """Extract leg-wise results from trades."""
+    def _expand_grid(self, request: BacktestSweepRequest) -> list[tuple[dict[str, Any], BacktestRequest]]:
+        """Build one validated BacktestRequest per point of the parameter grid."""
+        legs = request.base.legs or []
+        if not legs:
+            raise ValueError("Parameter sweeps require at least one leg")
+        targets: list[tuple[str, list[int], str]] = []
+        for key in request.parameter_grid:
+            leg_index, _, param = key.rpartition(".")
+            if param not in SWEEPABLE_LEG_PARAMS:
+                raise ValueError(f"Unsupported sweep parameter: {key}")
+            if leg_index:
+                if not leg_index.isdigit() or int(leg_index) >= len(legs):
+                    raise ValueError(f"Unknown leg index in sweep parameter: {key}")
+                targets.append((key, [int(leg_index)], param))
+            else:
+                targets.append((key, list(range(len(legs))), param))
+
+        total = int(np.prod([len(values) for values in request.parameter_grid.values()]))
+        if total == 0 or total > MAX_SWEEP_COMBINATIONS:
+            raise ValueError(f"Parameter grid must yield between 1 and {MAX_SWEEP_COMBINATIONS} combinations, got {total}")
+
+        base = request.base.model_dump()
+        combinations: list[tuple[dict[str, Any], BacktestRequest]] = []
+        for values in itertools.product(*request.parameter_grid.values()):
+            payload = {**base, "legs": [dict(leg) for leg in base["legs"]]}
+            for (key, leg_indices, param), value in zip(targets, values):
+                for leg_index in leg_indices:
+                    payload["legs"][leg_index][param] = value
+            try:
+                candidate = BacktestRequest.model_validate(payload)
+            except ValidationError as exc:
+                raise ValueError(f"Invalid sweep combination {dict(zip(request.parameter_grid, values))}: {exc}") from exc
+            combinations.append((dict(zip(request.parameter_grid, values)), candidate))
+        return combinations
+
+    @staticmethod
+    def _breakdown(trips: pl.DataFrame, by: str) -> list[TradeBreakdown]:
+        return [
+            TradeBreakdown(key=row.pop(by), **row)
+            for row in trade_breakdown(trips, by).iter_rows(named=True)
+        ]
+
+    def _extract_leg_results(self, leg_configs: list, round_trips: pl.DataFrame) -> list[LegResult]:
+        """Per-leg results from the ledger's round trips: first entry, last exit and total P&L."""
+        per_leg = round_trips.group_by("leg_id", maintain_order=True).agg(
+            entry_price=pl.col("entry_price").first(),
+            exit_price=pl.col("exit_price").drop_nulls().last(),
+            exit_reason=pl.col("exit_reason").drop_nulls().last(),
+            pnl=pl.col("pnl").sum(),
+        )
+        by_leg = {row["leg_id"]: row for row in per_leg.iter_rows(named=True)}
+
         results = []
         for leg_cfg in leg_configs:
             leg_dict = leg_cfg.model_dump() if hasattr(leg_cfg, "model_dump") else leg_cfg
-            # Find entry and exit trades for this leg
-            entry_trades = [t for t in trades if t.order.symbol == leg_dict["symbol"] and t.order.side.value == leg_dict["side"]]
-            exit_trades = [
-                t
-                for t in trades
-                if t.order.symbol == leg_dict["symbol"]
-                and t.order.side.value != leg_dict["side"]
-            ]
-
-            entry_price = 0.0
-            exit_price = None
-            if entry_trades and entry_trades[0].fills:
-                entry_price = entry_trades[0].fills[0].fill_price
-            if exit_trades and exit_trades[-1].fills:
-                exit_price = exit_trades[-1].fills[-1].fill_price
-
-            pnl = 0.0
-            if exit_price is not None:
-                if leg_dict["side"] == "BUY":
-                    pnl = (exit_price - entry_price) * leg_dict["quantity"]
-                else:
-                    pnl = (entry_price - exit_price) * leg_dict["quantity"]
-
+            row = by_leg.get(leg_id(leg_dict["symbol"], leg_dict["side"]), {})
             results.append(
                 LegResult(
                     symbol=leg_dict["symbol"],
                     side=leg_dict["side"],
                     quantity=leg_dict["quantity"],
-                    entry_price=entry_price,
-                    exit_price=exit_price,
-                    pnl=pnl,
-                    exit_reason=None,  # Can be enhanced to track from leg state
+                    entry_price=row.get("entry_price") or 0.0,
+                    exit_price=row.get("exit_price"),
+                    pnl=row.get("pnl") or 0.0,
+                    exit_reason=row.get("exit_reason"),
                 )
             )
         return results
-
-
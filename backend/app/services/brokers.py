@@ -10,6 +10,8 @@ from typing import Any
 import httpx
 from loguru import logger
 
+from core.data.providers.motilal_async import AsyncMotilalClient
+
 from ..config.settings import AppSettings
 from ..schemas.brokers import MotilalConnectionStatus, MotilalCredentialsIn, MotilalCredentialsOut
 
@@ -135,4 +137,17 @@ class MotilalBrokerService:
             raise RuntimeError("Motilal credentials not configured.")
         return self._build_headers(raw)
 
+    def async_client(self) -> AsyncMotilalClient:
+        """Rate-limited async client using the stored credentials; close it (or use ``async with``) when done."""
+        motilal = self._settings.motilal
+        return AsyncMotilalClient(
+            self.build_headers(),
+            motilal.api_base,
+            requests_per_second=motilal.requests_per_second,
+            burst=motilal.burst,
+            max_concurrency=motilal.max_concurrency,
+            timeout_seconds=motilal.timeout_seconds,
+            max_retries=motilal.max_retries,
+        )
+
 
@@ -0,0 +1,89 @@
+"""Incremental synchronization of Motilal history into the local Parquet store."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, time, timedelta
+from pathlib import Path
+from typing import Iterable
+
+from core.data import MarketDataProvider
+from core.data.calendar import TradingCalendar
+from core.data.parquet_store import ParquetMarketData
+from core.data.providers.motilal import MotilalMarketData
+from core.data.sync import HistorySync
+
+from ..config.settings import AppSettings
+from ..schemas.history import HistorySyncResponse, SymbolSyncResult
+from .brokers import MotilalBrokerService
+
+
+class HistorySyncUnavailable(RuntimeError):
+    """Raised when history cannot be synced because Motilal is not configured."""
+
+
+def motilal_history_store(settings: AppSettings, upstream: MarketDataProvider) -> ParquetMarketData:
+    """The Parquet store of Motilal candles at the configured interval, skipping closed market hours."""
+    return ParquetMarketData(
+        upstream,
+        Path(settings.historical_cache_path) / "history",
+        interval=f"{settings.motilal.historical_interval_minutes}m",
+        calendar=TradingCalendar(holidays=frozenset(settings.historical_store.holidays)),
+    )
+
+
+class HistorySyncService:
+    """Bring the stored history of a set of symbols up to date, fetching only what is missing."""
+
+    def __init__(self, settings: AppSettings, motilal_service: MotilalBrokerService) -> None:
+        self._settings = settings
+        self._motilal_service = motilal_service
+
+    async def sync(self, symbols: Iterable[str] | None = None, lookback_days: int | None = None) -> HistorySyncResponse:
+        """Sync ``symbols`` (the NIFTY100 list by default) over the last ``lookback_days`` days."""
+        motilal = self._settings.motilal
+        raw = self._motilal_service.get_raw_credentials()
+        if not motilal.enabled or not raw or not raw.get("auth_token"):
+            raise HistorySyncUnavailable("Motilal credentials are not configured.")
+
+        # Whole days keep the coverage index free of slivers between runs.
+        end = datetime.now()
+        start = datetime.combine(end.date() - timedelta(days=lookback_days or motilal.historical_lookback_days), time.min)
+        provider = MotilalMarketData(
+            credentials=raw,
+            api_base=motilal.api_base,
+            timeout_seconds=motilal.timeout_seconds,
+            interval_minutes=motilal.historical_interval_minutes,
+            lookback_days=motilal.historical_lookback_days,
+        )
+        try:
+            symbols = list(symbols or []) or await asyncio.to_thread(provider.get_nifty100_symbols)
+            sync = HistorySync(
+                motilal_history_store(self._settings, provider),
+                self._motilal_service.async_client(),
+                motilal.historical_interval_minutes,
+                self._settings.historical_store.sync_max_days_per_request,
+            )
+            async with sync.client:
+                report = await sync.run(symbols, start, end)
+        finally:
+            provider.close()
+
+        return HistorySyncResponse(
+            start=report.start,
+            end=report.end,
+            requests=report.requests,
+            rows=report.rows,
+            failed=report.failed,
+            seconds=report.seconds,
+            symbols=[
+                SymbolSyncResult(
+                    symbol=result.symbol,
+                    gaps=result.gaps,
+                    requests=result.requests,
+                    rows=result.rows,
+                    error=result.error,
+                )
+                for result in report.symbols
+            ],
+        )
@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Dict, Iterable
+from typing import Any, Dict, Iterable
 
 from core.data.providers.motilal import MotilalMarketData
+from core.data.providers.motilal_async import AsyncMotilalClient
+from loguru import logger
 
 from ..schemas.instruments import Instrument, InstrumentCreate, InstrumentSegment
 
@@ -37,18 +39,33 @@ class InstrumentsService:
                 meta = provider.get_instrument_metadata(symbol)
             except Exception as exc:  # pylint: disable=broad-except
                 continue
-            instrument = Instrument(
-                symbol=meta["symbol"],
-                exchange="NSE",
-                segment=InstrumentSegment.EQUITY,
-                lot_size=None,
-                tick_size=0.05,
-            )
-            self._cache[instrument.symbol] = instrument
-            instruments.append(instrument)
+            instruments.append(self._apply_metadata(meta))
         self._persist_cache()
         return instruments
 
+    async def refresh_from_motilal_async(self, client: AsyncMotilalClient, symbols: Iterable[str]) -> list[Instrument]:
+        """Fetch metadata for all ``symbols`` as one concurrent, rate-limited batch."""
+        results = await client.instrument_metadata_many(symbols)
+        instruments: list[Instrument] = []
+        for symbol, meta in results.items():
+            if isinstance(meta, Exception):
+                logger.warning("Skipping {}: metadata fetch failed: {}", symbol, meta)
+                continue
+            instruments.append(self._apply_metadata(meta))
+        self._persist_cache()
+        return instruments
+
+    def _apply_metadata(self, meta: dict[str, Any]) -> Instrument:
+        instrument = Instrument(
+            symbol=meta["symbol"],
+            exchange="NSE",
+            segment=InstrumentSegment.EQUITY,
+            lot_size=None,
+            tick_size=0.05,
+        )
+        self._cache[instrument.symbol] = instrument
+        return instrument
+
     def _load_cache(self) -> None:
         if not self._cache_file.exists():
             return
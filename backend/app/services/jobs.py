@@ -0,0 +1,272 @@
+"""Background execution of backtests in a bounded pool of worker processes."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
+
+from loguru import logger
+
+from ..config.settings import AppSettings
+from ..schemas.backtests import BacktestJob, BacktestJobStatus, BacktestRequest, BacktestResponse
+from .backtesting import BacktestingService, _spawn_pool
+from core.backtesting.checkpoint import BacktestCheckpoint
+from core.backtesting.runner import BacktestCancelled, BacktestProgress
+
+# Per-process service used by job workers; built once by the pool initializer.
+_JOB_SERVICE: BacktestingService | None = None
+
+
+class BacktestQueueFull(RuntimeError):
+    """Raised when the job queue is at its configured depth."""
+
+
+def _backtesting_service_from_settings(settings: AppSettings) -> BacktestingService:
+    from .registry import ServiceRegistry  # imported lazily: the registry owns this service
+
+    return ServiceRegistry.from_settings(settings).backtesting_service
+
+
+def _init_job_worker(service_factory: Callable[[], BacktestingService]) -> None:
+    global _JOB_SERVICE
+    _JOB_SERVICE = service_factory()
+
+
+def _execute_job(
+    job_id: str,
+    payload: dict[str, Any],
+    progress: Any,
+    cancelled: Any,
+    interval: int,
+    min_seconds: float,
+    checkpoint: BacktestCheckpoint | None = None,
+) -> dict[str, Any]:
+    assert _JOB_SERVICE is not None, "job worker not initialised"
+    if cancelled.get(job_id):
+        raise BacktestCancelled(job_id)
+    progress[job_id] = {"progress": 0.0}
+
+    def report(update: BacktestProgress) -> None:
+        progress[job_id] = {
+            "progress": update.fraction,
+            "events_processed": update.events_processed,
+            "simulated_time": update.timestamp,
+            "equity": update.equity,
+            "trade_count": update.trade_count,
+            "drawdown": update.drawdown,
+            "max_drawdown": update.max_drawdown,
+        }
+        if cancelled.get(job_id):
+            raise BacktestCancelled(job_id)
+
+    request = BacktestRequest.model_validate(payload)
+    response = _JOB_SERVICE.run_backtest(
+        request,
+        progress_callback=report,
+        progress_interval=interval,
+        progress_min_seconds=min_seconds,
+        checkpoint=checkpoint,
+    )
+    return response.model_dump(mode="json")
+
+
+@dataclass(slots=True)
+class _JobRecord:
+    job_id: str
+    submitted_at: datetime
+    future: Future | None = None
+    status: BacktestJobStatus = BacktestJobStatus.QUEUED
+    finished_at: datetime | None = None
+    error: str | None = None
+    result: BacktestResponse | None = None
+    checkpoint: BacktestCheckpoint | None = None
+
+
+class BacktestJobService:
+    """Queue backtests onto worker processes and track their status, progress and results.
+
+    Each job checkpoints its run under a directory named after the request, so
+    resubmitting a request whose job failed or was cancelled part-way resumes
+    from the last checkpoint instead of replaying from the start. Checkpoints
+    nobody resumed within ``checkpoint_retention_seconds`` are removed when
+    the service starts.
+    """
+
+    def __init__(
+        self,
+        settings: AppSettings,
+        service_factory: Callable[[], BacktestingService] | None = None,
+    ) -> None:
+        self._limits = settings.backtest_jobs
+        self._checkpoint_root = settings.historical_cache_path / "checkpoints"
+        self._service_factory = service_factory or partial(_backtesting_service_from_settings, settings)
+        self._lock = threading.Lock()
+        self._jobs: dict[str, _JobRecord] = {}
+        self._pool: ProcessPoolExecutor | None = None
+        self._manager: Any = None
+        self._progress: Any = None
+        self._cancelled: Any = None
+        self._expire_checkpoints()
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # The manager process is spawned for the same reason as the pool's workers.
+            self._manager = multiprocessing.get_context("spawn").Manager()
+            self._progress = self._manager.dict()
+            self._cancelled = self._manager.dict()
+            self._pool = _spawn_pool(
+                self._limits.max_concurrent_jobs,
+                initializer=_init_job_worker,
+                initargs=(self._service_factory,),
+            )
+        return self._pool
+
+    def submit(self, request: BacktestRequest) -> BacktestJob:
+        with self._lock:
+            active = sum(1 for record in self._jobs.values() if record.finished_at is None)
+            if active >= self._limits.max_concurrent_jobs + self._limits.max_queued_jobs:
+                raise BacktestQueueFull(f"Backtest queue is full ({active} jobs queued or running)")
+            pool = self._ensure_pool()
+            record = _JobRecord(
+                job_id=f"JOB-{uuid.uuid4().hex[:12]}",
+                submitted_at=datetime.utcnow(),
+                checkpoint=self._checkpoint_for(request),
+            )
+            record.future = pool.submit(
+                _execute_job,
+                record.job_id,
+                request.model_dump(mode="json"),
+                self._progress,
+                self._cancelled,
+                self._limits.progress_interval_events,
+                self._limits.progress_min_seconds,
+                record.checkpoint,
+            )
+            self._jobs[record.job_id] = record
+        record.future.add_done_callback(partial(self._on_done, record.job_id))
+        return self._view(record)
+
+    def get(self, job_id: str) -> BacktestJob | None:
+        record = self._jobs.get(job_id)
+        return self._view(record) if record else None
+
+    def list_jobs(self) -> list[BacktestJob]:
+        return [self._view(record) for record in list(self._jobs.values())]
+
+    async def stream(self, job_id: str) -> AsyncIterator[str]:
+        """Server-sent events carrying the job view whenever it changes, until the job finishes."""
+        last: BacktestJob | None = None
+        while True:
+            job = await asyncio.to_thread(self.get, job_id)
+            if job is None:
+                return
+            if job != last:
+                event = "progress" if job.finished_at is None else job.status.value.lower()
+                yield f"event: {event}\ndata: {job.model_dump_json()}\n\n"
+                last = job
+            if job.finished_at is not None:
+                return
+            await asyncio.sleep(self._limits.stream_poll_seconds)
+
+    def result(self, job_id: str) -> BacktestResponse | None:
+        record = self._jobs.get(job_id)
+        return record.result if record else None
+
+    def cancel(self, job_id: str) -> BacktestJob | None:
+        record = self._jobs.get(job_id)
+        if record is None:
+            return None
+        if record.finished_at is None and record.future is not None and not record.future.cancel():
+            # Already picked up by a worker: flag it and let the progress callback abort the run.
+            self._cancelled[job_id] = True
+        return self._view(record)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._manager.shutdown()
+            self._pool = None
+
+    def _checkpoint_for(self, request: BacktestRequest) -> BacktestCheckpoint | None:
+        """Checkpoint location of ``request``; None when disabled or an identical job is still running."""
+        if not self._limits.checkpoint_interval_events:
+            return None
+        key = hashlib.blake2b(request.model_dump_json().encode(), digest_size=16).hexdigest()
+        directory = Path(self._checkpoint_root) / key
+        for record in self._jobs.values():
+            if record.finished_at is None and record.checkpoint is not None and record.checkpoint.directory == directory:
+                return None
+        return BacktestCheckpoint(directory, self._limits.checkpoint_interval_events)
+
+    def _expire_checkpoints(self) -> None:
+        """Remove checkpoint directories left by failed or abandoned jobs that were not saved recently."""
+        cutoff = time.time() - self._limits.checkpoint_retention_seconds
+        try:
+            directories = [path for path in Path(self._checkpoint_root).iterdir() if path.is_dir()]
+        except FileNotFoundError:
+            return
+        for directory in directories:
+            try:
+                # Each save renames the state into place, which touches the directory.
+                stale = directory.stat().st_mtime < cutoff
+            except FileNotFoundError:
+                continue
+            if stale:
+                logger.info("Removing stale backtest checkpoint {}", directory)
+                BacktestCheckpoint(directory).clear()
+
+    def _on_done(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return
+            record.finished_at = datetime.utcnow()
+            if future.cancelled():
+                record.status = BacktestJobStatus.CANCELLED
+            elif isinstance(future.exception(), BacktestCancelled):
+                record.status = BacktestJobStatus.CANCELLED
+            elif future.exception() is not None:
+                record.status = BacktestJobStatus.FAILED
+                record.error = str(future.exception())
+                logger.warning("Backtest job {} failed: {}", job_id, record.error)
+            else:
+                record.status = BacktestJobStatus.COMPLETED
+                record.result = BacktestResponse.model_validate(future.result())
+            self._evict_finished()
+
+    def _evict_finished(self) -> None:
+        finished = [record for record in self._jobs.values() if record.finished_at is not None]
+        for record in finished[: max(len(finished) - self._limits.max_retained_jobs, 0)]:
+            del self._jobs[record.job_id]
+            self._progress.pop(record.job_id, None)
+            self._cancelled.pop(record.job_id, None)
+
+    def _view(self, record: _JobRecord) -> BacktestJob:
+        status = record.status
+        try:
+            snapshot = self._progress.get(record.job_id) if self._progress is not None else None
+        except (EOFError, OSError):  # manager already shut down
+            snapshot = None
+        progress = dict(snapshot or {})
+        if snapshot is not None and status == BacktestJobStatus.QUEUED:
+            status = BacktestJobStatus.RUNNING
+        if status == BacktestJobStatus.COMPLETED:
+            progress["progress"] = 1.0
+        return BacktestJob(
+            job_id=record.job_id,
+            status=status,
+            submitted_at=record.submitted_at,
+            finished_at=record.finished_at,
+            error=record.error,
+            **progress,
+        )
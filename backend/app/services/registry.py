@@ -3,18 +3,27 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from datetime import timedelta
 from pathlib import Path
 
 from core import BacktestRunner, PortfolioManager, SimulationEngine
 from core.data import MarketDataProvider, MockCSVMarketData
+from core.data.coalescing import CoalescingMarketData
+from core.data.csv_cache import CSVConversionCache
+from core.data.indicator_cache import IndicatorCache
+from core.data.parquet_store import ParquetMarketData
+from core.data.resample import BarResampler
 from core.data.providers.motilal import MotilalMarketData
 from loguru import logger
 from ..config.settings import AppSettings
 from .backtesting import BacktestingService
 from .instruments import InstrumentsService
+from .jobs import BacktestJobService
+from .result_cache import BacktestResultCache
 from .trading import TradingService
 from .webhooks import WebhookService
 from .brokers import MotilalBrokerService
+from .history_sync import HistorySyncService, motilal_history_store
 
 
 @dataclass(slots=True)
@@ -26,21 +35,36 @@ class ServiceRegistry:
     _backtest_runner: BacktestRunner = field(init=False)
     _trading_service: TradingService = field(init=False)
     _backtesting_service: BacktestingService = field(init=False)
+    _backtest_job_service: BacktestJobService = field(init=False)
     _instrument_service: InstrumentsService = field(init=False)
     _webhook_service: WebhookService = field(init=False)
     _motilal_service: MotilalBrokerService = field(init=False)
+    _history_sync_service: HistorySyncService = field(init=False)
+    _bar_resampler: BarResampler = field(init=False)
 
     def __post_init__(self) -> None:
         self._ensure_data_dirs()
         self._portfolio_manager = PortfolioManager()
         self._motilal_service = MotilalBrokerService(self.settings)
-        self._market_data_provider = self._create_market_data_provider()
+        upstream = self._create_market_data_provider()
+        self._market_data_provider = CoalescingMarketData(self._create_historical_store(upstream))
+        # Motilal history is stored as candles; other providers serve ticks.
+        base_interval = None
+        if isinstance(upstream, MotilalMarketData):
+            base_interval = timedelta(minutes=self.settings.motilal.historical_interval_minutes)
+        self._bar_resampler = BarResampler(self._market_data_provider, base_interval=base_interval)
         self._simulation_engine = SimulationEngine(self._portfolio_manager)
         self._backtest_runner = BacktestRunner(self._market_data_provider)
         self._instrument_service = InstrumentsService(storage_path=Path(self.settings.data_path) / "instruments")
         self._trading_service = TradingService(self._simulation_engine)
-        self._backtesting_service = BacktestingService(self._backtest_runner)
+        self._backtesting_service = BacktestingService(
+            self._backtest_runner,
+            self._create_result_cache(),
+            self._create_indicator_cache(),
+        )
+        self._backtest_job_service = BacktestJobService(self.settings)
         self._webhook_service = WebhookService()
+        self._history_sync_service = HistorySyncService(self.settings, self._motilal_service)
 
     def _ensure_data_dirs(self) -> None:
         for path in [self.settings.data_path, self.settings.historical_cache_path]:
@@ -60,9 +84,36 @@ class ServiceRegistry:
                     )
                 except Exception as exc:  # pylint: disable=broad-except
                     logger.warning("Falling back to mock market data: {}", exc)
-        mock_dir = Path(self.settings.data_path) / "mock"
+        mock_dir = self.settings.mock_data_path
         mock_dir.mkdir(parents=True, exist_ok=True)
-        return MockCSVMarketData(data_dir=mock_dir)
+        provider = MockCSVMarketData(data_dir=mock_dir)
+        if self.settings.csv_cache.enabled:
+            return CSVConversionCache(mock_dir, self.settings.csv_cache_path, fallback=provider)
+        return provider
+
+    def _create_historical_store(self, upstream: MarketDataProvider) -> MarketDataProvider:
+        if not self.settings.historical_store.enabled or isinstance(upstream, CSVConversionCache):
+            # Converted CSVs are already local, columnar and versioned by file.
+            return upstream
+        if isinstance(upstream, MotilalMarketData):
+            return motilal_history_store(self.settings, upstream)
+        return ParquetMarketData(upstream, Path(self.settings.historical_cache_path) / "history", "tick")
+
+    def _create_result_cache(self) -> BacktestResultCache | None:
+        if not self.settings.backtest_cache.enabled:
+            return None
+        return BacktestResultCache(
+            root=Path(self.settings.historical_cache_path) / "backtests",
+            max_bytes=self.settings.backtest_cache.max_bytes,
+        )
+
+    def _create_indicator_cache(self) -> IndicatorCache | None:
+        if not self.settings.indicator_cache.enabled:
+            return None
+        return IndicatorCache(
+            root=Path(self.settings.historical_cache_path) / "indicators",
+            max_bytes=self.settings.indicator_cache.max_bytes,
+        )
 
     @classmethod
     def from_settings(cls, settings: AppSettings) -> "ServiceRegistry":
@@ -92,6 +143,10 @@ class ServiceRegistry:
     def backtesting_service(self) -> BacktestingService:
         return self._backtesting_service
 
+    @property
+    def backtest_job_service(self) -> BacktestJobService:
+        return self._backtest_job_service
+
     @property
     def instruments_service(self) -> InstrumentsService:
         return self._instrument_service
@@ -104,4 +159,12 @@ class ServiceRegistry:
     def motilal_service(self) -> MotilalBrokerService:
         return self._motilal_service
 
+    @property
+    def history_sync_service(self) -> HistorySyncService:
+        return self._history_sync_service
+
+    @property
+    def bar_resampler(self) -> BarResampler:
+        return self._bar_resampler
+
 
@@ -0,0 +1,169 @@
+"""Content-addressed on-disk cache of completed backtests."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+import polars as pl
+from loguru import logger
+
+from ..schemas.backtests import BacktestCacheStats, BacktestRequest, BacktestResponse
+from core.data.disk_cache import cache_lock, evict, scan, touch
+
+# Bumped whenever the layout of stored artifacts changes, so stale entries miss.
+_FORMAT_VERSION = "4"
+
+
+@dataclass(slots=True)
+class BacktestArtifacts:
+    response: BacktestResponse
+    equity_curve: pl.DataFrame
+    trades: pl.DataFrame  # TradeLedger columns, one row per fill
+    initial_capital: float  # of the request, for analyses that replay the fills
+
+
+class BacktestResultCache:
+    """Store backtest responses, equity curves and trades keyed by request and data version.
+
+    Each entry is a directory written to a scratch name and renamed into place,
+    so concurrent writers never expose partial entries. The directory itself is
+    the index: lookups, sizes and eviction read it rather than per-process
+    state, so every process sharing ``root`` sees the others' entries. Reads
+    refresh an entry's mtime, and writers evict the least recently used
+    entries under a file lock once the cache exceeds ``max_bytes``. Each entry
+    can also be found by the ``backtest_id`` of its response, so analyses of a
+    finished run (such as Monte Carlo resampling) read its stored trades
+    instead of running it again.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        with cache_lock(self.root):
+            self._evict()
+
+    @staticmethod
+    def key(request: BacktestRequest, data_fingerprint: str) -> str:
+        # The execution mode stays in the key: modes agree on fills only up to indicator rounding.
+        normalized = request.model_dump(mode="json")
+        payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(_FORMAT_VERSION.encode())
+        digest.update(payload.encode())
+        digest.update(data_fingerprint.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> BacktestArtifacts | None:
+        entry = self._entry_path(key)
+        try:
+            artifacts = BacktestArtifacts(
+                response=BacktestResponse.model_validate_json((entry / "response.json").read_text(encoding="utf-8")),
+                equity_curve=pl.read_parquet(entry / "equity.parquet"),
+                trades=pl.read_parquet(entry / "trades.parquet"),
+                initial_capital=json.loads((entry / "run.json").read_text(encoding="utf-8"))["initial_capital"],
+            )
+            touch(entry)
+        except FileNotFoundError:
+            # Never stored, or evicted by another process part-way through the read.
+            with self._lock:
+                self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Dropping unreadable backtest cache entry {}: {}", key, exc)
+            with self._lock:
+                self.misses += 1
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        with self._lock:
+            self.hits += 1
+        return artifacts
+
+    def find(self, backtest_id: str) -> BacktestArtifacts | None:
+        """Stored artifacts of the run that produced ``backtest_id``; None once evicted or never stored."""
+        alias = self._alias_path(backtest_id)
+        try:
+            key = alias.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        artifacts = self.get(key)
+        if artifacts is None:
+            alias.unlink(missing_ok=True)
+        return artifacts
+
+    def put(self, key: str, artifacts: BacktestArtifacts) -> None:
+        entry = self._entry_path(key)
+        scratch = self.root / f".tmp-{uuid.uuid4().hex}"
+        scratch.mkdir(parents=True)
+        try:
+            (scratch / "response.json").write_text(artifacts.response.model_dump_json(), encoding="utf-8")
+            artifacts.equity_curve.write_parquet(scratch / "equity.parquet")
+            artifacts.trades.write_parquet(scratch / "trades.parquet")
+            (scratch / "run.json").write_text(json.dumps({"initial_capital": artifacts.initial_capital}), encoding="utf-8")
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(scratch, entry)
+        except OSError as exc:
+            # Another writer may have stored the same key first; either copy is valid.
+            shutil.rmtree(scratch, ignore_errors=True)
+            if not entry.exists():
+                logger.warning("Failed to cache backtest {}: {}", key, exc)
+                return
+        touch(entry)
+        self._write_alias(artifacts.response.backtest_id, key)
+        with cache_lock(self.root):
+            self._evict()
+
+    def stats(self) -> BacktestCacheStats:
+        entries = self._scan()
+        with self._lock:
+            return BacktestCacheStats(
+                enabled=True,
+                entries=len(entries),
+                size_bytes=sum(size for _, size in entries),
+                max_bytes=self.max_bytes,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+            )
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits; callers hold ``cache_lock``."""
+        removed = evict(self._scan(), self.max_bytes, lambda entry: shutil.rmtree(entry, ignore_errors=True))
+        with self._lock:
+            self.evictions += removed
+
+    def _scan(self) -> list[tuple[Path, int]]:
+        return scan(self.root, "??/*", self._dir_size)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def _alias_path(self, backtest_id: str) -> Path:
+        digest = hashlib.blake2b(backtest_id.encode(), digest_size=16).hexdigest()
+        return self.root / "ids" / digest
+
+    def _write_alias(self, backtest_id: str, key: str) -> None:
+        alias = self._alias_path(backtest_id)
+        scratch = alias.with_name(f".tmp-{uuid.uuid4().hex}")
+        try:
+            alias.parent.mkdir(parents=True, exist_ok=True)
+            scratch.write_text(key, encoding="utf-8")
+            os.replace(scratch, alias)
+        except OSError as exc:
+            scratch.unlink(missing_ok=True)
+            logger.warning("Failed to index backtest {} by id: {}", backtest_id, exc)
+
+    @staticmethod
+    def _dir_size(path: Path) -> int:
+        return sum(item.stat().st_size for item in path.iterdir() if item.is_file())
@@ -0,0 +1,28 @@
+"""Vectorized performance analytics over equity curves and fill ledgers."""
+
+from .performance import (
+    PerformanceMetrics,
+    ReturnSeries,
+    drawdown_series,
+    exposure,
+    performance_metrics,
+    period_returns,
+    rolling_drawdown,
+    rolling_sharpe,
+)
+from .trades import TradeStats, round_trips, trade_breakdown, trade_stats
+
+__all__ = [
+    "PerformanceMetrics",
+    "ReturnSeries",
+    "TradeStats",
+    "drawdown_series",
+    "exposure",
+    "performance_metrics",
+    "period_returns",
+    "rolling_drawdown",
+    "rolling_sharpe",
+    "round_trips",
+    "trade_breakdown",
+    "trade_stats",
+]
@@ -0,0 +1,176 @@
+"""Equity-curve performance metrics computed over NumPy columns."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import polars as pl
+
+TRADING_DAYS_PER_YEAR = 252
+SESSION_SECONDS = 22_500  # NSE regular session, 09:15-15:30
+DAILY_RETURNS_MIN_SPAN_DAYS = 30
+_NS_PER_SECOND = 1_000_000_000
+
+
+@dataclass(frozen=True, slots=True)
+class ReturnSeries:
+    """Simple returns between the last equity point of consecutive fixed intervals."""
+
+    timestamps_ns: np.ndarray  # time of the equity point closing each period
+    returns: np.ndarray
+    interval_seconds: int
+    periods_per_year: float
+
+
+@dataclass(frozen=True, slots=True)
+class PerformanceMetrics:
+    total_return: float
+    annualized_return: float
+    volatility: float  # annualized standard deviation of period returns
+    sharpe_ratio: float
+    sortino_ratio: float
+    max_drawdown: float  # most negative decline from the running peak, as a fraction
+    max_drawdown_seconds: float  # longest time spent below a previous peak
+    calmar_ratio: float
+    exposure: float  # share of time with an open position
+
+
+def periods_per_year(interval_seconds: int) -> float:
+    """Trading periods in a year: 252 days, each an NSE session for intraday intervals."""
+    if interval_seconds >= 86_400:
+        return TRADING_DAYS_PER_YEAR * 86_400 / interval_seconds
+    return TRADING_DAYS_PER_YEAR * SESSION_SECONDS / interval_seconds
+
+
+def period_returns(
+    timestamps_ns: np.ndarray,
+    equity: np.ndarray,
+    interval_seconds: int | None = None,
+    initial_equity: float | None = None,
+) -> ReturnSeries:
+    """Bucket an irregular equity curve into fixed intervals and take simple returns.
+
+    Without an explicit interval, curves spanning at least
+    ``DAILY_RETURNS_MIN_SPAN_DAYS`` use daily returns and shorter ones use
+    one-minute returns. The first return is measured from ``initial_equity``
+    when given, else from the first point of the curve.
+    """
+    timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+    equity = np.asarray(equity, dtype=np.float64)
+    if interval_seconds is None:
+        span = int(timestamps_ns[-1] - timestamps_ns[0]) if len(timestamps_ns) else 0
+        interval_seconds = 86_400 if span >= DAILY_RETURNS_MIN_SPAN_DAYS * 86_400 * _NS_PER_SECOND else 60
+    per_year = periods_per_year(interval_seconds)
+    if not len(equity):
+        return ReturnSeries(timestamps_ns, np.empty(0), interval_seconds, per_year)
+
+    buckets = timestamps_ns // (interval_seconds * _NS_PER_SECOND)
+    closes = np.append(np.flatnonzero(buckets[1:] != buckets[:-1]), len(buckets) - 1)
+    base = equity[0] if initial_equity is None else initial_equity
+    values = np.concatenate(([base], equity[closes]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(values[:-1] != 0, values[1:] / values[:-1] - 1.0, 0.0)
+    return ReturnSeries(timestamps_ns[closes], returns, interval_seconds, per_year)
+
+
+def drawdown_series(equity: np.ndarray) -> np.ndarray:
+    """Decline of each point from the running peak, as a fraction (zero or negative)."""
+    equity = np.asarray(equity, dtype=np.float64)
+    return _relative_to(equity, np.maximum.accumulate(equity))
+
+
+def rolling_drawdown(equity: np.ndarray, window: int) -> np.ndarray:
+    """Decline of each point from the peak of the trailing ``window`` points."""
+    equity = np.asarray(equity, dtype=np.float64)
+    return _relative_to(equity, pl.Series(equity).rolling_max(window_size=window, min_samples=1).to_numpy())
+
+
+def _relative_to(equity: np.ndarray, peaks: np.ndarray) -> np.ndarray:
+    """``equity / peaks - 1``, 0 where the peak is not positive."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.divide(equity, peaks)
+    result -= 1.0
+    if len(peaks) and peaks.min() <= 0:
+        result[peaks <= 0] = 0.0
+    return result
+
+
+def rolling_sharpe(returns: ReturnSeries, window: int) -> np.ndarray:
+    """Annualized Sharpe ratio of each trailing ``window`` of period returns; NaN until the window fills."""
+    series = pl.Series(returns.returns)
+    mean = series.rolling_mean(window_size=window).to_numpy()
+    std = series.rolling_std(window_size=window, ddof=1).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(std > 0, mean / std * math.sqrt(returns.periods_per_year), np.nan)
+    return ratio
+
+
+def exposure(timestamps_ns: np.ndarray, position_value: np.ndarray) -> float:
+    """Share of the curve's time span during which a position was open."""
+    timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+    if len(timestamps_ns) < 2:
+        return 0.0
+    total = int(timestamps_ns[-1] - timestamps_ns[0])
+    if total <= 0:
+        return float(np.count_nonzero(position_value)) / len(position_value)
+    held = np.asarray(position_value)[:-1] != 0
+    return float(np.sum(np.diff(timestamps_ns), where=held) / total)
+
+
+def performance_metrics(
+    timestamps_ns: np.ndarray,
+    equity: np.ndarray,
+    position_value: np.ndarray | None = None,
+    initial_equity: float | None = None,
+    interval_seconds: int | None = None,
+) -> PerformanceMetrics:
+    """Return, risk and risk-adjusted metrics of an equity curve.
+
+    Each metric is one or two vectorized passes over the columns with no
+    per-point Python work. Ratios with a zero denominator are 0.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+    if not len(equity):
+        return PerformanceMetrics(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    start = equity[0] if initial_equity is None else initial_equity
+    total_return = float(equity[-1] / start - 1.0) if start else 0.0
+
+    series = period_returns(timestamps_ns, equity, interval_seconds, initial_equity)
+    returns = series.returns
+    scale = math.sqrt(series.periods_per_year)
+    mean = float(returns.mean()) if len(returns) else 0.0
+    std = float(returns.std(ddof=1)) if len(returns) > 1 else 0.0
+    downside = float(np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))) if len(returns) else 0.0
+    years = len(returns) / series.periods_per_year
+    growth = 1.0 + total_return
+    if growth <= 0:
+        annualized = -1.0
+    else:
+        annualized = float(growth ** (1.0 / years) - 1.0) if years > 0 else 0.0
+
+    peaks = np.maximum.accumulate(equity)
+    # The running peak never decreases, so the points with a positive peak form a suffix.
+    positive = int(np.searchsorted(peaks, 0.0, side="right"))
+    max_drawdown = float(np.min(equity[positive:] / peaks[positive:])) - 1.0 if positive < len(peaks) else 0.0
+    return PerformanceMetrics(
+        total_return=total_return,
+        annualized_return=annualized,
+        volatility=std * scale,
+        sharpe_ratio=mean / std * scale if std > 0 else 0.0,
+        sortino_ratio=mean / downside * scale if downside > 0 else 0.0,
+        max_drawdown=max_drawdown,
+        max_drawdown_seconds=_longest_underwater_seconds(timestamps_ns, equity, peaks),
+        calmar_ratio=annualized / -max_drawdown if max_drawdown < 0 else 0.0,
+        exposure=exposure(timestamps_ns, position_value) if position_value is not None else 0.0,
+    )
+
+
+def _longest_underwater_seconds(timestamps_ns: np.ndarray, equity: np.ndarray, peaks: np.ndarray) -> float:
+    """Longest time from a peak to the last point still below it."""
+    at_peak = np.flatnonzero(equity >= peaks)
+    last_below = np.append(at_peak[1:] - 1, len(equity) - 1)
+    return float((timestamps_ns[last_below] - timestamps_ns[at_peak]).max()) / _NS_PER_SECOND
@@ -0,0 +1,143 @@
+"""Round-trip trade analytics over the columnar fill ledger."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import polars as pl
+
+TRADE_SCHEMA = {
+    "book": pl.String,
+    "symbol": pl.String,
+    "leg_id": pl.String,
+    "side": pl.String,
+    "quantity": pl.Float64,
+    "entry_time": pl.Datetime("us"),
+    "exit_time": pl.Datetime("us"),
+    "entry_price": pl.Float64,
+    "exit_price": pl.Float64,
+    "exit_reason": pl.String,
+    "pnl": pl.Float64,
+    "holding_seconds": pl.Float64,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class TradeStats:
+    closed_trades: int
+    winning_trades: int
+    losing_trades: int
+    win_rate: float
+    profit_factor: float | None  # None when there are no losing trades
+    gross_profit: float
+    gross_loss: float
+    realized_pnl: float
+    average_win: float
+    average_loss: float
+    expectancy: float  # mean P&L per closed trade
+    average_holding_seconds: float
+
+
+def round_trips(ledger: pl.DataFrame) -> pl.DataFrame:
+    """One row per round trip, from a flat position back to flat.
+
+    Fills carrying a ``leg_id`` are booked per leg and the rest per symbol.
+    A fill that reverses a position is split: the part that flattens closes
+    the current trip and the remainder opens the next one. Entry and exit
+    prices are quantity-weighted over the fills that grew and shrank the
+    position; ``pnl`` is the trip's net cash flow and, like the exit columns,
+    null while it is still open. Everything is a handful of window
+    expressions, with no per-fill Python loop.
+    """
+    if ledger.is_empty():
+        return pl.DataFrame(schema=TRADE_SCHEMA)
+    signed = pl.when(pl.col("side") == "BUY").then(pl.col("quantity")).otherwise(-pl.col("quantity")).cast(pl.Float64)
+    fills = (
+        ledger.with_row_index("row")
+        .with_columns(book=pl.coalesce("leg_id", "symbol"), signed=signed)
+        .with_columns(position=pl.col("signed").cum_sum().over("book"))
+        .with_columns(previous=pl.col("position") - pl.col("signed"))
+    )
+    reverses = (pl.col("previous") * pl.col("position")) < 0
+    parts = pl.concat(
+        [
+            fills.filter(~reverses).with_columns(part=pl.lit(0)),
+            fills.filter(reverses).with_columns(signed=-pl.col("previous"), part=pl.lit(0)),
+            fills.filter(reverses).with_columns(signed=pl.col("position"), part=pl.lit(1)),
+        ]
+    ).sort("row", "part")
+
+    size = pl.col("signed").abs()
+    opening = pl.col("position").abs() > pl.col("previous").abs()
+    parts = (
+        parts.with_columns(position=pl.col("signed").cum_sum().over("book"))
+        .with_columns(previous=pl.col("position") - pl.col("signed"))
+        .with_columns(trip=(pl.col("previous") == 0).cum_sum().over("book"))
+    )
+    trips = parts.group_by("book", "trip", maintain_order=True).agg(
+        symbol=pl.col("symbol").first(),
+        leg_id=pl.col("leg_id").first(),
+        side=pl.when(pl.col("signed").first() > 0).then(pl.lit("BUY")).otherwise(pl.lit("SELL")),
+        quantity=pl.col("position").abs().max(),
+        entry_time=pl.col("timestamp").first(),
+        exit_time=pl.col("timestamp").last(),
+        entry_price=(pl.col("price") * size).filter(opening).sum() / size.filter(opening).sum(),
+        exit_price=(pl.col("price") * size).filter(~opening).sum() / size.filter(~opening).sum(),
+        exit_reason=pl.col("reason").last(),
+        cash_flow=-(pl.col("signed") * pl.col("price")).sum(),
+        closed=pl.col("position").last() == 0,
+    )
+    closed = pl.col("closed")
+    return trips.select(
+        "book",
+        "symbol",
+        "leg_id",
+        "side",
+        "quantity",
+        "entry_time",
+        pl.when(closed).then(pl.col("exit_time")).alias("exit_time"),
+        "entry_price",
+        pl.when(closed).then(pl.col("exit_price")).alias("exit_price"),
+        pl.when(closed).then(pl.col("exit_reason")).alias("exit_reason"),
+        pl.when(closed).then(pl.col("cash_flow")).alias("pnl"),
+        pl.when(closed)
+        .then((pl.col("exit_time") - pl.col("entry_time")).dt.total_microseconds() / 1e6)
+        .alias("holding_seconds"),
+    )
+
+
+def _stat_exprs() -> dict[str, pl.Expr]:
+    pnl = pl.col("pnl").drop_nulls()
+    wins, losses = pnl.filter(pnl > 0), pnl.filter(pnl < 0)
+    return {
+        "closed_trades": pnl.len(),
+        "winning_trades": wins.len(),
+        "losing_trades": losses.len(),
+        "gross_profit": wins.sum(),
+        "gross_loss": losses.sum(),
+        "realized_pnl": pnl.sum(),
+        "average_win": wins.mean().fill_null(0.0),
+        "average_loss": losses.mean().fill_null(0.0),
+        "expectancy": pnl.mean().fill_null(0.0),
+        "average_holding_seconds": pl.col("holding_seconds").drop_nulls().mean().fill_null(0.0),
+    }
+
+
+def _with_ratios(frame: pl.DataFrame) -> pl.DataFrame:
+    return frame.with_columns(
+        win_rate=pl.when(pl.col("closed_trades") > 0)
+        .then(pl.col("winning_trades") / pl.col("closed_trades"))
+        .otherwise(0.0),
+        profit_factor=pl.when(pl.col("gross_loss") < 0).then(pl.col("gross_profit") / -pl.col("gross_loss")),
+    )
+
+
+def trade_stats(trips: pl.DataFrame) -> TradeStats:
+    """Win/loss statistics over the closed round trips from ``round_trips``."""
+    return TradeStats(**_with_ratios(trips.select(**_stat_exprs())).row(0, named=True))
+
+
+def trade_breakdown(trips: pl.DataFrame, by: str = "symbol") -> pl.DataFrame:
+    """``trade_stats`` columns per value of ``by`` (for example ``symbol`` or ``leg_id``)."""
+    grouped = trips.filter(pl.col(by).is_not_null()).group_by(by, maintain_order=True).agg(**_stat_exprs())
+    return _with_ratios(grouped)
@@ -1,7 +1,37 @@
 """Backtesting exports."""
 
-from .runner import BacktestConfig, BacktestResult, BacktestRunner
+from .checkpoint import BacktestCheckpoint, CheckpointError
+from .conditions import ConditionError, ConditionInterpreter, EntryCondition, parse_condition
+from .equity import EquityRecorder, EquitySampling
+from .merge import merge_event_streams, merge_histories
+from .montecarlo import ResamplingMethod
+from .runner import (
+    BacktestCancelled,
+    BacktestConfig,
+    BacktestProgress,
+    BacktestResult,
+    BacktestRunner,
+    ExecutionMode,
+)
 
-__all__ = ["BacktestConfig", "BacktestResult", "BacktestRunner"]
+__all__ = [
+    "BacktestCancelled",
+    "BacktestCheckpoint",
+    "BacktestConfig",
+    "BacktestProgress",
+    "BacktestResult",
+    "BacktestRunner",
+    "CheckpointError",
+    "ConditionError",
+    "ConditionInterpreter",
+    "EntryCondition",
+    "EquityRecorder",
+    "EquitySampling",
+    "ExecutionMode",
+    "ResamplingMethod",
+    "merge_event_streams",
+    "merge_histories",
+    "parse_condition",
+]
 
 
@@ -0,0 +1,226 @@
+"""Periodic checkpoints of an event-mode backtest, so a long run can resume where it stopped."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from loguru import logger
+
+from ..execution.ledger import TradeLedger
+from ..execution.models import SimulationOrder, SimulationResult
+from ..portfolio.account import AccountState
+from .equity import EquityRecorder
+
+if TYPE_CHECKING:
+    from .runner import BacktestConfig, LegState
+
+_FORMAT_VERSION = 5
+# One equity point on disk: epoch-ns timestamp, cash, position value, equity.
+_EQUITY_ROW = np.dtype([("timestamp", "<i8"), ("values", "<f8", (3,))])
+
+
+class CheckpointError(RuntimeError):
+    """Raised when a checkpoint does not match the market data being replayed."""
+
+
+def config_fingerprint(config: BacktestConfig) -> str:
+    """Digest of the settings that determine a run's results; a checkpoint only resumes an identical run."""
+    payload = json.dumps(
+        [
+            _FORMAT_VERSION,
+            config.strategy_id,
+            config.symbols,
+            config.start,
+            config.end,
+            config.initial_capital,
+            config.legs,
+            config.execution_mode,
+            config.equity_sampling,
+            config.equity_bar_seconds,
+            config.bar_timeframe,
+            config.intrabar_path,
+            config.session,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+
+@dataclass(slots=True)
+class RunCheckpoint:
+    """Everything the event loop carries from one event to the next."""
+
+    fingerprint: str
+    events_processed: int  # the data-stream cursor: events to skip on resume
+    last_timestamp: datetime | None
+    equity: float
+    peak_equity: float
+    max_drawdown: float
+    position_value: float
+    marked_values: dict[str, float]
+    account: AccountState
+    pending_orders: dict[str, SimulationOrder]
+    legs: list[LegState]  # active legs in entry order
+    ledger: TradeLedger
+    trades: list[SimulationResult]
+    time_zone: str | None = None  # of the equity recorder
+    equity_rows: int = 0  # equity points stored in the append-only equity file
+    fills_bytes: int = 0  # length of the append-only fills file that belongs to this state
+    equity_tail: tuple[np.ndarray, np.ndarray] | None = field(default=None, repr=False)
+
+
+class BacktestCheckpoint:
+    """Keep the latest checkpoint of one backtest under ``directory``.
+
+    The loop state is pickled into ``state.pkl``, written under a scratch
+    name and renamed into place, so a crash mid-write leaves the previous
+    checkpoint intact. The equity curve, which dominates the state of a long
+    tick replay, is not rewritten each time: settled points are appended to
+    ``equity.bin`` as fixed-width binary rows and the state records how many
+    of them belong to it. The newest point stays in the state, since bar
+    sampling may still overwrite it. Trades and ledger fills, which only
+    grow, are likewise appended to ``fills.pkl`` as one pickled chunk of new
+    ones per save, and the state records the file length it covers; each
+    save costs what happened since the last one, not the whole run.
+    """
+
+    def __init__(self, directory: Path, interval_events: int = 1_000_000) -> None:
+        if interval_events <= 0:
+            raise ValueError("interval_events must be positive")
+        self.directory = Path(directory)
+        self.interval_events = interval_events
+        self._equity_rows = 0
+        self._fills_bytes = self._trade_rows = self._ledger_rows = 0
+
+    @property
+    def state_path(self) -> Path:
+        return self.directory / "state.pkl"
+
+    @property
+    def equity_path(self) -> Path:
+        return self.directory / "equity.bin"
+
+    @property
+    def fills_path(self) -> Path:
+        return self.directory / "fills.pkl"
+
+    def exists(self) -> bool:
+        return self.state_path.exists()
+
+    def load(self, fingerprint: str, recorder: EquityRecorder) -> RunCheckpoint | None:
+        """The stored checkpoint of the run identified by ``fingerprint``, with its equity points put back into ``recorder``.
+
+        Returns None, and starts the run afresh, when there is no checkpoint or
+        it belongs to a different run or format.
+        """
+        self._equity_rows = 0
+        self._fills_bytes = self._trade_rows = self._ledger_rows = 0
+        try:
+            with self.state_path.open("rb") as handle:
+                version, state = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError) as exc:
+            logger.warning("Ignoring unreadable backtest checkpoint {}: {}", self.state_path, exc)
+            return None
+        if version != _FORMAT_VERSION or state.fingerprint != fingerprint:
+            logger.info("Ignoring backtest checkpoint {} from a different run", self.state_path)
+            return None
+
+        stored = np.fromfile(self.equity_path, dtype=_EQUITY_ROW, count=state.equity_rows) if state.equity_rows else None
+        if stored is not None and len(stored) < state.equity_rows:
+            logger.warning("Ignoring backtest checkpoint {}: equity file is truncated", self.state_path)
+            return None
+        fills = self._read_fills(state.fills_bytes)
+        if fills is None:
+            logger.warning("Ignoring backtest checkpoint {}: fills file is unreadable", self.state_path)
+            return None
+        state.trades, state.ledger = fills
+        timestamps = stored["timestamp"] if stored is not None else np.empty(0, dtype=np.int64)
+        values = stored["values"].T if stored is not None else np.empty((3, 0))
+        if state.equity_tail is not None:
+            timestamps = np.concatenate((timestamps, state.equity_tail[0]))
+            values = np.concatenate((values, state.equity_tail[1]), axis=1)
+        recorder.restore(timestamps, np.ascontiguousarray(values))
+        recorder.time_zone = state.time_zone
+        self._equity_rows = state.equity_rows
+        self._fills_bytes, self._trade_rows, self._ledger_rows = state.fills_bytes, len(state.trades), len(state.ledger)
+        state.equity_tail = None
+        return state
+
+    def save(self, state: RunCheckpoint, recorder: EquityRecorder) -> None:
+        """Append the equity points and fills recorded since the last save and replace the stored state."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        timestamps, values = recorder.rows(self._equity_rows)
+        settled = max(len(timestamps) - 1, 0)
+        if settled:
+            rows = np.empty(settled, dtype=_EQUITY_ROW)
+            rows["timestamp"] = timestamps[:settled]
+            rows["values"] = values[:, :settled].T
+            # Points past the stored state's count are left over from a save that did not finish.
+            mode = "r+b" if self.equity_path.exists() else "wb"
+            with self.equity_path.open(mode) as handle:
+                handle.seek(self._equity_rows * _EQUITY_ROW.itemsize)
+                handle.write(rows.tobytes())
+                handle.truncate()
+        state.equity_rows = self._equity_rows + settled
+        state.equity_tail = (timestamps[settled:], values[:, settled:]) if len(timestamps) else None
+        state.time_zone = recorder.time_zone
+
+        trades, ledger = state.trades, state.ledger
+        state.fills_bytes = self._fills_bytes
+        if len(trades) > self._trade_rows or len(ledger) > self._ledger_rows:
+            mode = "r+b" if self.fills_path.exists() else "wb"
+            with self.fills_path.open(mode) as handle:
+                handle.seek(self._fills_bytes)
+                chunk = (trades[self._trade_rows :], ledger.slice(self._ledger_rows))
+                pickle.dump(chunk, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                handle.truncate()
+                state.fills_bytes = handle.tell()
+
+        scratch = self.directory / f".tmp-{uuid.uuid4().hex}.pkl"
+        try:
+            state.trades, state.ledger = [], TradeLedger()
+            with scratch.open("wb") as handle:
+                pickle.dump((_FORMAT_VERSION, state), handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(scratch, self.state_path)
+        finally:
+            scratch.unlink(missing_ok=True)
+            state.equity_tail = None
+            state.trades, state.ledger = trades, ledger
+        self._equity_rows = state.equity_rows
+        self._fills_bytes, self._trade_rows, self._ledger_rows = state.fills_bytes, len(trades), len(ledger)
+
+    def _read_fills(self, size: int) -> tuple[list[SimulationResult], TradeLedger] | None:
+        """Trades and ledger from the first ``size`` bytes of the fills file; None when they cannot be read."""
+        trades: list[SimulationResult] = []
+        ledger = TradeLedger()
+        if not size:
+            return trades, ledger
+        try:
+            with self.fills_path.open("rb") as handle:
+                while handle.tell() < size:
+                    chunk_trades, chunk_ledger = pickle.load(handle)
+                    trades.extend(chunk_trades)
+                    ledger.extend(chunk_ledger)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+            return None
+        return trades, ledger
+
+    def clear(self) -> None:
+        """Remove the checkpoint, for example once its run has finished."""
+        self._equity_rows = 0
+        self._fills_bytes = self._trade_rows = self._ledger_rows = 0
+        shutil.rmtree(self.directory, ignore_errors=True)
+
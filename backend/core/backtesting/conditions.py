@@ -0,0 +1,375 @@
+"""Leg entry conditions: a small expression language over price, indicators and time of day.
+
+Conditions use Python expression syntax restricted to a whitelist::
+
+    close > sma(20) and rsi(14) < 30 and time >= "09:30"
+    zscore(50) < -2 or not (price - ema(10)) / ema(10) > 0.01
+
+* names: ``close`` (alias ``price``) and ``time``, seconds since midnight in
+  the timestamp's own wall time; ``"HH:MM"`` / ``"HH:MM:SS"`` literals are
+  converted to the same unit
+* indicators: ``sma(n)``, ``ema(n)``, ``std(n)``, ``zscore(n)``, ``rsi(n)``, the
+  single-input entries of ``indicators.BATCH_INDICATORS``
+* arithmetic ``+ - * /``, chained comparisons, ``and`` / ``or`` / ``not``
+
+A condition is parsed once into an ``EntryCondition``. Its indicator columns
+come from the batch indicators and ``expr`` compiles it to a Polars expression
+over them, so the signal for a whole history comes from one vectorized pass;
+``RollingEntrySignal`` makes the same pass chunk by chunk over a replay, and
+``ConditionInterpreter`` evaluates the same condition tick by tick with
+streaming indicators. Both treat indicators that are still warming
+up as unknown, so a comparison against them is never true.
+"""
+
+from __future__ import annotations
+
+import ast
+import math
+import operator
+import re
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+from typing import Callable, Mapping, Protocol
+
+import numpy as np
+import polars as pl
+
+from .indicators import BATCH_INDICATORS, lookback
+
+MAX_CONDITION_LENGTH = 1_000
+INDICATOR_NAMES = tuple(name for name, (_, inputs) in BATCH_INDICATORS.items() if inputs == ("close",))
+PRICE_NAMES = ("close", "price")
+_TIME_LITERAL = re.compile(r"^(\d{1,2}):(\d{2})(?::(\d{2}))?$")
+
+_COMPARISONS: dict[type, Callable[[object, object], object]] = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+_ARITHMETIC: dict[type, Callable[[object, object], object]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+
+class ConditionError(ValueError):
+    """Raised for entry conditions outside the supported language."""
+
+
+class StreamingIndicator(Protocol):
+    def update(self, value: float) -> float: ...
+
+
+@dataclass(frozen=True, slots=True)
+class IndicatorCall:
+    """One indicator reference in a condition, such as ``sma(20)``."""
+
+    name: str
+    period: int
+
+    @property
+    def column(self) -> str:
+        return f"{self.name}({self.period})"
+
+    @property
+    def params(self) -> dict[str, int]:
+        return {"period": self.period}
+
+    def compute(self, prices: np.ndarray) -> np.ndarray:
+        """Batch indicator over ``prices``; NaN until the indicator has enough data."""
+        function, _ = BATCH_INDICATORS[self.name]
+        return function(prices, self.period)
+
+
+@dataclass(frozen=True, slots=True)
+class EntryCondition:
+    """A parsed and validated entry condition."""
+
+    text: str
+    tree: ast.expr
+    indicators: tuple[IndicatorCall, ...]
+
+    def expr(self, price: str = "price", timestamp: str = "timestamp") -> pl.Expr:
+        """Boolean Polars expression over a frame holding ``price``, ``timestamp`` and one column per indicator.
+
+        Indicator columns are named ``IndicatorCall.column``; unknown (null)
+        results are false.
+        """
+        return _PolarsCompiler(pl.col(price), pl.col(timestamp)).visit(self.tree).fill_null(False)
+
+    def indicator_columns(self, prices: np.ndarray) -> list[pl.Series]:
+        """Every indicator column the condition reads, computed over ``prices``, with NaN as null."""
+        return [pl.Series(call.column, call.compute(prices)).fill_nan(None) for call in self.indicators]
+
+    def evaluate(self, frame: pl.DataFrame, price: str = "price", timestamp: str = "timestamp") -> np.ndarray:
+        """Entry signal for every row of ``frame``, computing the indicators along the way."""
+        if frame.is_empty():
+            return np.zeros(0, dtype=bool)
+        prices = frame[price].cast(pl.Float64).to_numpy()
+        columns = frame.with_columns(self.indicator_columns(prices)) if self.indicators else frame
+        return columns.select(self.expr(price, timestamp)).to_series().to_numpy()
+
+
+class RollingEntrySignal:
+    """Evaluate an entry condition chunk by chunk along one symbol's replay.
+
+    Each chunk's indicators are computed over the chunk and the ``warm_up``
+    prices before it, the longest ``indicators.lookback`` of the condition,
+    so the signal matches a pass over the whole history (up to rounding)
+    while only that tail is kept between chunks.
+    """
+
+    def __init__(self, condition: EntryCondition) -> None:
+        self.condition = condition
+        self.warm_up = max((lookback(call.name, call.period) for call in condition.indicators), default=0)
+        self._tail = np.empty(0)
+
+    def update(self, timestamps_ns: np.ndarray, prices: np.ndarray, tz: tzinfo | None = None) -> np.ndarray:
+        """Signal at each row of the next chunk, given as epoch nanoseconds (wall time when ``tz`` is None) and prices."""
+        if not len(prices):
+            return np.zeros(0, dtype=bool)
+        history = np.concatenate((self._tail, prices))
+        skip = len(self._tail)
+        self._tail = history[max(len(history) - self.warm_up, 0) :].copy()
+        frame = pl.DataFrame([_wall_clock(timestamps_ns, tz), pl.Series("price", prices, dtype=pl.Float64)])
+        columns = [column.slice(skip) for column in self.condition.indicator_columns(history)]
+        return frame.with_columns(columns).select(self.condition.expr()).to_series().to_numpy()
+
+
+def _wall_clock(timestamps_ns: np.ndarray, tz: tzinfo | None) -> pl.Series:
+    """``timestamp`` column of epoch nanoseconds in the wall time of ``tz``, which ``time`` reads."""
+    timestamps = pl.from_epoch(pl.Series("timestamp", timestamps_ns, dtype=pl.Int64), time_unit="ns")
+    key = getattr(tz, "key", None)
+    if key is not None:
+        return timestamps.dt.replace_time_zone("UTC").dt.convert_time_zone(key)
+    if tz is not None:
+        return timestamps + tz.utcoffset(None)
+    return timestamps
+
+
+def parse_condition(text: str) -> EntryCondition:
+    """Parse ``text``, rejecting anything outside the condition language."""
+    if len(text) > MAX_CONDITION_LENGTH:
+        raise ConditionError(f"Entry condition longer than {MAX_CONDITION_LENGTH} characters")
+    try:
+        tree = ast.parse(text.strip(), mode="eval").body
+    except SyntaxError as exc:
+        raise ConditionError(f"Invalid entry condition {text!r}: {exc.msg}") from exc
+    calls: dict[IndicatorCall, None] = {}
+    if _validate(tree, calls) != "bool":
+        raise ConditionError(f"Entry condition {text!r} must be a comparison or boolean expression")
+    return EntryCondition(text=text, tree=tree, indicators=tuple(calls))
+
+
+def _validate(node: ast.expr, calls: dict[IndicatorCall, None]) -> str:
+    """Check ``node`` against the grammar; returns its kind, ``"bool"`` or ``"number"``."""
+    if isinstance(node, ast.BoolOp):
+        if not all(_validate(value, calls) == "bool" for value in node.values):
+            raise ConditionError("'and' / 'or' need comparisons on both sides")
+        return "bool"
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        if _validate(node.operand, calls) != "bool":
+            raise ConditionError("'not' needs a comparison")
+        return "bool"
+    if isinstance(node, ast.Compare):
+        for op in node.ops:
+            if type(op) not in _COMPARISONS:
+                raise ConditionError(f"Unsupported comparison: {type(op).__name__}")
+        for operand in (node.left, *node.comparators):
+            if _validate(operand, calls) != "number":
+                raise ConditionError("Comparisons need numeric operands")
+        return "bool"
+    if isinstance(node, ast.BinOp):
+        if type(node.op) not in _ARITHMETIC:
+            raise ConditionError(f"Unsupported operator: {type(node.op).__name__}")
+        if _validate(node.left, calls) != "number" or _validate(node.right, calls) != "number":
+            raise ConditionError("Arithmetic needs numeric operands")
+        return "number"
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        if _validate(node.operand, calls) != "number":
+            raise ConditionError("Unary minus needs a numeric operand")
+        return "number"
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, str):
+            _time_literal(node.value)
+        elif isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ConditionError(f"Unsupported literal: {node.value!r}")
+        return "number"
+    if isinstance(node, ast.Name):
+        if node.id not in (*PRICE_NAMES, "time"):
+            raise ConditionError(f"Unknown name: {node.id}")
+        return "number"
+    if isinstance(node, ast.Call):
+        calls[_indicator_call(node)] = None
+        return "number"
+    raise ConditionError(f"Unsupported syntax: {type(node).__name__}")
+
+
+def _indicator_call(node: ast.Call) -> IndicatorCall:
+    if not isinstance(node.func, ast.Name) or node.func.id not in INDICATOR_NAMES:
+        raise ConditionError(f"Unknown indicator; expected one of {', '.join(INDICATOR_NAMES)}")
+    name = node.func.id
+    if node.keywords or len(node.args) != 1:
+        raise ConditionError(f"{name}() takes a single period argument")
+    period = node.args[0]
+    if not isinstance(period, ast.Constant) or isinstance(period.value, bool) or not isinstance(period.value, int):
+        raise ConditionError(f"{name}() period must be an integer literal")
+    if period.value < 2:
+        raise ConditionError(f"{name}() period must be at least 2")
+    return IndicatorCall(name, period.value)
+
+
+def _time_literal(value: str) -> int:
+    match = _TIME_LITERAL.match(value)
+    if match is None:
+        raise ConditionError(f"Time literals must look like 'HH:MM' or 'HH:MM:SS', got {value!r}")
+    hours, minutes, seconds = int(match[1]), int(match[2]), int(match[3] or 0)
+    if hours > 23 or minutes > 59 or seconds > 59:
+        raise ConditionError(f"Invalid time of day: {value!r}")
+    return hours * 3600 + minutes * 60 + seconds
+
+
+class _PolarsCompiler:
+    def __init__(self, price: pl.Expr, timestamp: pl.Expr) -> None:
+        self.price = price
+        self.timestamp = timestamp
+
+    def visit(self, node: ast.expr) -> pl.Expr:
+        if isinstance(node, ast.BoolOp):
+            combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            result = self.visit(node.values[0])
+            for value in node.values[1:]:
+                result = combine(result, self.visit(value))
+            return result
+        if isinstance(node, ast.UnaryOp):
+            operand = self.visit(node.operand)
+            if isinstance(node.op, ast.Not):
+                return ~operand
+            return -operand if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.Compare):
+            operands = [self.visit(operand) for operand in (node.left, *node.comparators)]
+            parts = [_COMPARISONS[type(op)](operands[i], operands[i + 1]) for i, op in enumerate(node.ops)]
+            result = parts[0]
+            for part in parts[1:]:
+                result = result & part
+            return result
+        if isinstance(node, ast.BinOp):
+            result = _ARITHMETIC[type(node.op)](self.visit(node.left), self.visit(node.right))
+            # 0/0 is NaN, which Polars orders above every number; treat it as unknown.
+            return result.fill_nan(None) if isinstance(node.op, ast.Div) else result
+        if isinstance(node, ast.Constant):
+            value = _time_literal(node.value) if isinstance(node.value, str) else node.value
+            return pl.lit(value, dtype=pl.Float64)
+        if isinstance(node, ast.Name):
+            if node.id == "time":
+                ts = self.timestamp
+                hour, minute, second = (part.cast(pl.Float64) for part in (ts.dt.hour(), ts.dt.minute(), ts.dt.second()))
+                return hour * 3600 + minute * 60 + second
+            return self.price.cast(pl.Float64)
+        return pl.col(_indicator_call(node).column)
+
+
+class ConditionInterpreter:
+    """Evaluate an entry condition tick by tick, for live paper trading.
+
+    ``indicators`` maps each indicator name to a factory taking the period and
+    returning a streaming indicator whose ``update`` reports NaN until ready;
+    ``strategies.indicators.STREAMING_INDICATORS`` provides the standard set.
+    Each tick updates every indicator once and then evaluates the condition
+    with SQL-style three-valued logic, matching ``EntryCondition.expr``.
+    """
+
+    def __init__(
+        self,
+        condition: EntryCondition | str,
+        indicators: Mapping[str, Callable[[int], StreamingIndicator]],
+    ) -> None:
+        self.condition = parse_condition(condition) if isinstance(condition, str) else condition
+        missing = {call.name for call in self.condition.indicators} - set(indicators)
+        if missing:
+            raise ConditionError(f"No streaming implementation for: {', '.join(sorted(missing))}")
+        self._indicators = {call: indicators[call.name](call.period) for call in self.condition.indicators}
+        self._values: dict[IndicatorCall, float] = {}
+        self._price = math.nan
+        self._time = math.nan
+        self._evaluate = self._compile(self.condition.tree)
+
+    def update(self, price: float, timestamp: datetime) -> bool:
+        """Feed one tick; returns whether the condition holds at it."""
+        self._price = price
+        self._time = float(timestamp.hour * 3600 + timestamp.minute * 60 + timestamp.second)
+        for call, indicator in self._indicators.items():
+            self._values[call] = indicator.update(price)
+        return self._evaluate() is True
+
+    def _compile(self, node: ast.expr) -> Callable[[], float | bool | None]:
+        """Closure tree for ``node``; numbers are NaN and booleans None when unknown."""
+        if isinstance(node, ast.BoolOp):
+            parts = [self._compile(value) for value in node.values]
+            if isinstance(node.op, ast.And):
+                return lambda: _kleene_and(part() for part in parts)
+            return lambda: _kleene_or(part() for part in parts)
+        if isinstance(node, ast.UnaryOp):
+            operand = self._compile(node.operand)
+            if isinstance(node.op, ast.Not):
+                return lambda: None if (value := operand()) is None else not value
+            if isinstance(node.op, ast.USub):
+                return lambda: -operand()
+            return operand
+        if isinstance(node, ast.Compare):
+            operands = [self._compile(operand) for operand in (node.left, *node.comparators)]
+            ops = [_COMPARISONS[type(op)] for op in node.ops]
+
+            def compare() -> bool | None:
+                values = [operand() for operand in operands]
+                if any(math.isnan(value) for value in values):
+                    return None
+                return all(op(values[i], values[i + 1]) for i, op in enumerate(ops))
+
+            return compare
+        if isinstance(node, ast.BinOp):
+            left, right = self._compile(node.left), self._compile(node.right)
+            if isinstance(node.op, ast.Div):
+                return lambda: _divide(left(), right())
+            combine = _ARITHMETIC[type(node.op)]
+            return lambda: combine(left(), right())
+        if isinstance(node, ast.Constant):
+            value = float(_time_literal(node.value) if isinstance(node.value, str) else node.value)
+            return lambda: value
+        if isinstance(node, ast.Name):
+            if node.id == "time":
+                return lambda: self._time
+            return lambda: self._price
+        call = _indicator_call(node)
+        return lambda: self._values[call]
+
+
+def _divide(left: float, right: float) -> float:
+    if right == 0:
+        if math.isnan(left) or left == 0:
+            return math.nan
+        return math.copysign(math.inf, left) * math.copysign(1.0, right)
+    return left / right
+
+
+def _kleene_and(values) -> bool | None:
+    unknown = False
+    for value in values:
+        if value is False:
+            return False
+        unknown = unknown or value is None
+    return None if unknown else True
+
+
+def _kleene_or(values) -> bool | None:
+    unknown = False
+    for value in values:
+        if value is True:
+            return True
+        unknown = unknown or value is None
+    return None if unknown else False
@@ -0,0 +1,206 @@
+"""Array-backed equity curve recording for backtests."""
+
+from __future__ import annotations
+
+from enum import Enum
+
+import numpy as np
+import polars as pl
+
+# Row layout of the float64 value chunks.
+_CASH, _POSITION_VALUE, _EQUITY = 0, 1, 2
+
+
+class EquitySampling(str, Enum):
+    """Which points the recorder keeps."""
+
+    EVENT = "EVENT"  # every market data event
+    ON_CHANGE = "ON_CHANGE"  # only when cash or position value moves
+    BAR = "BAR"  # last point of each fixed-width time bucket
+
+
+class EquityRecorder:
+    """Record cash, position market value and total equity into preallocated chunks.
+
+    Appends write into fixed-size numpy chunks (int64 epoch-ns timestamps and
+    float64 values), so recording allocates no Python objects per point.
+    Column accessors consolidate the chunks once and then return views, and
+    ``to_frame`` wraps those views without further copies.
+    """
+
+    def __init__(
+        self,
+        sampling: EquitySampling = EquitySampling.EVENT,
+        bar_seconds: int = 60,
+        chunk_size: int = 65_536,
+    ) -> None:
+        self.sampling = sampling
+        self.bar_ns = max(int(bar_seconds), 1) * 1_000_000_000
+        self.chunk_size = chunk_size
+        self.time_zone: str | None = None
+        self._timestamps: list[np.ndarray] = []
+        self._values: list[np.ndarray] = []
+        self._filled = 0  # rows used in the last chunk
+        self._count = 0
+        self._consolidated = False
+        self._last_cash = np.nan
+        self._last_position_value = np.nan
+        self._last_bucket: int | None = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, timestamp_ns: int, cash: float, position_value: float) -> None:
+        if self.sampling == EquitySampling.ON_CHANGE:
+            if cash == self._last_cash and position_value == self._last_position_value:
+                return
+        elif self.sampling == EquitySampling.BAR:
+            bucket = timestamp_ns // self.bar_ns
+            if bucket == self._last_bucket:
+                self._write(self._filled - 1, timestamp_ns, cash, position_value)
+                return
+            self._last_bucket = bucket
+
+        if not self._timestamps or self._filled == len(self._timestamps[-1]):
+            self._timestamps.append(np.empty(self.chunk_size, dtype=np.int64))
+            self._values.append(np.empty((3, self.chunk_size), dtype=np.float64))
+            self._filled = 0
+        self._filled += 1
+        self._count += 1
+        self._write(self._filled - 1, timestamp_ns, cash, position_value)
+
+    def record_many(self, timestamps_ns: np.ndarray, cash: np.ndarray, position_value: np.ndarray) -> None:
+        """Bulk-append time-ordered columns, applying the same sampling rule as ``record``."""
+        timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+        cash = np.asarray(cash, dtype=np.float64)
+        position_value = np.asarray(position_value, dtype=np.float64)
+        if not len(timestamps_ns):
+            return
+
+        keep = None
+        if self.sampling == EquitySampling.ON_CHANGE:
+            keep = (cash != np.concatenate(([self._last_cash], cash[:-1]))) | (
+                position_value != np.concatenate(([self._last_position_value], position_value[:-1]))
+            )
+        elif self.sampling == EquitySampling.BAR:
+            buckets = timestamps_ns // self.bar_ns
+            keep = np.append(buckets[1:] != buckets[:-1], True)
+            # Rows still in the last recorded bucket form a prefix; fold them into that point.
+            carried = int(np.count_nonzero(buckets == self._last_bucket)) if self._last_bucket is not None else 0
+            if carried:
+                row = carried - 1
+                self._write(self._filled - 1, int(timestamps_ns[row]), float(cash[row]), float(position_value[row]))
+                keep[:carried] = False
+            self._last_bucket = int(buckets[-1])
+        if keep is not None:
+            timestamps_ns, cash, position_value = timestamps_ns[keep], cash[keep], position_value[keep]
+        if not len(timestamps_ns):
+            return
+
+        values = np.empty((3, len(timestamps_ns)), dtype=np.float64)
+        values[_CASH] = cash
+        values[_POSITION_VALUE] = position_value
+        np.add(cash, position_value, out=values[_EQUITY])
+        self._seal_last_chunk()
+        self._timestamps.append(timestamps_ns.copy())
+        self._values.append(values)
+        self._filled = len(timestamps_ns)
+        self._count += len(timestamps_ns)
+        self._last_cash = float(cash[-1])
+        self._last_position_value = float(position_value[-1])
+        self._consolidated = False
+
+    def rows(self, start: int = 0) -> tuple[np.ndarray, np.ndarray]:
+        """Copies of the timestamps and ``(3, n)`` values recorded from row ``start`` on.
+
+        Reads across the chunks without consolidating them, so taking the
+        recent tail of a long curve costs only the tail.
+        """
+        timestamps: list[np.ndarray] = []
+        values: list[np.ndarray] = []
+        offset = 0
+        for index, chunk in enumerate(self._timestamps):
+            used = self._filled if index == len(self._timestamps) - 1 else len(chunk)
+            if offset + used > start:
+                first = max(start - offset, 0)
+                timestamps.append(chunk[first:used])
+                values.append(self._values[index][:, first:used])
+            offset += used
+        if not timestamps:
+            return np.empty(0, dtype=np.int64), np.empty((3, 0), dtype=np.float64)
+        return np.concatenate(timestamps), np.concatenate(values, axis=1)
+
+    def restore(self, timestamps_ns: np.ndarray, values: np.ndarray) -> None:
+        """Replace the recorded points with rows taken from ``rows``, ready to record after them."""
+        self._timestamps = [np.asarray(timestamps_ns, dtype=np.int64)]
+        self._values = [np.asarray(values, dtype=np.float64).reshape(3, -1)]
+        self._filled = self._count = len(self._timestamps[0])
+        self._consolidated = False
+        if self._count:
+            self._last_cash = float(self._values[0][_CASH, -1])
+            self._last_position_value = float(self._values[0][_POSITION_VALUE, -1])
+            if self.sampling == EquitySampling.BAR:
+                self._last_bucket = int(self._timestamps[0][-1]) // self.bar_ns
+        else:
+            self._last_cash = self._last_position_value = np.nan
+            self._last_bucket = None
+
+    @property
+    def timestamps_ns(self) -> np.ndarray:
+        self._consolidate()
+        return self._timestamps[0] if self._timestamps else np.empty(0, dtype=np.int64)
+
+    @property
+    def cash(self) -> np.ndarray:
+        return self._value_row(_CASH)
+
+    @property
+    def position_value(self) -> np.ndarray:
+        return self._value_row(_POSITION_VALUE)
+
+    @property
+    def equity(self) -> np.ndarray:
+        return self._value_row(_EQUITY)
+
+    def to_frame(self) -> pl.DataFrame:
+        timestamps = pl.Series("timestamp", self.timestamps_ns).cast(pl.Datetime("ns"))
+        if self.time_zone is not None:
+            timestamps = timestamps.dt.replace_time_zone(self.time_zone)
+        return pl.DataFrame(
+            [
+                timestamps.dt.cast_time_unit("us"),
+                pl.Series("cash_balance", self.cash),
+                pl.Series("position_value", self.position_value),
+                pl.Series("equity", self.equity),
+            ]
+        )
+
+    def _write(self, row: int, timestamp_ns: int, cash: float, position_value: float) -> None:
+        self._timestamps[-1][row] = timestamp_ns
+        values = self._values[-1]
+        values[_CASH, row] = cash
+        values[_POSITION_VALUE, row] = position_value
+        values[_EQUITY, row] = cash + position_value
+        self._last_cash = cash
+        self._last_position_value = position_value
+        self._consolidated = False
+
+    def _value_row(self, row: int) -> np.ndarray:
+        self._consolidate()
+        return self._values[0][row] if self._values else np.empty(0, dtype=np.float64)
+
+    def _consolidate(self) -> None:
+        if self._consolidated:
+            return
+        self._seal_last_chunk()
+        if len(self._timestamps) > 1:
+            self._timestamps = [np.concatenate(self._timestamps)]
+            self._values = [np.concatenate(self._values, axis=1)]
+            self._filled = len(self._timestamps[0])
+        self._consolidated = True
+
+    def _seal_last_chunk(self) -> None:
+        """Trim the preallocated tail chunk down to the rows actually recorded."""
+        if self._timestamps and self._filled < len(self._timestamps[-1]):
+            self._timestamps[-1] = self._timestamps[-1][: self._filled]
+            self._values[-1] = self._values[-1][:, : self._filled]
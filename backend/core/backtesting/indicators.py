@@ -0,0 +1,113 @@
+"""Vectorized technical indicators over whole price histories.
+
+Each function takes a NumPy array or Polars series and returns a float64
+array of the same length that is NaN while the indicator is warming up.
+``BATCH_INDICATORS`` names them for leg entry conditions and the indicator
+cache; ``strategies.indicators`` pairs them with constant-time streaming forms.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Sequence
+
+import numpy as np
+import polars as pl
+
+ArrayLike = np.ndarray | pl.Series | Sequence[float]
+
+
+def _series(values: ArrayLike) -> pl.Series:
+    return values.cast(pl.Float64) if isinstance(values, pl.Series) else pl.Series(np.asarray(values, dtype=np.float64))
+
+
+def _warm_up(result: np.ndarray, count: int) -> np.ndarray:
+    result[: min(count, len(result))] = np.nan
+    return result
+
+
+def sma(values: ArrayLike, period: int) -> np.ndarray:
+    return _series(values).rolling_mean(window_size=period).fill_null(np.nan).to_numpy()
+
+
+def ema(values: ArrayLike, period: int) -> np.ndarray:
+    averaged = _series(values).ewm_mean(alpha=2.0 / (period + 1), adjust=False).to_numpy().copy()
+    return _warm_up(averaged, period - 1)
+
+
+def rolling_std(values: ArrayLike, period: int, ddof: int = 0) -> np.ndarray:
+    return _series(values).rolling_std(window_size=period, ddof=ddof).fill_null(np.nan).to_numpy()
+
+
+def zscore(values: ArrayLike, period: int, ddof: int = 0) -> np.ndarray:
+    array = _series(values).to_numpy()
+    std = rolling_std(values, period, ddof)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, (array - sma(values, period)) / std, np.nan)
+
+
+def bollinger(values: ArrayLike, period: int = 20, num_std: float = 2.0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns (middle, upper, lower)."""
+    middle = sma(values, period)
+    width = num_std * rolling_std(values, period)
+    return middle, middle + width, middle - width
+
+
+def rsi(values: ArrayLike, period: int = 14) -> np.ndarray:
+    changes = np.diff(_series(values).to_numpy())
+    result = np.full(len(changes) + 1, np.nan)
+    if not len(changes):
+        return result
+    alpha = 1.0 / period
+    gain = pl.Series(np.maximum(changes, 0.0)).ewm_mean(alpha=alpha, adjust=False).to_numpy()
+    loss = pl.Series(np.maximum(-changes, 0.0)).ewm_mean(alpha=alpha, adjust=False).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[1:] = np.where(loss == 0, 100.0, 100.0 - 100.0 / (1.0 + gain / loss))
+    return _warm_up(result, period)
+
+
+def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> np.ndarray:
+    high, low, close = (_series(column).to_numpy() for column in (high, low, close))
+    true_range = high - low
+    if len(close) > 1:
+        previous = close[:-1]
+        true_range[1:] = np.maximum.reduce([true_range[1:], np.abs(high[1:] - previous), np.abs(low[1:] - previous)])
+    averaged = pl.Series(true_range).ewm_mean(alpha=1.0 / period, adjust=False).to_numpy().copy()
+    return _warm_up(averaged, period - 1)
+
+
+def vwap(price: ArrayLike, volume: ArrayLike) -> np.ndarray:
+    price, volume = _series(price).to_numpy(), _series(volume).to_numpy()
+    cumulative_volume = np.cumsum(volume)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(cumulative_volume > 0, np.cumsum(price * volume) / cumulative_volume, np.nan)
+
+
+def lookback(name: str, period: int) -> int:
+    """Rows before a point that indicator ``name`` reads to reproduce its full-history value there.
+
+    Rolling windows read ``period - 1``. The exponential averages read the
+    whole history in principle, but beyond this many rows the weight left on
+    older ones is below float64 resolution. ``vwap`` is cumulative and has no
+    finite lookback.
+    """
+    if name == "vwap":
+        raise ValueError("vwap is cumulative and has no finite lookback")
+    if name in ("sma", "std", "zscore"):
+        return period - 1
+    alpha = 2.0 / (period + 1) if name == "ema" else 1.0 / period
+    return period + math.ceil(math.log(np.finfo(np.float64).eps) / math.log1p(-alpha))
+
+
+# Batch indicators by the names used in leg entry conditions and indicator
+# cache keys, with the frame columns each one reads; "close" falls back to
+# "price" for tick histories.
+BATCH_INDICATORS: dict[str, tuple[Callable[..., np.ndarray], tuple[str, ...]]] = {
+    "sma": (sma, ("close",)),
+    "ema": (ema, ("close",)),
+    "std": (rolling_std, ("close",)),
+    "zscore": (zscore, ("close",)),
+    "rsi": (rsi, ("close",)),
+    "atr": (atr, ("high", "low", "close")),
+    "vwap": (vwap, ("close", "volume")),
+}
@@ -0,0 +1,63 @@
+"""Time-ordered merging of per-symbol market data streams."""
+
+from __future__ import annotations
+
+import heapq
+from datetime import datetime
+from itertools import islice
+from operator import attrgetter
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from ..data import MarketDataEvent, MarketDataProvider
+from ..data.bars import NSE_SESSION, Bar, Timeframe, TradingSession, iter_bars
+from ..data.batches import DEFAULT_BATCH_SIZE, EVENT_DTYPE, MarketDataBatch, datetime_to_ns
+
+
+def merge_event_streams(streams: Iterable[Iterable[MarketDataEvent]]) -> Iterator[MarketDataEvent]:
+    """Lazily k-way merge timestamp-sorted streams into one global stream.
+
+    Only the head of each stream is held in the heap, so memory is bounded by
+    the number of streams. Events sharing a timestamp keep the order of their
+    streams, then their order within a stream.
+    """
+    return heapq.merge(*streams, key=attrgetter("timestamp"))
+
+
+def merge_histories(
+    provider: MarketDataProvider,
+    symbols: Iterable[str],
+    start: datetime,
+    end: datetime,
+) -> Iterator[MarketDataEvent]:
+    """Replay the history of several symbols in global timestamp order."""
+    return merge_event_streams(provider.historical(symbol, start, end) for symbol in symbols)
+
+
+def merge_bars(
+    provider: MarketDataProvider,
+    symbols: Iterable[str],
+    start: datetime,
+    end: datetime,
+    timeframe: Timeframe,
+    session: TradingSession = NSE_SESSION,
+) -> Iterator[Bar]:
+    """Aggregate each symbol's ticks into bars and replay them in global bar-start order."""
+    streams = (iter_bars(provider.historical(symbol, start, end), timeframe, session) for symbol in symbols)
+    return heapq.merge(*streams, key=attrgetter("start"))
+
+
+def bar_batches(
+    bars: Iterable[Bar], symbols: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[tuple[MarketDataBatch, list[Bar]]]:
+    """Group a bar stream into batches of their closes, each paired with its bars."""
+    ids = {symbol: index for index, symbol in reversed(list(enumerate(symbols)))}
+    bars = iter(bars)
+    while chunk := list(islice(bars, batch_size)):
+        records = np.empty(len(chunk), dtype=EVENT_DTYPE)
+        records["timestamp_ns"] = [datetime_to_ns(bar.end) for bar in chunk]
+        records["symbol_id"] = [ids[bar.symbol] for bar in chunk]
+        records["price"] = [bar.close for bar in chunk]
+        records["volume"] = [bar.volume for bar in chunk]
+        yield MarketDataBatch(records, symbols, chunk[0].end.tzinfo), chunk
@@ -2,16 +2,41 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Iterable, List
+from enum import Enum
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, List, Mapping, Sequence
 
+import numpy as np
 import polars as pl
 
 from ..data import MarketDataEvent, MarketDataProvider
+from ..data.batches import DEFAULT_BATCH_SIZE, MarketDataBatch, datetime_to_ns, replay_batches
+from ..data.bars import NSE_SESSION, Bar, IntrabarPath, Timeframe, TradingSession, iter_bars
+from ..data.indicator_cache import IndicatorCache
 from ..execution.engine import SimulationEngine, SimulationOrder, SimulationResult
+from ..execution.ledger import TradeLedger
 from ..execution.models import OrderSide, OrderType
 from ..portfolio.account import AccountState, PortfolioManager
+from .checkpoint import BacktestCheckpoint, CheckpointError, RunCheckpoint, config_fingerprint
+from .conditions import EntryCondition, RollingEntrySignal, parse_condition
+from .equity import EquityRecorder, EquitySampling
+from .merge import bar_batches, merge_bars
+from .vectorized import LegLifecycle, SymbolHistory, load_history, resolve_leg_lifecycles
+
+
+class ExecutionMode(str, Enum):
+    """How the runner resolves leg exits."""
+
+    EVENT = "EVENT"
+    VECTORIZED = "VECTORIZED"
+
+
+def leg_id(symbol: str, side: str) -> str:
+    """Identifies a leg in order metadata and the trade ledger; one leg is active per (symbol, side)."""
+    return f"{symbol}-{side}"
 
 
 @dataclass(slots=True)
@@ -34,9 +59,11 @@ class LegState:
     remaining_quantity: int = 0
     exit_reason: str | None = None
     exit_price: float | None = None
+    entry_ns: int = field(default=0, init=False, repr=False)  # entry_time as epoch ns, for time-based exits
 
     def __post_init__(self) -> None:
         self.remaining_quantity = self.quantity
+        self.entry_ns = datetime_to_ns(self.entry_time)
         if self.side == "BUY":
             self.highest_price = self.entry_price
             self.lowest_price = self.entry_price
@@ -59,43 +86,119 @@ class LegState:
 
     def should_exit(self, current_price: float, current_time: datetime) -> tuple[bool, str | None, float | None]:
         """Check if leg should exit based on configured conditions. Returns (should_exit, reason, exit_price)."""
+        return self.should_exit_at(current_price, datetime_to_ns(current_time))
+
+    def should_exit_at(self, current_price: float, timestamp_ns: int) -> tuple[bool, str | None, float | None]:
+        """``should_exit`` with the time as epoch nanoseconds, as the batched replay carries it."""
+        reason = self._price_exit(current_price)
+        if reason is not None:
+            return True, reason, current_price
+
+        # Time-based exit
+        if self._time_expired(timestamp_ns):
+            return True, "TIME_BASED", current_price
+
+        return False, None, None
+
+    def should_exit_on_path(
+        self, path: Sequence[float], current_time: datetime
+    ) -> tuple[bool, str | None, float | None]:
+        """Bar counterpart of ``should_exit``: walk the assumed intrabar price path.
+
+        The price is taken to move linearly between waypoints, so the leg exits
+        at the first target/stop level the path touches (or at a waypoint that
+        has already gapped through one). Time-based exits are checked at
+        ``current_time``, the bar end, and fill at the last waypoint.
+        """
+        for index, price in enumerate(path):
+            if index:
+                crossed = self._first_level_crossed(path[index - 1], price)
+                if crossed is not None:
+                    level, reason = crossed
+                    self.update_price(level)
+                    return True, reason, level
+            self.update_price(price)
+            reason = self._price_exit(price)
+            if reason is not None:
+                return True, reason, price
+
+        if self._time_expired(datetime_to_ns(current_time)):
+            return True, "TIME_BASED", path[-1]
+        return False, None, None
+
+    def _price_exit(self, current_price: float) -> str | None:
         price_diff = current_price - self.entry_price
         if self.side == "SELL":
             price_diff = -price_diff
 
         # Target exit
-        if self.exit_target is not None and price_diff >= self.exit_target:
-            exit_qty = self.remaining_quantity
-            if self.partial_square_off_percent is not None:
-                exit_qty = int(self.remaining_quantity * (self.partial_square_off_percent / 100.0))
-            if exit_qty > 0:
-                return True, "TARGET", current_price
+        if self.exit_target is not None and price_diff >= self.exit_target and self._target_quantity() > 0:
+            return "TARGET"
 
         # Stop loss exit
         if self.exit_stop_loss is not None and price_diff <= -self.exit_stop_loss:
-            return True, "STOP_LOSS", current_price
+            return "STOP_LOSS"
 
         # Trailing stop (points)
         if self.trailing_stop_points is not None and self.highest_price is not None:
             if self.side == "BUY" and current_price <= (self.highest_price - self.trailing_stop_points):
-                return True, "TRAILING_STOP", current_price
+                return "TRAILING_STOP"
             if self.side == "SELL" and current_price >= (self.lowest_price + self.trailing_stop_points):
-                return True, "TRAILING_STOP", current_price
+                return "TRAILING_STOP"
 
         # Trailing stop (percentage)
         if self.trailing_stop_percent is not None and self.highest_price is not None:
             if self.side == "BUY" and current_price <= (self.highest_price * (1 - self.trailing_stop_percent / 100.0)):
-                return True, "TRAILING_STOP", current_price
+                return "TRAILING_STOP"
             if self.side == "SELL" and current_price >= (self.lowest_price * (1 + self.trailing_stop_percent / 100.0)):
-                return True, "TRAILING_STOP", current_price
+                return "TRAILING_STOP"
+
+        return None
+
+    def _first_level_crossed(self, start: float, end: float) -> tuple[float, str] | None:
+        """Exit level first touched while the price moves from ``start`` to ``end``, if any.
+
+        Trailing levels use the extremes reached up to ``start``: while the
+        price moves in the leg's favour it sits at the new extreme, so a
+        trailing stop can only be touched on an adverse move.
+        """
+        direction = 1.0 if self.side == "BUY" else -1.0
+        levels: list[tuple[float, str]] = []
+        if self.exit_target is not None and self._target_quantity() > 0:
+            levels.append((self.entry_price + direction * self.exit_target, "TARGET"))
+        if self.exit_stop_loss is not None:
+            levels.append((self.entry_price - direction * self.exit_stop_loss, "STOP_LOSS"))
+        if self.trailing_stop_points is not None:
+            if self.side == "BUY":
+                levels.append((self.highest_price - self.trailing_stop_points, "TRAILING_STOP"))
+            else:
+                levels.append((self.lowest_price + self.trailing_stop_points, "TRAILING_STOP"))
+        if self.trailing_stop_percent is not None:
+            if self.side == "BUY":
+                levels.append((self.highest_price * (1 - self.trailing_stop_percent / 100.0), "TRAILING_STOP"))
+            else:
+                levels.append((self.lowest_price * (1 + self.trailing_stop_percent / 100.0), "TRAILING_STOP"))
+
+        low, high = min(start, end), max(start, end)
+        hits = [(abs(level - start), rank, level, reason) for rank, (level, reason) in enumerate(levels) if low <= level <= high]
+        if not hits:
+            return None
+        _, _, level, reason = min(hits)
+        return level, reason
+
+    def _target_quantity(self) -> int:
+        if self.partial_square_off_percent is not None:
+            return int(self.remaining_quantity * (self.partial_square_off_percent / 100.0))
+        return self.remaining_quantity
+
+    def _time_expired(self, timestamp_ns: int) -> bool:
+        if self.time_based_exit_minutes is None:
+            return False
+        return timestamp_ns - self.entry_ns >= self.time_based_exit_minutes * 60_000_000_000
 
-        # Time-based exit
-        if self.time_based_exit_minutes is not None:
-            elapsed = (current_time - self.entry_time).total_seconds() / 60.0
-            if elapsed >= self.time_based_exit_minutes:
-                return True, "TIME_BASED", current_price
-
-        return False, None, None
+    @property
+    def leg_id(self) -> str:
+        return leg_id(self.symbol, self.side)
 
     def calculate_pnl(self, exit_price: float) -> float:
         """Calculate P&L for this leg."""
@@ -104,6 +207,85 @@ class LegState:
         return (self.entry_price - exit_price) * self.quantity
 
 
+class LegRegistry:
+    """Active legs indexed by symbol and by (symbol, side).
+
+    Leg configurations are grouped per symbol once at construction, so each
+    event only looks at the legs of its own symbol. Only the first
+    configuration per (symbol, side) trades, as only one leg per (symbol, side)
+    can be active. Entry conditions are parsed here, once per backtest, and
+    the runner fills ``entry_masks`` with their signals: per replay batch in
+    EVENT mode, over each symbol's whole history in VECTORIZED mode.
+    Activation checks, adds and removals are dictionary operations, and
+    iteration yields legs in entry order.
+    """
+
+    def __init__(self, leg_configs: Iterable[dict] | None = None) -> None:
+        self.configs_by_symbol: dict[str, list[dict]] = {}
+        self.conditions: dict[int, EntryCondition] = {}  # keyed by id() of the leg config
+        self.entry_masks: dict[int, np.ndarray] = {}
+        for leg_cfg in leg_configs or []:
+            configs = self.configs_by_symbol.setdefault(leg_cfg["symbol"], [])
+            if any(existing["side"] == leg_cfg["side"] for existing in configs):
+                continue
+            configs.append(leg_cfg)
+            if leg_cfg.get("entry_condition"):
+                self.conditions[id(leg_cfg)] = parse_condition(leg_cfg["entry_condition"])
+        self._active: dict[tuple[str, str], LegState] = {}
+        self._by_symbol: dict[str, dict[str, LegState]] = {}
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def __iter__(self) -> Iterator[LegState]:
+        return iter(list(self._active.values()))
+
+    def is_active(self, symbol: str, side: str) -> bool:
+        return (symbol, side) in self._active
+
+    def may_enter(self, leg_cfg: dict, row: int) -> bool:
+        """Whether ``leg_cfg``'s entry condition allows an entry at ``row`` of the current batch."""
+        mask = self.entry_masks.get(id(leg_cfg))
+        if mask is None:
+            return id(leg_cfg) not in self.conditions
+        return 0 <= row < len(mask) and bool(mask[row])
+
+    def restore(self, legs: Iterable[LegState]) -> None:
+        """Reinstate checkpointed active legs, given in entry order."""
+        for leg in legs:
+            self.add(leg)
+
+    def add(self, leg: LegState) -> None:
+        self._active[(leg.symbol, leg.side)] = leg
+        self._by_symbol.setdefault(leg.symbol, {})[leg.side] = leg
+
+    def remove(self, leg: LegState) -> None:
+        del self._active[(leg.symbol, leg.side)]
+        del self._by_symbol[leg.symbol][leg.side]
+
+    def for_symbol(self, symbol: str) -> list[LegState]:
+        """Active legs on ``symbol`` in entry order (a snapshot, safe to mutate the registry)."""
+        legs = self._by_symbol.get(symbol)
+        return list(legs.values()) if legs else []
+
+
+@dataclass(slots=True)
+class BacktestProgress:
+    """Snapshot handed to progress callbacks while a backtest runs."""
+
+    events_processed: int
+    fraction: float
+    timestamp: datetime | None = None  # simulated time of the latest event
+    equity: float | None = None  # cash plus marked position value
+    trade_count: int = 0
+    drawdown: float = 0.0  # current decline from peak equity, as a non-positive fraction of the peak
+    max_drawdown: float = 0.0  # most negative drawdown so far, as in BacktestMetrics
+
+
+class BacktestCancelled(Exception):
+    """Raised from a progress callback to abort a running backtest."""
+
+
 @dataclass(slots=True)
 class BacktestConfig:
     strategy_id: str
@@ -113,6 +295,19 @@ class BacktestConfig:
     initial_capital: float = 10_00_000.0
     order_generator: Iterable[SimulationOrder] | None = None
     legs: list[dict] | None = None  # List of leg configurations
+    execution_mode: ExecutionMode = ExecutionMode.EVENT
+    progress_callback: Callable[[BacktestProgress], None] | None = None
+    progress_interval: int = 10_000  # Events between progress callbacks
+    progress_min_seconds: float = 0.0  # Minimum wall-clock gap between progress callbacks
+    equity_sampling: EquitySampling = EquitySampling.EVENT
+    equity_bar_seconds: int = 60  # Bucket width for EquitySampling.BAR
+    bar_timeframe: Timeframe | None = None  # Replay session-aligned bars instead of ticks
+    intrabar_path: IntrabarPath = IntrabarPath.NEAREST  # How leg exits are resolved inside a bar
+    session: TradingSession = NSE_SESSION
+    on_bar: Callable[[Bar], Iterable[SimulationOrder]] | None = None  # Orders fill at the bar close
+    indicator_cache: IndicatorCache | None = None  # Shared store of precomputed indicator columns
+    checkpoint: BacktestCheckpoint | None = None  # Periodic resumable state; EVENT mode only
+    batch_size: int = DEFAULT_BATCH_SIZE  # Rows per replay batch in EVENT mode
 
 
 @dataclass(slots=True)
@@ -121,12 +316,20 @@ class BacktestResult:
     equity_curve: pl.DataFrame
     trades: list[SimulationResult]
     final_state: AccountState
+    equity: EquityRecorder | None = None
+    ledger: TradeLedger | None = None
+
+    @property
+    def final_equity(self) -> float:
+        """Cash plus open positions at their last mark; cash alone when nothing was recorded."""
+        if self.equity is not None and len(self.equity):
+            return float(self.equity.equity[-1])
+        return self.final_state.cash_balance
 
     @property
     def total_return(self) -> float:
         start_value = self.config.initial_capital
-        end_value = self.final_state.cash_balance
-        return (end_value - start_value) / start_value
+        return (self.final_equity - start_value) / start_value
 
 
 class BacktestRunner:
@@ -139,136 +342,577 @@ class BacktestRunner:
         portfolio = PortfolioManager(AccountState(cash_balance=config.initial_capital))
         engine = SimulationEngine(portfolio)
         trades: list[SimulationResult] = []
-        equity_points: list[dict[str, float | datetime]] = []
-        active_legs: list[LegState] = []
-
-        # Initialize legs if provided
-        if config.legs:
-            for leg_cfg in config.legs:
-                # Legs will be entered when entry conditions are met during data processing
-                pass
-
-        # Process historical data
-        for symbol in config.symbols:
-            historical = self.data_provider.historical(symbol, config.start, config.end)
-            for event in historical:
-                # Process market data for pending orders
-                for result in engine.process_market_data(event):
-                    trades.append(result)
-
-                # Handle leg logic if legs are configured
-                if config.legs:
-                    self._process_leg_logic(
-                        event, config, active_legs, engine, trades, portfolio
-                    )
-
-                equity_points.append(
-                    {
-                        "timestamp": event.timestamp,
-                        "cash_balance": portfolio.state.cash_balance,
-                    }
-                )
+        recorder = EquityRecorder(config.equity_sampling, config.equity_bar_seconds)
+        # Legs are entered when entry conditions are met during data processing
+        active_legs = LegRegistry(config.legs)
+
+        # Running equity peak and worst drawdown, reported with progress updates
+        equity = peak_equity = config.initial_capital
+        max_drawdown = 0.0
+
+        checkpoint = config.checkpoint if config.execution_mode == ExecutionMode.EVENT else None
+        resumed: RunCheckpoint | None = None
+        if checkpoint is not None:
+            fingerprint = config_fingerprint(config)
+            resumed = checkpoint.load(fingerprint, recorder)
+        if resumed is not None:
+            portfolio.reset(resumed.account)
+            engine.pending_orders = resumed.pending_orders
+            engine.ledger = resumed.ledger
+            trades = resumed.trades
+            active_legs.restore(resumed.legs)
+            equity, peak_equity, max_drawdown = resumed.equity, resumed.peak_equity, resumed.max_drawdown
+
+        if config.execution_mode == ExecutionMode.VECTORIZED:
+            if config.bar_timeframe is not None:
+                raise ValueError("Bar replay is only supported in EVENT execution mode")
+            events_processed, last_timestamp = self._run_vectorized(config, active_legs, engine, trades, portfolio, recorder)
+            if len(recorder):
+                curve = recorder.equity
+                peaks = np.maximum(np.maximum.accumulate(curve), peak_equity)
+                equity, peak_equity = float(curve[-1]), float(peaks[-1])
+                max_drawdown = min(float(np.min(curve / peaks)) - 1.0, 0.0) if peak_equity > 0 else 0.0
+        else:
+            # Process historical data across symbols in global timestamp order
+            events_processed = 0
+            last_timestamp = None
+            last_emitted = time.perf_counter()
+            # Mark-to-market value of open positions, updated for the symbol of each event
+            position_value = 0.0
+            marked_values: dict[str, float] = {}
+            if resumed is not None:
+                events_processed, last_timestamp = resumed.events_processed, resumed.last_timestamp
+                position_value = resumed.position_value
+                marked_values = resumed.marked_values
+            # Signals are attached before skipping, so a resumed run warms its indicators up on the skipped rows
+            stream = self._with_entry_signals(self._replay(config), config, active_legs)
+            if resumed is not None:
+                stream = self._skip_replayed(stream, resumed, checkpoint)
+            for batch, bars, entry_masks in stream:
+                active_legs.entry_masks = entry_masks
+                if batch.tz is not None:
+                    recorder.time_zone = "UTC"
+                names = batch.symbols
+                symbol_ids = batch.symbol_ids.tolist()
+                prices = batch.prices.tolist()
+                for row, timestamp_ns in enumerate(batch.timestamps_ns.tolist()):
+                    events_processed += 1
+                    # Bars are marked, and fill pending orders, at their close
+                    bar = bars[row] if bars is not None else None
+                    symbol = names[symbol_ids[row]]
+                    price = prices[row]
+
+                    # Process market data for pending orders
+                    if engine.pending_orders:
+                        trades.extend(engine.process_tick(symbol, price, batch.timestamp_at(row)))
+
+                    # Handle leg logic if legs are configured
+                    if config.legs:
+                        if bar is None:
+                            self._process_leg_logic(
+                                batch, row, symbol, price, timestamp_ns, config, active_legs, engine, trades, portfolio
+                            )
+                        else:
+                            self._process_bar_legs(bar, row, config, active_legs, engine, trades, portfolio)
+
+                    if bar is not None and config.on_bar is not None:
+                        for order in config.on_bar(bar):
+                            trades.append(engine.submit_order(order, market_price=bar.close))
+
+                    position = portfolio.get_position(symbol)
+                    marked = position.quantity * price if position is not None else 0.0
+                    position_value += marked - marked_values.get(symbol, 0.0)
+                    marked_values[symbol] = marked
+                    cash = portfolio.state.cash_balance
+                    equity = cash + position_value
+                    if equity > peak_equity:
+                        peak_equity = equity
+                    elif peak_equity > 0 and equity / peak_equity - 1.0 < max_drawdown:
+                        max_drawdown = equity / peak_equity - 1.0
+                    recorder.record(timestamp_ns, cash, position_value)
+
+                    # Saved before the progress callback, which may cancel the run
+                    if checkpoint is not None and events_processed % checkpoint.interval_events == 0:
+                        checkpoint.save(
+                            RunCheckpoint(
+                                fingerprint=fingerprint,
+                                events_processed=events_processed,
+                                last_timestamp=batch.timestamp_at(row),
+                                equity=equity,
+                                peak_equity=peak_equity,
+                                max_drawdown=max_drawdown,
+                                position_value=position_value,
+                                marked_values=marked_values,
+                                account=portfolio.state,
+                                pending_orders=engine.pending_orders,
+                                legs=list(active_legs),
+                                ledger=engine.ledger,
+                                trades=trades,
+                            ),
+                            recorder,
+                        )
+
+                    if config.progress_callback is not None and events_processed % config.progress_interval == 0:
+                        now = time.perf_counter()
+                        if now - last_emitted >= config.progress_min_seconds:
+                            last_emitted = now
+                            timestamp = batch.timestamp_at(row)
+                            config.progress_callback(
+                                BacktestProgress(
+                                    events_processed,
+                                    self._elapsed_fraction(config, timestamp),
+                                    timestamp,
+                                    equity,
+                                    len(trades),
+                                    self._drawdown(equity, peak_equity),
+                                    max_drawdown,
+                                )
+                            )
+                if len(batch):
+                    last_timestamp = batch.timestamp_at(len(batch) - 1)
 
         # Close any remaining active legs at end
-        if active_legs:
-            for leg in active_legs:
-                if leg.remaining_quantity > 0 and leg.exit_price is None:
-                    # Force exit at last known price
-                    last_price = leg.highest_price or leg.entry_price
-                    if leg.side == "SELL":
-                        last_price = leg.lowest_price or leg.entry_price
-                    self._exit_leg(leg, last_price, "END_OF_BACKTEST", engine, trades, portfolio)
+        for leg in active_legs:
+            if leg.remaining_quantity > 0 and leg.exit_price is None:
+                # Force exit at last known price
+                last_price = leg.highest_price or leg.entry_price
+                if leg.side == "SELL":
+                    last_price = leg.lowest_price or leg.entry_price
+                self._exit_leg(leg, last_price, "END_OF_BACKTEST", last_timestamp, engine, trades, portfolio)
 
         if config.order_generator is not None:
             for order in config.order_generator:
                 trades.append(engine.submit_order(order, market_price=0.0))
 
-        equity_df = pl.DataFrame(equity_points) if equity_points else pl.DataFrame({"timestamp": [], "cash_balance": []})
+        if config.progress_callback is not None:
+            config.progress_callback(
+                BacktestProgress(
+                    events_processed,
+                    1.0,
+                    last_timestamp,
+                    equity,
+                    len(trades),
+                    self._drawdown(equity, peak_equity),
+                    max_drawdown,
+                )
+            )
+        if checkpoint is not None:
+            checkpoint.clear()
         return BacktestResult(
             config=config,
-            equity_curve=equity_df,
+            equity_curve=recorder.to_frame(),
             trades=trades,
             final_state=portfolio.state,
+            equity=recorder,
+            ledger=engine.ledger,
         )
 
+    def indicator_column(
+        self,
+        config: BacktestConfig,
+        history: SymbolHistory,
+        indicator: str,
+        params: Mapping[str, Any],
+        compute: Callable[[], np.ndarray],
+    ) -> np.ndarray:
+        """Indicator column over ``history``, looked up in ``config.indicator_cache`` before computing."""
+        if config.indicator_cache is None:
+            return compute()
+        timeframe = config.bar_timeframe.value if config.bar_timeframe is not None else "tick"
+        version = history.version(self.data_provider, config.start, config.end)
+        return config.indicator_cache.get_or_compute(history.symbol, timeframe, indicator, params, version, compute)
+
+    def entry_signal(self, config: BacktestConfig, history: SymbolHistory, condition: EntryCondition) -> np.ndarray:
+        """Whether ``condition`` holds at each row of ``history``, from one vectorized pass.
+
+        Indicator columns come from ``config.indicator_cache`` when one is set.
+        """
+        if not len(history):
+            return np.zeros(0, dtype=bool)
+        columns = [
+            pl.Series(
+                call.column,
+                self.indicator_column(
+                    config,
+                    history,
+                    call.name,
+                    call.params,
+                    lambda call=call: call.compute(history.prices),
+                ),
+            ).fill_nan(None)
+            for call in condition.indicators
+        ]
+        return history.frame.with_columns(columns).select(condition.expr()).to_series().to_numpy()
+
+    def _load_entry_signals(
+        self, config: BacktestConfig, active_legs: LegRegistry, histories: Iterable[SymbolHistory]
+    ) -> None:
+        """Precompute the entry signal of every conditional leg over its symbol's whole history."""
+        for history in histories:
+            for leg_cfg in active_legs.configs_by_symbol.get(history.symbol, []):
+                condition = active_legs.conditions.get(id(leg_cfg))
+                if condition is not None:
+                    active_legs.entry_masks[id(leg_cfg)] = self.entry_signal(config, history, condition)
+
+    def _replay(self, config: BacktestConfig) -> Iterator[tuple[MarketDataBatch, list[Bar] | None]]:
+        """Batches of the replay in global time order, each with its bars when replaying bars."""
+        if config.bar_timeframe is None:
+            batches = replay_batches(self.data_provider, config.symbols, config.start, config.end, config.batch_size)
+            return ((batch, None) for batch in batches)
+        bars = merge_bars(self.data_provider, config.symbols, config.start, config.end, config.bar_timeframe, config.session)
+        return bar_batches(bars, config.symbols, config.batch_size)
+
+    def _with_entry_signals(
+        self,
+        stream: Iterator[tuple[MarketDataBatch, list[Bar] | None]],
+        config: BacktestConfig,
+        active_legs: LegRegistry,
+    ) -> Iterator[tuple[MarketDataBatch, list[Bar] | None, dict[int, np.ndarray]]]:
+        """Attach to each batch the entry signal of every conditional leg at each of its rows.
+
+        Without an indicator cache, conditions are evaluated batch by batch on
+        their symbol's rows, keeping only each indicator's warm-up tail in
+        between, so memory stays bounded by the batch size rather than the
+        history. With ``config.indicator_cache`` set, each signal is computed
+        once over its symbol's whole history through the cache, as in
+        VECTORIZED mode, and read per batch by the rows' positions in their
+        symbol. On bars a signal is read at the previous bar's close, so it is
+        shifted by one bar of its symbol.
+        """
+        symbols = {
+            id(leg_cfg): leg_cfg["symbol"]
+            for configs in active_legs.configs_by_symbol.values()
+            for leg_cfg in configs
+            if id(leg_cfg) in active_legs.conditions
+        }
+        precomputed: dict[int, np.ndarray] = {}
+        signals: dict[int, RollingEntrySignal] = {}
+        if config.indicator_cache is not None and symbols:
+            histories = (self._signal_history(config, symbol) for symbol in dict.fromkeys(symbols.values()))
+            self._load_entry_signals(config, active_legs, histories)
+            precomputed = dict(active_legs.entry_masks)
+        else:
+            signals = {key: RollingEntrySignal(active_legs.conditions[key]) for key in symbols}
+        shift = 1 if config.bar_timeframe is not None else 0
+        seen: dict[str, int] = {}  # rows of each symbol in earlier batches
+        previous_close: dict[int, bool] = {}
+        for batch, bars in stream:
+            masks: dict[int, np.ndarray] = {}
+            rows_of: dict[str, np.ndarray] = {}
+            for key, symbol in symbols.items():
+                mask = masks[key] = np.zeros(len(batch), dtype=bool)
+                if symbol not in batch.symbols:
+                    continue
+                rows = rows_of.get(symbol)
+                if rows is None:
+                    rows = rows_of[symbol] = np.flatnonzero(batch.symbol_ids == batch.symbols.index(symbol))
+                if key in precomputed:
+                    signal = precomputed[key]
+                    index = np.arange(len(rows)) + seen.get(symbol, 0) - shift
+                    inside = (index >= 0) & (index < len(signal))
+                    mask[rows[inside]] = signal[index[inside]]
+                    continue
+                values = signals[key].update(batch.timestamps_ns[rows], batch.prices[rows], batch.tz)
+                if shift and len(values):
+                    shifted = np.concatenate(([previous_close.get(key, False)], values[:-1]))
+                    previous_close[key], values = bool(values[-1]), shifted
+                mask[rows] = values
+            for symbol, rows in rows_of.items():
+                seen[symbol] = seen.get(symbol, 0) + len(rows)
+            yield batch, bars, masks
+
+    def _signal_history(self, config: BacktestConfig, symbol: str) -> SymbolHistory:
+        if config.bar_timeframe is None:
+            return load_history(self.data_provider, symbol, config.start, config.end)
+        bars = iter_bars(self.data_provider.historical(symbol, config.start, config.end), config.bar_timeframe, config.session)
+        # Conditions on bars are evaluated at the bar close
+        return SymbolHistory.from_events(
+            symbol, (MarketDataEvent(symbol=symbol, timestamp=bar.end, price=bar.close) for bar in bars)
+        )
+
+    @staticmethod
+    def _skip_replayed(
+        stream: Iterator[tuple[MarketDataBatch, list[Bar] | None, dict[int, np.ndarray]]],
+        resumed: RunCheckpoint,
+        checkpoint: BacktestCheckpoint,
+    ) -> Iterator[tuple[MarketDataBatch, list[Bar] | None, dict[int, np.ndarray]]]:
+        """Advance ``stream`` past the events a resumed run already processed.
+
+        The skipped events are still read from the provider but not simulated.
+        The last one must fall at the checkpoint's timestamp; otherwise the
+        data changed since the checkpoint was taken, and it is discarded.
+        """
+        remaining, last_ns = resumed.events_processed, None
+        head: list[tuple[MarketDataBatch, list[Bar] | None, dict[int, np.ndarray]]] = []
+        for batch, bars, entry_masks in stream:
+            if remaining < len(batch):
+                last_ns = int(batch.timestamps_ns[remaining - 1])
+                bars = bars[remaining:] if bars is not None else None
+                entry_masks = {key: mask[remaining:] for key, mask in entry_masks.items()}
+                head.append((batch.slice(remaining), bars, entry_masks))
+                remaining = 0
+                break
+            remaining -= len(batch)
+            if len(batch):
+                last_ns = int(batch.timestamps_ns[-1])
+            if not remaining:
+                break
+        if remaining or last_ns is None or last_ns != datetime_to_ns(resumed.last_timestamp):
+            checkpoint.clear()
+            raise CheckpointError(
+                f"Market data no longer matches the checkpoint after {resumed.events_processed} events; "
+                "the checkpoint was discarded"
+            )
+        return chain(head, stream)
+
+    @staticmethod
+    def _elapsed_fraction(config: BacktestConfig, timestamp: datetime) -> float:
+        """Share of the simulated window already replayed."""
+        span = (config.end - config.start).total_seconds()
+        if span <= 0:
+            return 0.0
+        return min(max((timestamp - config.start).total_seconds() / span, 0.0), 1.0)
+
+    @staticmethod
+    def _drawdown(equity: float, peak_equity: float) -> float:
+        return min(equity / peak_equity - 1.0, 0.0) if peak_equity > 0 else 0.0
+
     def _process_leg_logic(
         self,
-        event: MarketDataEvent,
+        batch: MarketDataBatch,
+        row: int,
+        symbol: str,
+        price: float,
+        timestamp_ns: int,
         config: BacktestConfig,
-        active_legs: list[LegState],
+        active_legs: LegRegistry,
         engine: SimulationEngine,
         trades: list[SimulationResult],
         portfolio: PortfolioManager,
     ) -> None:
-        """Process leg entry and exit logic based on market data."""
-        if not config.legs:
+        """Process leg entry and exit logic for the tick at ``batch[row]``.
+
+        The tick's ``datetime`` is only built when a leg enters or exits.
+        """
+        leg_cfgs = active_legs.configs_by_symbol.get(symbol)
+        if not leg_cfgs:
             return
 
-        # Check for leg entries
-        for leg_cfg in config.legs:
-            if leg_cfg["symbol"] != event.symbol:
-                continue
+        # Check for leg entries; legs without an entry condition enter immediately
+        for leg_cfg in leg_cfgs:
+            if not active_legs.is_active(leg_cfg["symbol"], leg_cfg["side"]) and active_legs.may_enter(leg_cfg, row):
+                self._enter_leg(leg_cfg, price, batch.timestamp_at(row), config, active_legs, engine, trades)
 
-            # Check if leg is already active
-            is_active = any(
-                leg.symbol == leg_cfg["symbol"]
-                and leg.side == leg_cfg["side"]
-                and leg.remaining_quantity > 0
-                for leg in active_legs
-            )
+        # Check for leg exits
+        for leg in active_legs.for_symbol(symbol):
+            leg.update_price(price)
+            should_exit, reason, exit_price = leg.should_exit_at(price, timestamp_ns)
 
-            if not is_active:
-                # Simple entry: enter immediately (entry_condition can be extended later)
-                leg_state = LegState(
-                    symbol=leg_cfg["symbol"],
-                    side=leg_cfg["side"],
-                    quantity=leg_cfg["quantity"],
-                    entry_price=event.price,
-                    entry_time=event.timestamp,
-                    exit_target=leg_cfg.get("exit_target"),
-                    exit_stop_loss=leg_cfg.get("exit_stop_loss"),
-                    trailing_stop_points=leg_cfg.get("trailing_stop_points"),
-                    trailing_stop_percent=leg_cfg.get("trailing_stop_percent"),
-                    partial_square_off_percent=leg_cfg.get("partial_square_off_percent"),
-                    time_based_exit_minutes=leg_cfg.get("time_based_exit_minutes"),
-                )
-                active_legs.append(leg_state)
-
-                # Submit entry order
-                order = SimulationOrder(
-                    order_id=f"LEG-{len(active_legs)}-ENTRY",
-                    symbol=leg_cfg["symbol"],
-                    side=OrderSide.BUY if leg_cfg["side"] == "BUY" else OrderSide.SELL,
-                    order_type=OrderType.MARKET,
-                    quantity=leg_cfg["quantity"],
-                    timestamp=event.timestamp,
-                    strategy_id=config.strategy_id,
-                )
-                result = engine.submit_order(order, market_price=event.price)
-                trades.append(result)
+            if should_exit and exit_price is not None:
+                self._exit_leg(leg, exit_price, reason or "UNKNOWN", batch.timestamp_at(row), engine, trades, portfolio)
+                if leg.remaining_quantity <= 0:
+                    active_legs.remove(leg)
 
-        # Check for leg exits
-        legs_to_remove: list[LegState] = []
-        for leg in active_legs:
-            if leg.symbol != event.symbol or leg.remaining_quantity <= 0:
-                continue
+    def _process_bar_legs(
+        self,
+        bar: Bar,
+        row: int,
+        config: BacktestConfig,
+        active_legs: LegRegistry,
+        engine: SimulationEngine,
+        trades: list[SimulationResult],
+        portfolio: PortfolioManager,
+    ) -> None:
+        """Bar counterpart of ``_process_leg_logic``: enter at the open, exit along the intrabar path.
+
+        ``bar`` is at ``row`` of the current batch. An entry condition is read
+        at the previous bar's close, so the entry at this bar's open does not
+        look ahead.
+        """
+        leg_cfgs = active_legs.configs_by_symbol.get(bar.symbol)
+        if not leg_cfgs:
+            return
 
-            leg.update_price(event.price)
-            should_exit, reason, exit_price = leg.should_exit(event.price, event.timestamp)
+        for leg_cfg in leg_cfgs:
+            if not active_legs.is_active(leg_cfg["symbol"], leg_cfg["side"]) and active_legs.may_enter(leg_cfg, row):
+                self._enter_leg(leg_cfg, bar.open, bar.start, config, active_legs, engine, trades)
 
+        for leg in active_legs.for_symbol(bar.symbol):
+            should_exit, reason, exit_price = leg.should_exit_on_path(bar.path(config.intrabar_path, leg.side), bar.end)
             if should_exit and exit_price is not None:
-                self._exit_leg(leg, exit_price, reason or "UNKNOWN", engine, trades, portfolio)
+                self._exit_leg(leg, exit_price, reason or "UNKNOWN", bar.end, engine, trades, portfolio)
                 if leg.remaining_quantity <= 0:
-                    legs_to_remove.append(leg)
+                    active_legs.remove(leg)
+
+    def _enter_leg(
+        self,
+        leg_cfg: dict,
+        price: float,
+        timestamp: datetime,
+        config: BacktestConfig,
+        active_legs: LegRegistry,
+        engine: SimulationEngine,
+        trades: list[SimulationResult],
+    ) -> LegState:
+        """Activate a leg and submit its entry order at the given price."""
+        leg_state = LegState(
+            symbol=leg_cfg["symbol"],
+            side=leg_cfg["side"],
+            quantity=leg_cfg["quantity"],
+            entry_price=price,
+            entry_time=timestamp,
+            exit_target=leg_cfg.get("exit_target"),
+            exit_stop_loss=leg_cfg.get("exit_stop_loss"),
+            trailing_stop_points=leg_cfg.get("trailing_stop_points"),
+            trailing_stop_percent=leg_cfg.get("trailing_stop_percent"),
+            partial_square_off_percent=leg_cfg.get("partial_square_off_percent"),
+            time_based_exit_minutes=leg_cfg.get("time_based_exit_minutes"),
+        )
+        active_legs.add(leg_state)
+
+        # Submit entry order
+        order = SimulationOrder(
+            order_id=f"LEG-{len(active_legs)}-ENTRY",
+            symbol=leg_cfg["symbol"],
+            side=OrderSide.BUY if leg_cfg["side"] == "BUY" else OrderSide.SELL,
+            order_type=OrderType.MARKET,
+            quantity=leg_cfg["quantity"],
+            timestamp=timestamp,
+            strategy_id=config.strategy_id,
+            metadata={"leg_id": leg_state.leg_id},
+        )
+        result = engine.submit_order(order, market_price=price)
+        trades.append(result)
+        return leg_state
 
-        for leg in legs_to_remove:
-            active_legs.remove(leg)
+    def _run_vectorized(
+        self,
+        config: BacktestConfig,
+        active_legs: LegRegistry,
+        engine: SimulationEngine,
+        trades: list[SimulationResult],
+        portfolio: PortfolioManager,
+        recorder: EquityRecorder,
+    ) -> tuple[int, datetime | None]:
+        """Resolve leg exits over columnar history and replay only the resulting orders.
+
+        Orders go through the same entry/exit helpers as the per-tick path, in the
+        same global (timestamp, symbol) order, so trades, order ids and exit
+        reasons are identical. Cash and marked position value are rebuilt in bulk
+        from the ticks that traded. Returns the number of events replayed and the
+        last simulated timestamp.
+        """
+        histories: list[SymbolHistory] = []
+        for symbol in config.symbols:
+            histories.append(load_history(self.data_provider, symbol, config.start, config.end))
+            if config.progress_callback is not None:
+                loaded = sum(len(history) for history in histories)
+                config.progress_callback(BacktestProgress(loaded, 0.5 * len(histories) / len(config.symbols)))
+        total = sum(len(history) for history in histories)
+        if not total:
+            return 0, None
+        if active_legs.conditions:
+            self._load_entry_signals(config, active_legs, histories)
+
+        # Global replay position of every (symbol, tick), matching merge_histories.
+        offsets = np.cumsum([0] + [len(history) for history in histories[:-1]])
+        order = np.lexsort(
+            (
+                np.concatenate([np.arange(len(history)) for history in histories]),
+                np.concatenate([np.full(len(history), rank) for rank, history in enumerate(histories)]),
+                np.concatenate([history.timestamps_ns for history in histories]),
+            )
+        )
+        position = np.empty(total, dtype=np.int64)
+        position[order] = np.arange(total)
+
+        # Entries precede exits within a tick; exits follow entry order.
+        actions: list[tuple[int, int, int, int, LegLifecycle, int]] = []
+        for rank, history in enumerate(histories):
+            if not config.legs or not len(history):
+                continue
+            for cycle in resolve_leg_lifecycles(history, config.legs, active_legs.entry_masks):
+                entry_at = int(position[offsets[rank] + cycle.entry_index])
+                actions.append((entry_at, 0, cycle.rank, 0, cycle, rank))
+                if cycle.exit_index is not None:
+                    exit_at = int(position[offsets[rank] + cycle.exit_index])
+                    actions.append((exit_at, 1, cycle.entry_index, cycle.rank, cycle, rank))
+        actions.sort(key=lambda action: action[:4])
+
+        opening_balance = portfolio.state.cash_balance
+        states: dict[int, LegState] = {}
+        marks: list[int] = []
+        balances: list[float] = []
+        quantities: dict[int, list[tuple[int, int]]] = {}
+        for at, phase, _, _, cycle, rank in actions:
+            history = histories[rank]
+            if phase == 0:
+                index = cycle.entry_index
+                leg = self._enter_leg(
+                    cycle.leg_cfg,
+                    float(history.prices[index]),
+                    history.timestamp_at(index),
+                    config,
+                    active_legs,
+                    engine,
+                    trades,
+                )
+                states[id(cycle)] = leg
+                if cycle.exit_index is None:
+                    leg.highest_price = cycle.highest_price
+                    leg.lowest_price = cycle.lowest_price
+            else:
+                leg = states.pop(id(cycle))
+                exit_price = float(history.prices[cycle.exit_index])
+                self._exit_leg(
+                    leg,
+                    exit_price,
+                    cycle.exit_reason or "UNKNOWN",
+                    history.timestamp_at(cycle.exit_index),
+                    engine,
+                    trades,
+                    portfolio,
+                )
+                active_legs.remove(leg)
+            if marks and marks[-1] == at:
+                balances[-1] = portfolio.state.cash_balance
+            else:
+                marks.append(at)
+                balances.append(portfolio.state.cash_balance)
+            quantities.setdefault(rank, []).append((at, portfolio.get_position(history.symbol).quantity))
+
+        rows = np.arange(total)
+        cash = np.full(total, opening_balance)
+        if marks:
+            slots = np.searchsorted(np.asarray(marks), rows, side="right") - 1
+            traded = slots >= 0
+            cash[traded] = np.asarray(balances)[slots[traded]]
+
+        # Each symbol is marked at its latest tick with the quantity held after it.
+        position_value = np.zeros(total)
+        for rank, changes in quantities.items():
+            history = histories[rank]
+            symbol_rows = position[offsets[rank] : offsets[rank] + len(history)]
+            latest_tick = np.searchsorted(symbol_rows, rows, side="right") - 1
+            change_rows = np.asarray([at for at, _ in changes])
+            held = np.asarray([quantity for _, quantity in changes], dtype=np.float64)
+            slots = np.searchsorted(change_rows, rows, side="right") - 1
+            holding = slots >= 0
+            position_value[holding] += held[slots[holding]] * history.prices[latest_tick[holding]]
+
+        if any(history.frame["timestamp"].dtype.time_zone for history in histories if len(history)):
+            recorder.time_zone = "UTC"
+        recorder.record_many(np.concatenate([history.timestamps_ns for history in histories])[order], cash, position_value)
+
+        last_rank = int(np.searchsorted(offsets, order[-1], side="right") - 1)
+        return total, histories[last_rank].timestamp_at(int(order[-1] - offsets[last_rank]))
 
     def _exit_leg(
         self,
         leg: LegState,
         exit_price: float,
         reason: str,
+        timestamp: datetime | None,
         engine: SimulationEngine,
         trades: list[SimulationResult],
         portfolio: PortfolioManager,
@@ -284,8 +928,9 @@ class BacktestRunner:
             side=exit_side,
             order_type=OrderType.MARKET,
             quantity=leg.remaining_quantity,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp or datetime.utcnow(),
             strategy_id="leg-strategy",
+            metadata={"exit_reason": reason, "leg_id": leg.leg_id},
         )
         result = engine.submit_order(order, market_price=exit_price)
         trades.append(result)
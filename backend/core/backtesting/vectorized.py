@@ -0,0 +1,216 @@
+"""Columnar leg-exit resolution for vectorized backtests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Mapping
+
+import numpy as np
+import polars as pl
+
+from ..data import MarketDataEvent, MarketDataProvider
+from ..data.fingerprint import history_version
+from ..data.frames import ColumnarMarketDataProvider
+
+# First-hit searches scan the price column in blocks that double in size, so a
+# leg that exits quickly only touches a few hundred rows while a long-lived leg
+# is still resolved in O(log n) numpy passes.
+EXIT_SEARCH_BLOCK = 256
+
+
+@dataclass(slots=True)
+class SymbolHistory:
+    """Columnar view of a single symbol's price history."""
+
+    symbol: str
+    frame: pl.DataFrame
+    timestamps_ns: np.ndarray = field(init=False)
+    prices: np.ndarray = field(init=False)
+    _version: str | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.timestamps_ns = self.frame["timestamp"].dt.epoch("ns").to_numpy()
+        self.prices = self.frame["price"].cast(pl.Float64).to_numpy()
+
+    def __len__(self) -> int:
+        return self.frame.height
+
+    def timestamp_at(self, index: int) -> datetime:
+        return self.frame["timestamp"][index]
+
+    def version(self, provider: MarketDataProvider, start: datetime, end: datetime) -> str:
+        """Data version used to key derived columns; computed once per history."""
+        if self._version is None:
+            self._version = history_version(provider, self.symbol, start, end, self.timestamps_ns, self.prices)
+        return self._version
+
+    @classmethod
+    def from_events(cls, symbol: str, events: Iterable[MarketDataEvent]) -> "SymbolHistory":
+        timestamps: list[datetime] = []
+        prices: list[float] = []
+        for event in events:
+            timestamps.append(event.timestamp)
+            prices.append(event.price)
+        if not timestamps:
+            return cls(symbol=symbol, frame=pl.DataFrame(schema={"timestamp": pl.Datetime("us"), "price": pl.Float64}))
+        frame = pl.DataFrame({"timestamp": timestamps, "price": prices})
+        return cls(symbol=symbol, frame=frame.with_columns(pl.col("price").cast(pl.Float64)))
+
+
+def load_history(provider: MarketDataProvider, symbol: str, start: datetime, end: datetime) -> SymbolHistory:
+    """Materialize a symbol's history from the provider as columns."""
+    if isinstance(provider, ColumnarMarketDataProvider):
+        frame = provider.history_frame(symbol, start, end).select("timestamp", pl.col("price").cast(pl.Float64))
+        return SymbolHistory(symbol=symbol, frame=frame)
+    return SymbolHistory.from_events(symbol, provider.historical(symbol, start, end))
+
+
+@dataclass(slots=True)
+class LegLifecycle:
+    """One entry/exit cycle of a leg resolved against a symbol history."""
+
+    leg_cfg: dict
+    rank: int
+    entry_index: int
+    exit_index: int | None = None
+    exit_reason: str | None = None
+    highest_price: float | None = None
+    lowest_price: float | None = None
+
+
+def _target_enabled(leg_cfg: dict) -> bool:
+    """Mirror LegState.should_exit: a partial square-off rounding to zero never fires."""
+    if leg_cfg.get("exit_target") is None:
+        return False
+    exit_qty = leg_cfg["quantity"]
+    partial = leg_cfg.get("partial_square_off_percent")
+    if partial is not None:
+        exit_qty = int(leg_cfg["quantity"] * (partial / 100.0))
+    return exit_qty > 0
+
+
+def _exit_masks(
+    leg_cfg: dict,
+    window: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    elapsed_ns: np.ndarray,
+    entry_price: float,
+) -> list[tuple[str, np.ndarray]]:
+    """Exit conditions for a price window, in the priority order of LegState.should_exit."""
+    is_buy = leg_cfg["side"] == "BUY"
+    price_diff = window - entry_price
+    if not is_buy:
+        price_diff = -price_diff
+
+    masks: list[tuple[str, np.ndarray]] = []
+    if _target_enabled(leg_cfg):
+        masks.append(("TARGET", price_diff >= leg_cfg["exit_target"]))
+    if leg_cfg.get("exit_stop_loss") is not None:
+        masks.append(("STOP_LOSS", price_diff <= -leg_cfg["exit_stop_loss"]))
+    points = leg_cfg.get("trailing_stop_points")
+    if points is not None:
+        if is_buy:
+            masks.append(("TRAILING_STOP", window <= (highs - points)))
+        else:
+            masks.append(("TRAILING_STOP", window >= (lows + points)))
+    percent = leg_cfg.get("trailing_stop_percent")
+    if percent is not None:
+        if is_buy:
+            masks.append(("TRAILING_STOP", window <= (highs * (1 - percent / 100.0))))
+        else:
+            masks.append(("TRAILING_STOP", window >= (lows * (1 + percent / 100.0))))
+    minutes = leg_cfg.get("time_based_exit_minutes")
+    if minutes is not None:
+        masks.append(("TIME_BASED", elapsed_ns >= int(minutes * 60 * 1_000_000_000)))
+    return masks
+
+
+def find_leg_exit(history: SymbolHistory, leg_cfg: dict, entry_index: int) -> tuple[int | None, str | None, float, float]:
+    """Locate the first tick at or after ``entry_index`` where the leg exits.
+
+    Returns ``(exit_index, reason, highest_price, lowest_price)``; the index and
+    reason are ``None`` when the leg is still open at the end of the history,
+    in which case the extremes cover the whole remaining window.
+    """
+    prices = history.prices
+    timestamps = history.timestamps_ns
+    total = len(prices)
+    entry_price = prices[entry_index]
+    entry_ns = timestamps[entry_index]
+    highest = lowest = entry_price
+
+    position = entry_index
+    block = EXIT_SEARCH_BLOCK
+    while position < total:
+        stop = min(total, position + block)
+        window = prices[position:stop]
+        highs = np.maximum.accumulate(window)
+        np.maximum(highs, highest, out=highs)
+        lows = np.minimum.accumulate(window)
+        np.minimum(lows, lowest, out=lows)
+        elapsed = timestamps[position:stop] - entry_ns
+
+        masks = _exit_masks(leg_cfg, window, highs, lows, elapsed, entry_price)
+        if masks:
+            hit = np.logical_or.reduce([mask for _, mask in masks])
+            if hit.any():
+                offset = int(np.argmax(hit))
+                reason = next(name for name, mask in masks if mask[offset])
+                return position + offset, reason, float(highs[offset]), float(lows[offset])
+
+        highest = highs[-1]
+        lowest = lows[-1]
+        position = stop
+        block *= 2
+    return None, None, float(highest), float(lowest)
+
+
+def resolve_leg_lifecycles(
+    history: SymbolHistory,
+    leg_cfgs: list[dict],
+    entry_masks: Mapping[int, np.ndarray] | None = None,
+) -> list[LegLifecycle]:
+    """Resolve every entry/exit cycle of the legs trading ``history.symbol``.
+
+    Matches the per-tick runner: only the first config per (symbol, side) can be
+    active, it enters on the first tick, exits on the first tick satisfying any
+    exit condition and re-enters on the following tick. A config with an entry
+    signal in ``entry_masks`` (keyed by ``id()`` of the config) instead enters
+    on the first such tick where its signal holds.
+    """
+    lifecycles: list[LegLifecycle] = []
+    seen_sides: set[str] = set()
+    total = len(history)
+    for rank, leg_cfg in enumerate(leg_cfgs):
+        if leg_cfg["symbol"] != history.symbol or leg_cfg["side"] in seen_sides:
+            continue
+        seen_sides.add(leg_cfg["side"])
+        mask = (entry_masks or {}).get(id(leg_cfg))
+        signals = np.flatnonzero(mask) if mask is not None else None
+
+        def next_entry(start: int) -> int:
+            if signals is None:
+                return start
+            slot = int(np.searchsorted(signals, start))
+            return int(signals[slot]) if slot < len(signals) else total
+
+        entry_index = next_entry(0)
+        while entry_index < total:
+            exit_index, reason, highest, lowest = find_leg_exit(history, leg_cfg, entry_index)
+            lifecycles.append(
+                LegLifecycle(
+                    leg_cfg=leg_cfg,
+                    rank=rank,
+                    entry_index=entry_index,
+                    exit_index=exit_index,
+                    exit_reason=reason,
+                    highest_price=highest,
+                    lowest_price=lowest,
+                )
+            )
+            if exit_index is None:
+                break
+            entry_index = next_entry(exit_index + 1)
+    return lifecycles
@@ -0,0 +1,152 @@
+"""Streaming aggregation of ticks into session-aligned OHLCV bars."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from typing import Iterable, Iterator
+from zoneinfo import ZoneInfo
+
+from . import MarketDataEvent
+
+
+class Timeframe(str, Enum):
+    M1 = "1m"
+    M5 = "5m"
+    M15 = "15m"
+    D1 = "1d"
+
+    @property
+    def seconds(self) -> int | None:
+        """Bar width in seconds for intraday timeframes; None for session-long daily bars."""
+        return {"1m": 60, "5m": 300, "15m": 900}.get(self.value)
+
+
+class IntrabarPath(str, Enum):
+    """Assumed order in which a bar visited its high and low."""
+
+    NEAREST = "NEAREST"  # whichever extreme is closer to the open first
+    OHLC = "OHLC"  # open, high, low, close
+    OLHC = "OLHC"  # open, low, high, close
+    PESSIMISTIC = "PESSIMISTIC"  # the extreme adverse to the position first
+
+
+@dataclass(frozen=True, slots=True)
+class TradingSession:
+    """Regular trading hours that intraday bars are aligned to.
+
+    Naive timestamps are taken as exchange-local wall time; aware timestamps
+    are converted to ``time_zone`` and bars keep that zone.
+    """
+
+    open: time = time(9, 15)
+    close: time = time(15, 30)
+    time_zone: str = "Asia/Kolkata"
+
+    def bounds(self, timestamp: datetime, timeframe: Timeframe) -> tuple[datetime, datetime] | None:
+        """Start and end of the bar containing ``timestamp``, or None outside the session."""
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(ZoneInfo(self.time_zone))
+        session_open, session_close = self._session(timestamp.date(), timestamp.tzinfo)
+        if timestamp < session_open or timestamp > session_close:
+            return None
+        width = timeframe.seconds
+        if width is None:
+            return session_open, session_close
+        session_seconds = (session_close - session_open).total_seconds()
+        index = min(int((timestamp - session_open).total_seconds() // width), math.ceil(session_seconds / width) - 1)
+        start = session_open + timedelta(seconds=index * width)
+        return start, min(start + timedelta(seconds=width), session_close)
+
+    def _session(self, day: date, tzinfo) -> tuple[datetime, datetime]:
+        return datetime.combine(day, self.open, tzinfo), datetime.combine(day, self.close, tzinfo)
+
+
+NSE_SESSION = TradingSession()
+
+
+@dataclass(slots=True)
+class Bar:
+    symbol: str
+    start: datetime
+    end: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+    ticks: int = 0
+
+    def update(self, price: float, volume: float = 0.0) -> None:
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+        self.ticks += 1
+
+    def path(self, assumption: IntrabarPath, side: str = "BUY") -> tuple[float, float, float, float]:
+        """Waypoints the price is assumed to have moved through inside the bar."""
+        high_first = {
+            IntrabarPath.OHLC: True,
+            IntrabarPath.OLHC: False,
+            IntrabarPath.NEAREST: self.high - self.open <= self.open - self.low,
+            IntrabarPath.PESSIMISTIC: side != "BUY",
+        }[assumption]
+        if high_first:
+            return self.open, self.high, self.low, self.close
+        return self.open, self.low, self.high, self.close
+
+
+class BarAggregator:
+    """Fold ticks into bars of one timeframe, one open bar per symbol.
+
+    ``update`` is O(1) per tick: a tick inside the symbol's open bar only
+    touches that bar, and bucket boundaries are computed once per new bar.
+    Ticks outside the trading session are ignored.
+    """
+
+    def __init__(self, timeframe: Timeframe, session: TradingSession = NSE_SESSION) -> None:
+        self.timeframe = timeframe
+        self.session = session
+        self._open: dict[str, Bar] = {}
+
+    def update(self, event: MarketDataEvent) -> Bar | None:
+        """Add a tick; returns the symbol's previous bar once a tick falls past its end."""
+        volume = getattr(event, "volume", 0.0) or 0.0
+        bar = self._open.get(event.symbol)
+        if bar is not None and bar.start <= event.timestamp < bar.end:
+            bar.update(event.price, volume)
+            return None
+        bounds = self.session.bounds(event.timestamp, self.timeframe)
+        if bounds is None:
+            return None
+        if bar is not None and bounds[0] == bar.start:  # a tick stamped exactly at the session close
+            bar.update(event.price, volume)
+            return None
+        start, end = bounds
+        self._open[event.symbol] = Bar(event.symbol, start, end, event.price, event.price, event.price, event.price, volume, 1)
+        return bar
+
+    def flush(self) -> list[Bar]:
+        """Close and return every open bar."""
+        bars = list(self._open.values())
+        self._open.clear()
+        return bars
+
+
+def iter_bars(
+    events: Iterable[MarketDataEvent],
+    timeframe: Timeframe,
+    session: TradingSession = NSE_SESSION,
+) -> Iterator[Bar]:
+    """Completed bars of a time-ordered tick stream, ending with the partial last bar."""
+    aggregator = BarAggregator(timeframe, session)
+    for event in events:
+        bar = aggregator.update(event)
+        if bar is not None:
+            yield bar
+    yield from aggregator.flush()
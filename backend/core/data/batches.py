@@ -0,0 +1,259 @@
+"""Array-backed batches of market data events for the backtest loop.
+
+A :class:`MarketDataBatch` holds a run of time-ordered ticks as one NumPy
+structured array (int64 epoch-ns timestamps, int32 symbol ids, float64
+prices and volumes), so replaying history touches a handful of arrays per
+batch instead of building a ``MarketDataEvent`` and a ``datetime`` per tick.
+Code that still wants event objects can iterate ``events()``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from itertools import islice
+from typing import Iterable, Iterator, Protocol, Sequence, runtime_checkable
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import polars as pl
+
+from . import MarketDataEvent, MarketDataProvider
+from .frames import ColumnarMarketDataProvider
+
+EVENT_DTYPE = np.dtype(
+    [("timestamp_ns", np.int64), ("symbol_id", np.int32), ("price", np.float64), ("volume", np.float64)]
+)
+DEFAULT_BATCH_SIZE = 65_536
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_AWARE_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def datetime_to_ns(timestamp: datetime) -> int:
+    """Epoch nanoseconds for a datetime; naive values are taken as UTC wall time."""
+    delta = timestamp - (_NAIVE_EPOCH if timestamp.tzinfo is None else _AWARE_EPOCH)
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+
+
+def ns_to_datetime(timestamp_ns: int, tz: tzinfo | None = None) -> datetime:
+    """Inverse of ``datetime_to_ns`` at microsecond precision, in ``tz`` when given."""
+    delta = timedelta(microseconds=timestamp_ns // 1_000)
+    if tz is None:
+        return _NAIVE_EPOCH + delta
+    return (_AWARE_EPOCH + delta).astimezone(tz)
+
+
+@dataclass(frozen=True, slots=True)
+class MarketDataBatch:
+    """Time-ordered ticks of one or more symbols as a structured array.
+
+    ``symbols`` maps ids to names and is shared by every batch of a replay.
+    ``tz`` is the zone timestamps are handed back in; None for naive data.
+    """
+
+    records: np.ndarray
+    symbols: Sequence[str]
+    tz: tzinfo | None = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def timestamps_ns(self) -> np.ndarray:
+        return self.records["timestamp_ns"]
+
+    @property
+    def symbol_ids(self) -> np.ndarray:
+        return self.records["symbol_id"]
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self.records["price"]
+
+    @property
+    def volumes(self) -> np.ndarray:
+        return self.records["volume"]
+
+    def timestamp_at(self, row: int) -> datetime:
+        return ns_to_datetime(int(self.records["timestamp_ns"][row]), self.tz)
+
+    def event(self, row: int) -> MarketDataEvent:
+        record = self.records[row]
+        return MarketDataEvent(
+            symbol=self.symbols[record["symbol_id"]],
+            timestamp=ns_to_datetime(int(record["timestamp_ns"]), self.tz),
+            price=float(record["price"]),
+        )
+
+    def events(self) -> Iterator[MarketDataEvent]:
+        """Per-event view of the batch for code that consumes ``MarketDataEvent`` objects."""
+        symbols, tz = self.symbols, self.tz
+        for timestamp_ns, symbol_id, price, _ in self.records.tolist():
+            yield MarketDataEvent(symbol=symbols[symbol_id], timestamp=ns_to_datetime(timestamp_ns, tz), price=price)
+
+    def slice(self, start: int, stop: int | None = None) -> "MarketDataBatch":
+        """Rows ``start:stop`` as a batch viewing the same buffer."""
+        return MarketDataBatch(self.records[start:stop], self.symbols, self.tz)
+
+    @classmethod
+    def from_frame(
+        cls, frame: pl.DataFrame, symbol_id: int = 0, symbols: Sequence[str] = ()
+    ) -> "MarketDataBatch":
+        """Batch of a ``timestamp``/``price`` (optionally ``volume``) frame of one symbol."""
+        records = np.empty(frame.height, dtype=EVENT_DTYPE)
+        records["timestamp_ns"] = frame["timestamp"].dt.epoch("ns").to_numpy()
+        records["symbol_id"] = symbol_id
+        records["price"] = frame["price"].cast(pl.Float64).to_numpy()
+        records["volume"] = frame["volume"].cast(pl.Float64).to_numpy() if "volume" in frame.columns else 0.0
+        time_zone = frame.schema["timestamp"].time_zone
+        return cls(records, symbols, ZoneInfo(time_zone) if time_zone else None)
+
+    @classmethod
+    def from_events(
+        cls, events: Sequence[MarketDataEvent], symbols: Sequence[str], symbol_id: int | None = None
+    ) -> "MarketDataBatch":
+        """Batch of event objects; ids are looked up in ``symbols`` unless ``symbol_id`` is given."""
+        ids = {symbol: index for index, symbol in reversed(list(enumerate(symbols)))}
+        records = np.empty(len(events), dtype=EVENT_DTYPE)
+        records["timestamp_ns"] = [datetime_to_ns(event.timestamp) for event in events]
+        records["symbol_id"] = symbol_id if symbol_id is not None else [ids[event.symbol] for event in events]
+        records["price"] = [event.price for event in events]
+        records["volume"] = [getattr(event, "volume", 0.0) for event in events]
+        return cls(records, symbols, events[0].timestamp.tzinfo if len(events) else None)
+
+
+@runtime_checkable
+class BatchedMarketDataProvider(Protocol):
+    """Provider that generates or reads a symbol's history directly as batches.
+
+    Like ``history_batches``, it must not end a batch in the middle of a run
+    of equal timestamps.
+    """
+
+    def history_batches(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        symbol_id: int = 0,
+        symbols: Sequence[str] | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[MarketDataBatch]: ...
+
+
+def iter_events(batches: Iterable[MarketDataBatch]) -> Iterator[MarketDataEvent]:
+    """Flatten batches back into a stream of ``MarketDataEvent`` objects."""
+    for batch in batches:
+        yield from batch.events()
+
+
+def history_batches(
+    provider: MarketDataProvider,
+    symbol: str,
+    start: datetime,
+    end: datetime,
+    symbol_id: int = 0,
+    symbols: Sequence[str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[MarketDataBatch]:
+    """A symbol's history as batches of about ``batch_size`` rows.
+
+    Batched providers are asked for batches directly, columnar providers are
+    sliced without building events, and others are read lazily in chunks. A batch never ends in the middle of a run of equal
+    timestamps, which ``merge_batches`` relies on to keep ties in order.
+    """
+    symbols = symbols if symbols is not None else (symbol,)
+    if isinstance(provider, BatchedMarketDataProvider):
+        yield from provider.history_batches(symbol, start, end, symbol_id, symbols, batch_size)
+        return
+    if isinstance(provider, ColumnarMarketDataProvider):
+        batch = MarketDataBatch.from_frame(provider.history_frame(symbol, start, end), symbol_id, symbols)
+        timestamps = batch.timestamps_ns
+        lo = 0
+        while lo < len(batch):
+            hi = min(lo + batch_size, len(batch))
+            hi = int(np.searchsorted(timestamps, timestamps[hi - 1], side="right"))
+            yield batch.slice(lo, hi)
+            lo = hi
+        return
+
+    events = iter(provider.historical(symbol, start, end))
+    pending: list[MarketDataEvent] = []
+    while True:
+        chunk = list(islice(events, batch_size))
+        if not chunk:
+            break
+        chunk = pending + chunk
+        # Hold back the trailing run of equal timestamps until the next chunk shows where it ends.
+        cut = len(chunk)
+        while cut > 0 and chunk[cut - 1].timestamp == chunk[-1].timestamp:
+            cut -= 1
+        if cut == 0:
+            pending = chunk
+            continue
+        pending = chunk[cut:]
+        yield MarketDataBatch.from_events(chunk[:cut], symbols, symbol_id)
+    if pending:
+        yield MarketDataBatch.from_events(pending, symbols, symbol_id)
+
+
+def merge_batches(streams: Iterable[Iterable[MarketDataBatch]]) -> Iterator[MarketDataBatch]:
+    """K-way merge per-symbol batch streams into globally time-ordered batches.
+
+    Each round emits every buffered row up to the earliest last timestamp
+    among the streams' current batches, sorted stably so that equal
+    timestamps keep the order of their streams, then their order within a
+    stream, as ``merge_event_streams`` does. Only one batch per stream is
+    buffered at a time.
+    """
+    iterators = [iter(stream) for stream in streams]
+    heads: list[tuple[int, MarketDataBatch]] = []
+    for rank, iterator in enumerate(iterators):
+        head = _next_nonempty(iterator)
+        if head is not None:
+            heads.append((rank, head))
+
+    while heads:
+        horizon = min(int(head.timestamps_ns[-1]) for _, head in heads)
+        parts: list[np.ndarray] = []
+        remaining: list[tuple[int, MarketDataBatch]] = []
+        for rank, head in heads:
+            cut = int(np.searchsorted(head.timestamps_ns, horizon, side="right"))
+            if cut:
+                parts.append(head.records[:cut])
+            if cut < len(head):
+                remaining.append((rank, head.slice(cut)))
+            else:
+                following = _next_nonempty(iterators[rank])
+                if following is not None:
+                    remaining.append((rank, following))
+        first = heads[0][1]
+        heads = remaining
+        if len(parts) == 1:
+            yield MarketDataBatch(parts[0], first.symbols, first.tz)
+            continue
+        records = np.concatenate(parts)
+        yield MarketDataBatch(records[np.argsort(records["timestamp_ns"], kind="stable")], first.symbols, first.tz)
+
+
+def replay_batches(
+    provider: MarketDataProvider,
+    symbols: Sequence[str],
+    start: datetime,
+    end: datetime,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[MarketDataBatch]:
+    """The history of several symbols as globally time-ordered batches; ids index ``symbols``."""
+    symbols = tuple(symbols)
+    return merge_batches(
+        history_batches(provider, symbol, start, end, symbol_id, symbols, batch_size)
+        for symbol_id, symbol in enumerate(symbols)
+    )
+
+
+def _next_nonempty(iterator: Iterator[MarketDataBatch]) -> MarketDataBatch | None:
+    for batch in iterator:
+        if len(batch):
+            return batch
+    return None
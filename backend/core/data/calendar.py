@@ -0,0 +1,44 @@
+"""Exchange trading sessions, used to avoid asking for history while the market was closed."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+
+@dataclass(frozen=True, slots=True)
+class TradingCalendar:
+    """Daily sessions from ``open`` to ``close`` on weekdays that are not holidays.
+
+    Times are exchange-local; session bounds take the time zone of the
+    datetimes they are compared with. The defaults are NSE's cash session.
+    """
+
+    open: time = time(9, 15)
+    close: time = time(15, 30)
+    holidays: frozenset[date] = frozenset()
+    weekend: frozenset[int] = frozenset({5, 6})  # date.weekday() numbers
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() not in self.weekend and day not in self.holidays
+
+    def sessions(self, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+        """Trading sessions overlapping ``[start, end]``, clipped to it."""
+        sessions: list[tuple[datetime, datetime]] = []
+        day = start.date()
+        while day <= end.date():
+            if self.is_trading_day(day):
+                session_open = datetime.combine(day, self.open, start.tzinfo)
+                session_close = datetime.combine(day, self.close, start.tzinfo)
+                lo, hi = max(start, session_open), min(end, session_close)
+                if lo <= hi:
+                    sessions.append((lo, hi))
+            day += timedelta(days=1)
+        return sessions
+
+    def trading_ranges(self, ranges: list[tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+        """The parts of ``ranges`` during which the market was open."""
+        return [session for lo, hi in ranges for session in self.sessions(lo, hi)]
+
+
+NSE_CALENDAR = TradingCalendar()
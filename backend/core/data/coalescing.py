@@ -0,0 +1,129 @@
+"""Single-flight coalescing of concurrent history loads."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterator
+
+import polars as pl
+
+from . import MarketDataEvent, MarketDataProvider
+from .fingerprint import VersionedMarketDataProvider
+from .frames import ColumnarMarketDataProvider, frame_from_events, slice_window
+
+
+@dataclass(slots=True)
+class _Load:
+    start: datetime
+    end: datetime
+    done: threading.Event = field(default_factory=threading.Event)
+    frame: pl.DataFrame | None = None
+    error: BaseException | None = None
+
+
+class CoalescingMarketData:
+    """Let concurrent callers share in-flight loads of a symbol's history.
+
+    A request whose window overlaps windows already being loaded for the
+    same symbol waits for those loads and takes zero-copy slices of their
+    frames, loading only the parts of its window nobody else is loading yet
+    and stitching the pieces together, so each row is fetched and parsed
+    once. The parts it loads itself are in flight too, for later requests
+    to join in turn. Nothing is kept once a load finishes; ``loads`` counts
+    the loads started and ``deduplicated`` the requests served at least in
+    part from another caller's load.
+
+    Coalescing is in-process only. Separate worker processes each load on
+    their own; when the upstream is a ``ParquetMarketData`` store, its
+    per-symbol file lock already makes them fetch a missing range once and
+    read it back from disk.
+    """
+
+    def __init__(self, upstream: MarketDataProvider) -> None:
+        self.upstream = upstream
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, list[_Load]] = {}
+        self.loads = 0
+        self.deduplicated = 0
+        if isinstance(upstream, VersionedMarketDataProvider):
+            # Only then is this provider versioned too; otherwise callers fingerprint the loaded columns.
+            self.data_version = upstream.data_version
+
+    def historical(self, symbol: str, start: datetime, end: datetime) -> Iterator[MarketDataEvent]:
+        window = self.history_frame(symbol, start, end)
+        for timestamp, price in window.select("timestamp", "price").iter_rows():
+            yield MarketDataEvent(symbol=symbol, timestamp=timestamp, price=price)
+
+    def history_frame(self, symbol: str, start: datetime, end: datetime) -> pl.DataFrame:
+        with self._lock:
+            pieces = self._plan(self._in_flight.get(symbol, []), start, end)
+            owned = [load for _, _, load, own in pieces if own]
+            self._in_flight.setdefault(symbol, []).extend(owned)
+            self.loads += len(owned)
+            if len(owned) < len(pieces):
+                self.deduplicated += 1
+
+        # Load our own pieces before waiting: every load we wait on was started before ours.
+        try:
+            for load in owned:
+                load.frame = self._load(symbol, load.start, load.end)
+        except BaseException as exc:
+            for load in owned:
+                if load.frame is None:
+                    load.error = exc
+            raise
+        finally:
+            with self._lock:
+                loads = self._in_flight[symbol]
+                for load in owned:
+                    loads.remove(load)
+                if not loads:
+                    del self._in_flight[symbol]
+            for load in owned:
+                load.done.set()
+
+        if len(pieces) == 1 and pieces[0][3]:
+            return pieces[0][2].frame
+        parts = []
+        for position, (lo, hi, load, _) in enumerate(pieces):
+            load.done.wait()
+            if load.error is not None:
+                raise load.error
+            if not position:
+                parts.append(slice_window(load.frame, lo, hi))
+                continue
+            # Rows at ``lo`` already came with the previous piece.
+            timestamps = load.frame["timestamp"]
+            first = timestamps.search_sorted(lo, side="right")
+            parts.append(load.frame.slice(first, max(timestamps.search_sorted(hi, side="right") - first, 0)))
+        return parts[0] if len(parts) == 1 else pl.concat(parts, rechunk=False)
+
+    @staticmethod
+    def _plan(loads: list[_Load], start: datetime, end: datetime) -> list[tuple[datetime, datetime, _Load, bool]]:
+        """Cover ``[start, end]`` with consecutive ``(lo, hi, load, own)`` pieces.
+
+        Each step joins the in-flight load reaching furthest from the
+        current point, or else starts a new load up to the next in-flight
+        window; consecutive pieces share their boundary.
+        """
+        pieces = []
+        cursor = start
+        while True:
+            covering = [load for load in loads if load.start <= cursor and (load.end > cursor or load.end >= end)]
+            if covering:
+                load = max(covering, key=lambda item: item.end)
+                hi, own = min(load.end, end), False
+            else:
+                hi = min((load.start for load in loads if cursor < load.start <= end), default=end)
+                load, own = _Load(cursor, hi), True
+            pieces.append((cursor, hi, load, own))
+            if hi >= end:
+                return pieces
+            cursor = hi
+
+    def _load(self, symbol: str, start: datetime, end: datetime) -> pl.DataFrame:
+        if isinstance(self.upstream, ColumnarMarketDataProvider):
+            return self.upstream.history_frame(symbol, start, end)
+        return frame_from_events(self.upstream.historical(symbol, start, end))
@@ -0,0 +1,131 @@
+"""Arrow IPC conversions of per-symbol CSV files, read back through memory maps."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import polars as pl
+from loguru import logger
+
+from . import MarketDataEvent, MarketDataProvider
+from .frames import HISTORY_SCHEMA, frame_from_events, slice_window
+
+
+@dataclass(frozen=True, slots=True)
+class Conversion:
+    symbol: str
+    path: Path  # the Arrow IPC file
+    converted: bool  # False when an up-to-date conversion already existed
+
+
+class CSVConversionCache:
+    """Serve ``data_dir/<symbol>.csv`` files from columnar copies made on first read.
+
+    Each CSV, with ``timestamp`` and ``price`` columns and optionally
+    ``volume``, is parsed once by Polars, sorted by time and written to
+    ``cache_dir/<symbol>/`` as an Arrow IPC file named after a digest of
+    the CSV's path, size and modification time. Later reads memory-map that
+    file, so processes reading the same symbol share one copy of the pages,
+    and a window is a zero-copy slice. Editing or replacing a CSV changes its key
+    and the next read converts it again. CSVs Polars cannot read in that
+    layout are served by ``fallback`` (the plain CSV provider) when given.
+    """
+
+    def __init__(self, data_dir: Path, cache_dir: Path, fallback: MarketDataProvider | None = None) -> None:
+        self.data_dir = Path(data_dir)
+        self.cache_dir = Path(cache_dir)
+        self.fallback = fallback
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._symbol_locks: dict[str, threading.Lock] = {}
+
+    def historical(self, symbol: str, start: datetime, end: datetime) -> Iterator[MarketDataEvent]:
+        window = self.history_frame(symbol, start, end)
+        for timestamp, price in window.select("timestamp", "price").iter_rows():
+            yield MarketDataEvent(symbol=symbol, timestamp=timestamp, price=price)
+
+    def history_frame(self, symbol: str, start: datetime, end: datetime) -> pl.DataFrame:
+        try:
+            path = self.convert(symbol).path
+        except FileNotFoundError:
+            return pl.DataFrame(schema=HISTORY_SCHEMA)
+        except (pl.exceptions.PolarsError, OSError, ValueError) as exc:
+            if self.fallback is None:
+                raise
+            logger.warning("Reading {} through the CSV provider; conversion failed: {}", symbol, exc)
+            return frame_from_events(self.fallback.historical(symbol, start, end))
+        return slice_window(pl.read_ipc(path, memory_map=True), start, end)
+
+    def data_version(self, symbol: str, start: datetime, end: datetime) -> str:
+        """The conversion key: changes whenever the CSV file is modified."""
+        try:
+            return self._key(self._csv_path(symbol))
+        except FileNotFoundError:
+            return "missing"
+
+    def convert(self, symbol: str) -> Conversion:
+        """Convert ``symbol``'s CSV unless an up-to-date conversion exists; raises if there is no CSV."""
+        source = self._csv_path(symbol)
+        target = self.cache_dir / symbol / f"{self._key(source)}.arrow"
+        if target.exists():
+            return Conversion(symbol, target, False)
+        with self._lock:
+            symbol_lock = self._symbol_locks.setdefault(symbol, threading.Lock())
+        with symbol_lock:
+            if target.exists():
+                return Conversion(symbol, target, False)
+            frame = read_history_csv(source)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            scratch = target.parent / f".tmp-{uuid.uuid4().hex}.arrow"
+            try:
+                frame.write_ipc(scratch, compression="uncompressed")  # compressed files cannot be memory-mapped
+                os.replace(scratch, target)
+            finally:
+                scratch.unlink(missing_ok=True)
+            for stale in target.parent.glob("*.arrow"):
+                if stale != target:
+                    stale.unlink(missing_ok=True)
+        return Conversion(symbol, target, True)
+
+    def convert_all(self, workers: int = 4) -> dict[str, Conversion | Exception]:
+        """Convert every CSV in ``data_dir`` in parallel; a file's failure is returned in its place, not raised."""
+        symbols = sorted(path.stem for path in self.data_dir.glob("*.csv"))
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            futures = {symbol: pool.submit(self.convert, symbol) for symbol in symbols}
+        return {symbol: future.exception() or future.result() for symbol, future in futures.items()}
+
+    def _csv_path(self, symbol: str) -> Path:
+        path = self.data_dir / f"{symbol}.csv"
+        if not path.is_file():
+            raise FileNotFoundError(path)
+        return path
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        stat = path.stat()
+        payload = f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+        return hashlib.blake2b(payload.encode(), digest_size=12).hexdigest()
+
+
+def read_history_csv(path: Path) -> pl.DataFrame:
+    """Parse a ``timestamp``/``price`` (optionally ``volume``) CSV into a time-sorted history frame."""
+    frame = pl.read_csv(path, try_parse_dates=True)
+    missing = {"timestamp", "price"} - set(frame.columns)
+    if missing:
+        raise ValueError(f"{path} lacks column(s) {', '.join(sorted(missing))}")
+    timestamp = pl.col("timestamp")
+    if frame.schema["timestamp"] == pl.String:
+        timestamp = timestamp.str.to_datetime(time_unit="us")
+    columns = [timestamp.dt.cast_time_unit("us"), pl.col("price").cast(pl.Float64)]
+    if "volume" in frame.columns:
+        columns.append(pl.col("volume").cast(pl.Float64))
+    return frame.select(columns).sort("timestamp", maintain_order=True)
+
@@ -0,0 +1,78 @@
+"""Shared pieces of the on-disk LRU caches that several processes use at once.
+
+Entries are files or directories under a cache root, written under a
+``.tmp-`` scratch name and renamed into place by their caches. Recency is
+each entry's mtime, refreshed on use, and eviction runs under an exclusive
+lock on the root, so the directory itself is the index every process shares.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+def touch(path: Path) -> None:
+    """Mark ``path`` as just used."""
+    # Filesystem clocks can be milliseconds coarse, too coarse to order back-to-back uses.
+    now = time.time_ns()
+    try:
+        os.utime(path, ns=(now, now))
+    except FileNotFoundError:  # evicted by another process meanwhile
+        pass
+
+
+@contextmanager
+def cache_lock(root: Path) -> Iterator[None]:
+    """Hold the cross-process lock of the cache under ``root``."""
+    if fcntl is None:
+        yield
+        return
+    with (root / ".lock").open("a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def file_size(path: Path) -> int:
+    return path.stat().st_size
+
+
+def scan(root: Path, pattern: str, size: Callable[[Path], int] = file_size) -> list[tuple[Path, int]]:
+    """Entries under ``root`` matching ``pattern`` with their sizes, least recently used first."""
+    entries = []
+    for path in root.glob(pattern):
+        if path.name.startswith(".tmp-"):
+            continue
+        try:
+            entries.append((path.stat().st_mtime_ns, path, size(path)))
+        except FileNotFoundError:  # removed by another process mid-scan
+            continue
+    return [(path, entry_size) for _, path, entry_size in sorted(entries)]
+
+
+def evict(entries: list[tuple[Path, int]], max_bytes: int, remove: Callable[[Path], None]) -> int:
+    """Remove the oldest of the scanned ``entries`` until the rest fit in ``max_bytes``.
+
+    The newest entry is always kept. Callers hold ``cache_lock``; returns the
+    number of entries removed.
+    """
+    size = sum(entry_size for _, entry_size in entries)
+    removed = 0
+    for path, entry_size in entries[:-1]:
+        if size <= max_bytes:
+            break
+        remove(path)
+        size -= entry_size
+        removed += 1
+    return removed
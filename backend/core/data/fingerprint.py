@@ -0,0 +1,44 @@
+"""Version fingerprints for market data used to key derived results."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from typing import Protocol, runtime_checkable
+
+import numpy as np
+
+
+@runtime_checkable
+class VersionedMarketDataProvider(Protocol):
+    """Provider that can cheaply report a version token for a slice of history.
+
+    The token must change whenever the data served for that slice changes, for
+    example a dataset revision, file size and mtime, or last ingested bar.
+    """
+
+    def data_version(self, symbol: str, start: datetime, end: datetime) -> str: ...
+
+
+def columns_fingerprint(*columns: np.ndarray) -> str:
+    """Stable digest of raw column buffers."""
+    digest = hashlib.blake2b(digest_size=16)
+    for column in columns:
+        data = np.ascontiguousarray(column)
+        digest.update(str(data.dtype).encode())
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data.tobytes())
+    return digest.hexdigest()
+
+
+def history_version(
+    provider: object,
+    symbol: str,
+    start: datetime,
+    end: datetime,
+    *columns: np.ndarray,
+) -> str:
+    """Version token for a loaded history: the provider's own when it reports one, else a column digest."""
+    if isinstance(provider, VersionedMarketDataProvider):
+        return provider.data_version(symbol, start, end)
+    return columns_fingerprint(*columns)
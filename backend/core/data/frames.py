@@ -0,0 +1,69 @@
+"""Market data served from in-memory or memory-mapped Polars frames."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Protocol, runtime_checkable
+
+import polars as pl
+
+from . import MarketDataEvent
+
+HISTORY_SCHEMA = {"timestamp": pl.Datetime("us"), "price": pl.Float64}
+
+
+@runtime_checkable
+class ColumnarMarketDataProvider(Protocol):
+    """Provider that can hand out a symbol's history as a frame without building events."""
+
+    def history_frame(self, symbol: str, start: datetime, end: datetime) -> pl.DataFrame: ...
+
+
+def frame_from_events(events: Iterable[MarketDataEvent]) -> pl.DataFrame:
+    """``timestamp``/``price`` frame of an event stream."""
+    timestamps: list[datetime] = []
+    prices: list[float] = []
+    for event in events:
+        timestamps.append(event.timestamp)
+        prices.append(event.price)
+    if not timestamps:
+        return pl.DataFrame(schema=HISTORY_SCHEMA)
+    return pl.DataFrame({"timestamp": timestamps, "price": prices}).with_columns(pl.col("price").cast(pl.Float64))
+
+
+def slice_window(frame: pl.DataFrame, start: datetime, end: datetime) -> pl.DataFrame:
+    """Rows of a time-sorted frame within ``[start, end]``, as a zero-copy slice."""
+    if frame.is_empty():
+        return frame
+    timestamps = frame["timestamp"]
+    lo = timestamps.search_sorted(start, side="left")
+    hi = timestamps.search_sorted(end, side="right")
+    return frame.slice(lo, max(hi - lo, 0))
+
+
+class FrameMarketData:
+    """Serve history from time-sorted frames with ``timestamp`` and ``price`` columns."""
+
+    def __init__(self, frames: Mapping[str, pl.DataFrame]) -> None:
+        self._frames = dict(frames)
+
+    @classmethod
+    def from_ipc(cls, paths: Mapping[str, str | Path]) -> "FrameMarketData":
+        """Memory-map Arrow IPC files so several processes share one copy of the data."""
+        return cls({symbol: pl.read_ipc(path, memory_map=True) for symbol, path in paths.items()})
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._frames)
+
+    def history_frame(self, symbol: str, start: datetime, end: datetime) -> pl.DataFrame:
+        frame = self._frames.get(symbol)
+        if frame is None or frame.is_empty():
+            return pl.DataFrame(schema=HISTORY_SCHEMA)
+        return slice_window(frame, start, end)
+
+    def historical(self, symbol: str, start: datetime, end: datetime) -> Iterator[MarketDataEvent]:
+        window = self.history_frame(symbol, start, end)
+        for timestamp, price in window.select("timestamp", "price").iter_rows():
+            yield MarketDataEvent(symbol=symbol, timestamp=timestamp, price=price)
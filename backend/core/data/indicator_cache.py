@@ -0,0 +1,119 @@
+"""On-disk cache of computed indicator columns shared across backtests and processes."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+import numpy as np
+from loguru import logger
+
+from .disk_cache import cache_lock, evict, scan, touch
+
+
+class IndicatorCache:
+    """Store indicator columns as ``.npy`` files and hand them back memory-mapped.
+
+    Entries are keyed by (symbol, timeframe, indicator, params, data version),
+    written under a scratch name and renamed into place so concurrent
+    processes never read partial files. The files themselves are the index:
+    a column stored by one process is a hit in every other, and writers
+    evict the least recently used files (by mtime, refreshed on each read)
+    under a file lock once the directory exceeds ``max_bytes``. Returned
+    arrays are read-only views of the page cache, so parallel sweeps share
+    one copy of each column.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        with cache_lock(self.root):
+            self._evict()
+
+    @staticmethod
+    def key(symbol: str, timeframe: str, indicator: str, params: Mapping[str, Any], data_version: str) -> str:
+        payload = json.dumps([symbol, timeframe, indicator, dict(params), data_version], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(size for _, size in self._scan())
+
+    def __len__(self) -> int:
+        return len(self._scan())
+
+    def get(self, key: str) -> np.ndarray | None:
+        path = self._entry_path(key)
+        try:
+            values = np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Dropping unreadable indicator cache entry {}: {}", key, exc)
+            with self._lock:
+                self.misses += 1
+            path.unlink(missing_ok=True)
+            return None
+        touch(path)
+        with self._lock:
+            self.hits += 1
+        return values
+
+    def put(self, key: str, values: np.ndarray) -> np.ndarray:
+        """Store ``values`` and return the memory-mapped copy."""
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        scratch = path.parent / f".tmp-{uuid.uuid4().hex}.npy"
+        try:
+            np.save(scratch, np.ascontiguousarray(values))
+            os.replace(scratch, path)
+            # Map before evicting: the mapping outlives an unlink by a tighter-budgeted process.
+            stored = np.load(path, mmap_mode="r")
+        except OSError as exc:
+            scratch.unlink(missing_ok=True)
+            logger.warning("Failed to cache indicator column {}: {}", key, exc)
+            return np.asarray(values)
+        touch(path)
+        with cache_lock(self.root):
+            self._evict()
+        return stored
+
+    def get_or_compute(
+        self,
+        symbol: str,
+        timeframe: str,
+        indicator: str,
+        params: Mapping[str, Any],
+        data_version: str,
+        compute: Callable[[], np.ndarray],
+    ) -> np.ndarray:
+        key = self.key(symbol, timeframe, indicator, params, data_version)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        return self.put(key, compute())
+
+    def _evict(self) -> None:
+        """Remove the least recently used files until the cache fits; callers hold ``cache_lock``."""
+        # Readers that already mapped a file keep their mapping after the unlink.
+        removed = evict(self._scan(), self.max_bytes, lambda path: path.unlink(missing_ok=True))
+        with self._lock:
+            self.evictions += removed
+
+    def _scan(self) -> list[tuple[Path, int]]:
+        return scan(self.root, "??/*.npy")
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.npy"
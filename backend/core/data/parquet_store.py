@@ -0,0 +1,266 @@
+"""Parquet-backed cache of provider history, partitioned by symbol, interval and date."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+import polars as pl
+from loguru import logger
+
+from . import MarketDataEvent, MarketDataProvider
+from .calendar import TradingCalendar
+from .frames import HISTORY_SCHEMA, ColumnarMarketDataProvider, frame_from_events
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# Row groups small enough for the window filter to skip most of a partial day.
+_ROW_GROUP_SIZE = 16_384
+
+
+class ParquetMarketData:
+    """Serve ``upstream``'s history from a local Parquet dataset, fetching only what is missing.
+
+    Rows live under ``root/symbol=<symbol>/interval=<interval>/date=<day>/data.parquet``
+    and a per-(symbol, interval) coverage file records which time ranges
+    have already been fetched, so days without trading are not requested
+    again. A read only touches the partitions of the requested days: days
+    strictly inside the window are read whole through a memory map, and the
+    boundary days are scanned with the window as a pushed-down predicate so
+    row groups outside it are skipped. Files are written under scratch
+    names and renamed into place. Ranges are never fetched past the time of
+    the fetch, so today's session is topped up on the next read. With a
+    ``calendar``, only the trading sessions inside a missing range are
+    requested, though the whole range is recorded as covered.
+    """
+
+    def __init__(
+        self,
+        upstream: MarketDataProvider,
+        root: Path,
+        interval: str = "tick",
+        calendar: TradingCalendar | None = None,
+    ) -> None:
+        self.upstream = upstream
+        self.root = Path(root)
+        self.interval = interval
+        self.calendar = calendar
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()  # guards the lock table and counters only
+        self._symbol_locks: dict[str, threading.Lock] = {}
+        self.upstream_fetches = 0
+
+    def historical(self, symbol: str, start: datetime, end: datetime) -> Iterator[MarketDataEvent]:
+        window = self.history_frame(symbol, start, end)
+        for timestamp, price in window.select("timestamp", "price").iter_rows():
+            yield MarketDataEvent(symbol=symbol, timestamp=timestamp, price=price)
+
+    def history_frame(self, symbol: str, start: datetime, end: datetime) -> pl.DataFrame:
+        self.ensure(symbol, start, end)
+        frames: list[pl.DataFrame] = []
+        window = pl.col("timestamp").is_between(start, end)
+        for day, path in self._partitions(symbol, start, end):
+            # A day's rows may sit one calendar day off in another time zone.
+            if start.date() < day - timedelta(days=1) and day + timedelta(days=1) < end.date():
+                frames.append(pl.read_parquet(path, memory_map=True))
+            else:
+                frames.append(pl.scan_parquet(path).filter(window).collect())
+        if not frames:
+            return pl.DataFrame(schema=HISTORY_SCHEMA)
+        return pl.concat(frames, rechunk=False)
+
+    def data_version(self, symbol: str, start: datetime, end: datetime) -> str:
+        """Digest of the names, sizes and modification times of the partitions covering the window."""
+        self.ensure(symbol, start, end)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{symbol}/{self.interval}".encode())
+        for _, path in self._partitions(symbol, start, end):
+            stat = path.stat()
+            digest.update(f"{path.parent.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()
+
+    def ensure(self, symbol: str, start: datetime, end: datetime) -> None:
+        """Fetch and store the parts of ``[start, end]`` not yet covered.
+
+        Fetches of one symbol are serialized across threads and, through a
+        lock file, across processes, so concurrent jobs asking for the same
+        missing range fetch it once and the others read it from disk.
+        Different symbols are fetched in parallel.
+        """
+        with self._symbol_lock(symbol):
+            gaps = self.missing(symbol, start, end)
+            if gaps:
+                frames = [self._fetch(symbol, lo, hi) for lo, hi in self.trading_ranges(gaps)]
+                self._append(symbol, frames, gaps)
+
+    def missing(self, symbol: str, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+        """Parts of ``[start, end]`` not covered yet, cut off at the current time."""
+        now = datetime.now(end.tzinfo)
+        gaps = missing_ranges(self._load_coverage(symbol), start, end)
+        return [(lo, min(hi, now)) for lo, hi in gaps if lo <= now]
+
+    def trading_ranges(self, ranges: list[tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+        """The parts of ``ranges`` worth requesting from the upstream provider."""
+        return self.calendar.trading_ranges(ranges) if self.calendar is not None else list(ranges)
+
+    def append(self, symbol: str, frame: pl.DataFrame, covered: list[tuple[datetime, datetime]]) -> None:
+        """Store rows fetched elsewhere and record ``covered`` as fetched.
+
+        The coverage file is only replaced once every partition has been
+        written, so an interrupted append is fetched again rather than
+        leaving a hole that is marked as covered.
+        """
+        with self._symbol_lock(symbol):
+            self._append(symbol, [frame], covered)
+
+    def invalidate(self, symbol: str) -> None:
+        """Forget everything stored for ``symbol`` at this interval."""
+        with self._symbol_lock(symbol):
+            shutil.rmtree(self._symbol_dir(symbol), ignore_errors=True)
+
+    def _fetch(self, symbol: str, start: datetime, end: datetime) -> pl.DataFrame:
+        with self._lock:
+            self.upstream_fetches += 1
+        if isinstance(self.upstream, ColumnarMarketDataProvider):
+            return self.upstream.history_frame(symbol, start, end)
+        return frame_from_events(self.upstream.historical(symbol, start, end))
+
+    def _append(self, symbol: str, frames: list[pl.DataFrame], covered: list[tuple[datetime, datetime]]) -> None:
+        for frame in frames:
+            self._store(
+                symbol,
+                frame.select(
+                    pl.col("timestamp").dt.cast_time_unit("us"),
+                    pl.col("price").cast(pl.Float64),
+                ),
+            )
+        self._save_coverage(symbol, merge_ranges([*self._load_coverage(symbol), *covered]))
+
+    def _store(self, symbol: str, frame: pl.DataFrame) -> None:
+        """Merge ``frame`` into the day partitions it touches."""
+        if frame.is_empty():
+            return
+        for (day,), rows in frame.group_by(pl.col("timestamp").dt.date(), maintain_order=True):
+            path = self._partition_path(symbol, day)
+            if path.exists():
+                rows = pl.concat([pl.read_parquet(path), rows], how="vertical_relaxed")
+            rows = rows.unique("timestamp", keep="last").sort("timestamp")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            scratch = path.parent / f".tmp-{uuid.uuid4().hex}.parquet"
+            try:
+                rows.write_parquet(scratch, row_group_size=_ROW_GROUP_SIZE, statistics=True)
+                os.replace(scratch, path)
+            finally:
+                scratch.unlink(missing_ok=True)
+
+    def _partitions(self, symbol: str, start: datetime, end: datetime) -> list[tuple[date, Path]]:
+        """Stored day partitions of the window's days, in date order.
+
+        Aware windows take a day either side too, as their rows may sit one
+        calendar day off in another time zone; naive rows are partitioned by
+        their own date, so data versions of naive windows ignore neighbouring days.
+        """
+        pad = timedelta(days=1) if start.tzinfo is not None else timedelta(0)
+        first, last = start.date() - pad, end.date() + pad
+        partitions = []
+        for directory in self._symbol_dir(symbol).glob("date=*"):
+            day = date.fromisoformat(directory.name.removeprefix("date="))
+            path = directory / "data.parquet"
+            if first <= day <= last and path.exists():
+                partitions.append((day, path))
+        return sorted(partitions)
+
+    @contextmanager
+    def _symbol_lock(self, symbol: str) -> Iterator[None]:
+        """Hold ``symbol``'s lock in this process and, through its lock file, across processes."""
+        with self._lock:
+            thread_lock = self._symbol_locks.setdefault(symbol, threading.Lock())
+        with thread_lock:
+            if fcntl is None:
+                yield
+                return
+            directory = self._symbol_dir(symbol)
+            directory.mkdir(parents=True, exist_ok=True)
+            with (directory / ".lock").open("a") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _symbol_dir(self, symbol: str) -> Path:
+        return self.root / f"symbol={symbol}" / f"interval={self.interval}"
+
+    def _partition_path(self, symbol: str, day: date) -> Path:
+        return self._symbol_dir(symbol) / f"date={day.isoformat()}" / "data.parquet"
+
+    def _coverage_path(self, symbol: str) -> Path:
+        return self._symbol_dir(symbol) / "coverage.json"
+
+    def _load_coverage(self, symbol: str) -> list[tuple[datetime, datetime]]:
+        path = self._coverage_path(symbol)
+        try:
+            ranges = json.loads(path.read_text())
+            return [(datetime.fromisoformat(lo), datetime.fromisoformat(hi)) for lo, hi in ranges]
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Refetching {} history; unreadable coverage file {}: {}", symbol, path, exc)
+            return []
+
+    def _save_coverage(self, symbol: str, ranges: list[tuple[datetime, datetime]]) -> None:
+        path = self._coverage_path(symbol)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        scratch = path.parent / f".tmp-{uuid.uuid4().hex}.json"
+        try:
+            scratch.write_text(json.dumps([[lo.isoformat(), hi.isoformat()] for lo, hi in ranges]))
+            os.replace(scratch, path)
+        finally:
+            scratch.unlink(missing_ok=True)
+
+
+def merge_ranges(ranges: list[tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+    """Union of closed time ranges as sorted, non-overlapping ranges."""
+    merged: list[tuple[datetime, datetime]] = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def missing_ranges(
+    covered: list[tuple[datetime, datetime]], start: datetime, end: datetime
+) -> list[tuple[datetime, datetime]]:
+    """Parts of ``[start, end]`` outside the sorted, merged ``covered`` ranges.
+
+    Gaps keep the bounds of the neighbouring covered ranges; the rows at
+    those instants are fetched again and deduplicated when stored.
+    """
+    gaps: list[tuple[datetime, datetime]] = []
+    cursor, cursor_covered = start, False
+    for lo, hi in covered:
+        if hi < cursor:
+            continue
+        if lo > end:
+            break
+        if lo > cursor:
+            gaps.append((cursor, lo))
+        cursor, cursor_covered = hi, True
+        if cursor >= end:
+            return gaps
+    if cursor < end or not cursor_covered:
+        gaps.append((cursor, end))
+    return gaps
@@ -0,0 +1,205 @@
+"""Asyncio Motilal Oswal client for batched, rate-limited instrument and history fetches."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Iterable, Mapping, TypeVar
+
+import httpx
+import polars as pl
+from loguru import logger
+
+T = TypeVar("T")
+
+# Statuses worth retrying: throttled, or a transient failure on the broker's side.
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class MotilalAPIError(RuntimeError):
+    """Raised when a request fails after its retries or the API reports an error status."""
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second on average, in bursts of up to ``capacity``.
+
+    Waiters are served in arrival order, so one slow caller cannot be starved
+    by a stream of new ones.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass(frozen=True, slots=True)
+class RequestTiming:
+    path: str
+    status: int | None  # last HTTP status; None when no response arrived
+    attempts: int
+    seconds: float  # wall time including rate-limit waits and retry backoff
+
+
+class AsyncMotilalClient:
+    """Motilal REST client sharing one ``httpx.AsyncClient`` connection pool.
+
+    Every request waits for a token from the bucket before each attempt and
+    at most ``max_concurrency`` requests are in flight. Connection errors,
+    timeouts and retryable statuses are retried with exponential backoff and
+    full jitter, honouring ``Retry-After``. Each request's wall time,
+    attempts and final status are kept in ``timings``. Batch helpers gather
+    one coroutine per symbol, so a NIFTY100 refresh is a single concurrent
+    operation whose throughput is set by the rate limit. Endpoint paths are
+    class attributes so they can follow the broker's API revisions.
+    """
+
+    INSTRUMENT_PATH = "/rest/report/v1/getscripinfo"
+    HISTORY_PATH = "/rest/report/v1/getcandledata"
+
+    def __init__(
+        self,
+        headers: Mapping[str, str],
+        api_base: str,
+        *,
+        exchange: str = "NSE",
+        requests_per_second: float = 10.0,
+        burst: int = 10,
+        max_concurrency: int = 8,
+        timeout_seconds: float = 30.0,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 8.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        timing_history: int = 1_000,
+    ) -> None:
+        self.exchange = exchange
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.limiter = TokenBucket(requests_per_second, burst)
+        self.timings: deque[RequestTiming] = deque(maxlen=timing_history)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=api_base,
+            headers=dict(headers),
+            timeout=timeout_seconds,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncMotilalClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def post(self, path: str, payload: Mapping[str, Any]) -> Any:
+        """POST ``payload`` and return the response's ``data``, retrying transient failures."""
+        started = time.perf_counter()
+        status: int | None = None
+        async with self._semaphore:
+            for attempt in range(1, self.max_retries + 2):
+                await self.limiter.acquire()
+                retry_after: float | None = None
+                try:
+                    response = await self._client.post(path, json=dict(payload))
+                except httpx.TransportError as exc:
+                    error: Exception = exc
+                else:
+                    status = response.status_code
+                    if status not in RETRYABLE_STATUS:
+                        break
+                    error = MotilalAPIError(f"{path} returned HTTP {status}")
+                    retry_after = _retry_after_seconds(response)
+                if attempt > self.max_retries:
+                    self._record(path, status, attempt, started)
+                    raise MotilalAPIError(f"{path} failed after {attempt} attempts: {error}") from error
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                logger.debug("Retrying {} in {:.2f}s after {}", path, delay, error)
+                await asyncio.sleep(delay)
+        self._record(path, status, attempt, started)
+        if response.is_error:
+            raise MotilalAPIError(f"{path} returned HTTP {status}")
+
+        body = response.json()
+        if body.get("status") != "SUCCESS":
+            raise MotilalAPIError(body.get("message") or f"{path} reported status {body.get('status')}")
+        return body.get("data")
+
+    async def instrument_metadata(self, symbol: str) -> dict[str, Any]:
+        data = await self.post(self.INSTRUMENT_PATH, {"exchange": self.exchange, "symbol": symbol})
+        return {**(data or {}), "symbol": symbol}
+
+    async def history_frame(self, symbol: str, start: datetime, end: datetime, interval_minutes: int) -> pl.DataFrame:
+        """Candles of ``symbol`` as a ``timestamp``/``price`` frame, the close standing in for the price."""
+        rows = await self.post(
+            self.HISTORY_PATH,
+            {
+                "exchange": self.exchange,
+                "symbol": symbol,
+                "interval": f"{interval_minutes}minute",
+                "fromdate": start.strftime("%Y-%m-%d %H:%M"),
+                "todate": end.strftime("%Y-%m-%d %H:%M"),
+            },
+        )
+        if not rows:
+            return pl.DataFrame(schema={"timestamp": pl.Datetime("us"), "price": pl.Float64})
+        frame = pl.DataFrame(rows).select(
+            pl.col("timestamp").str.to_datetime(time_unit="us"),
+            pl.col("close").cast(pl.Float64).alias("price"),
+        )
+        return frame.sort("timestamp")
+
+    async def instrument_metadata_many(self, symbols: Iterable[str]) -> dict[str, dict[str, Any] | Exception]:
+        return await self.gather_by_key(symbols, self.instrument_metadata)
+
+    async def history_frames(
+        self, symbols: Iterable[str], start: datetime, end: datetime, interval_minutes: int
+    ) -> dict[str, pl.DataFrame | Exception]:
+        return await self.gather_by_key(symbols, lambda symbol: self.history_frame(symbol, start, end, interval_minutes))
+
+    @staticmethod
+    async def gather_by_key(keys: Iterable[str], fetch: Callable[[str], Awaitable[T]]) -> dict[str, T | Exception]:
+        """Run ``fetch`` for every key concurrently; a key's failure is returned in its place, not raised."""
+        keys = list(dict.fromkeys(keys))
+        results = await asyncio.gather(*(fetch(key) for key in keys), return_exceptions=True)
+        return dict(zip(keys, results))
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0.0, min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (attempt - 1)))
+
+    def _record(self, path: str, status: int | None, attempts: int, started: float) -> None:
+        timing = RequestTiming(path, status, attempts, time.perf_counter() - started)
+        self.timings.append(timing)
+        logger.debug("Motilal {} -> {} in {:.3f}s ({} attempts)", path, status, timing.seconds, attempts)
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        return None
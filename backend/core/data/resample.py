@@ -0,0 +1,176 @@
+"""Session-aligned OHLCV bars derived from stored history, cached per data version."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+import polars as pl
+
+from . import MarketDataProvider
+from .bars import NSE_SESSION, Timeframe, TradingSession
+from .fingerprint import VersionedMarketDataProvider
+from .frames import ColumnarMarketDataProvider, frame_from_events
+
+BAR_COLUMNS = ("start", "end", "open", "high", "low", "close", "volume", "ticks")
+
+
+def resample_bars(frame: pl.DataFrame, timeframe: Timeframe, session: TradingSession = NSE_SESSION) -> pl.DataFrame:
+    """OHLCV bars of a time-sorted ``timestamp``/``price`` (optionally ``volume``) frame.
+
+    Bars follow ``iter_bars``: rows outside the session are dropped,
+    intraday bars are aligned to the session open with the last one cut at
+    the close (a row stamped at the close joins it), and daily bars span the
+    session. Rows may be ticks or bars of a finer timeframe stamped at
+    their start.
+    """
+    timestamp = pl.col("timestamp")
+    time_zone = frame.schema["timestamp"].time_zone
+    if time_zone is not None and time_zone != session.time_zone:
+        frame = frame.with_columns(timestamp.dt.convert_time_zone(session.time_zone))
+    day = timestamp.dt.truncate("1d")
+    session_open, session_close = day + _since_midnight(session.open), day + _since_midnight(session.close)
+    frame = frame.filter(timestamp.dt.time().is_between(session.open, session.close)).select(
+        timestamp,
+        pl.col("price").cast(pl.Float64),
+        pl.col("volume").cast(pl.Float64) if "volume" in frame.columns else pl.lit(0.0).alias("volume"),
+        session_close.alias("_close"),
+    )
+    aggregations = (
+        pl.col("price").first().alias("open"),
+        pl.col("price").max().alias("high"),
+        pl.col("price").min().alias("low"),
+        pl.col("price").last().alias("close"),
+        pl.col("volume").sum(),
+        pl.len().cast(pl.Int64).alias("ticks"),
+        pl.col("_close").first(),
+    )
+
+    width = timeframe.seconds
+    if width is None:
+        bars = frame.group_by(session_open.alias("start"), maintain_order=True).agg(aggregations)
+        return bars.select(pl.col("start"), pl.col("_close").alias("end"), *BAR_COLUMNS[2:])
+
+    open_seconds = session.open.hour * 3600 + session.open.minute * 60 + session.open.second
+    bars = frame.with_columns(
+        # Rows at the close fall into the session's last bar rather than opening one of their own.
+        pl.min_horizontal(timestamp, pl.col("_close") - pl.duration(microseconds=1)).alias("start")
+    ).group_by_dynamic("start", every=f"{width}s", offset=f"{open_seconds % width}s", closed="left", label="left")
+    return bars.agg(aggregations).select(
+        pl.col("start"),
+        pl.min_horizontal(pl.col("start") + pl.duration(seconds=width), pl.col("_close")).alias("end"),
+        *BAR_COLUMNS[2:],
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    start: datetime
+    end: datetime
+    version: str
+    bars: pl.DataFrame
+    tail_open: datetime | None  # session open of the last bar's day
+    prefix_version: str | None  # data version of the window before ``tail_open``
+
+
+class BarResampler:
+    """Serve 1m, 5m, 15m and daily bars of a provider's history from one base granularity.
+
+    Higher timeframes are derived from the provider's own rows, ticks or bars
+    of ``base_interval``, rather than fetched separately; timeframes finer
+    than the base are rejected. Derived frames of versioned providers are
+    kept in memory per (symbol, timeframe) with the data version they were
+    built from, least recently used first out past ``max_entries``. When
+    new base rows arrive for a window with the same start and a later (or
+    the same) end, and the data version of everything before the last
+    cached bar's session is unchanged, only that session onwards is read
+    and resampled again.
+    """
+
+    def __init__(
+        self,
+        provider: MarketDataProvider,
+        session: TradingSession = NSE_SESSION,
+        base_interval: timedelta | None = None,
+        max_entries: int = 512,
+    ) -> None:
+        self.provider = provider
+        self.session = session
+        self.base_interval = base_interval
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, Timeframe], _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+
+    def bars(self, symbol: str, timeframe: Timeframe, start: datetime, end: datetime) -> pl.DataFrame:
+        """Bars of ``symbol`` built from the rows in ``[start, end]``, with ``BAR_COLUMNS``."""
+        width = timeframe.seconds
+        if self.base_interval is not None and width is not None and width < self.base_interval.total_seconds():
+            raise ValueError(f"{timeframe.value} bars cannot be derived from {self.base_interval} history")
+        if not isinstance(self.provider, VersionedMarketDataProvider):
+            return resample_bars(self._base(symbol, start, end), timeframe, self.session)
+
+        key = (symbol, timeframe)
+        version = self.provider.data_version(symbol, start, end)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and (entry.start, entry.end, entry.version) == (start, end, version):
+            self.hits += 1
+            return entry.bars
+
+        if self._extends(entry, start, end, symbol):
+            self.extensions += 1
+            tail = resample_bars(self._base(symbol, entry.tail_open, end), timeframe, self.session)
+            bars = pl.concat([entry.bars.filter(pl.col("start") < entry.tail_open), tail])
+        else:
+            self.misses += 1
+            bars = resample_bars(self._base(symbol, start, end), timeframe, self.session)
+        self._store(key, symbol, start, end, version, bars)
+        return bars
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        """Drop the cached bars of ``symbol``, or of every symbol."""
+        with self._lock:
+            for key in [key for key in self._entries if symbol is None or key[0] == symbol]:
+                del self._entries[key]
+
+    def _extends(self, entry: _Entry | None, start: datetime, end: datetime, symbol: str) -> bool:
+        if entry is None or entry.tail_open is None or entry.start != start or end < entry.end:
+            return False
+        return self.provider.data_version(symbol, start, _before(entry.tail_open)) == entry.prefix_version
+
+    def _store(
+        self, key: tuple[str, Timeframe], symbol: str, start: datetime, end: datetime, version: str, bars: pl.DataFrame
+    ) -> None:
+        tail_open = prefix_version = None
+        if not bars.is_empty():
+            last = bars["start"][-1]
+            tail_open = datetime.combine(last.date(), self.session.open, last.tzinfo)
+            if tail_open > start:
+                prefix_version = self.provider.data_version(symbol, start, _before(tail_open))
+            else:
+                tail_open = None  # the window holds a single session; nothing to keep on extension
+        with self._lock:
+            self._entries[key] = _Entry(start, end, version, bars, tail_open, prefix_version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _base(self, symbol: str, start: datetime, end: datetime) -> pl.DataFrame:
+        if isinstance(self.provider, ColumnarMarketDataProvider):
+            return self.provider.history_frame(symbol, start, end)
+        return frame_from_events(self.provider.historical(symbol, start, end))
+
+
+def _since_midnight(moment: time) -> pl.Expr:
+    return pl.duration(hours=moment.hour, minutes=moment.minute, seconds=moment.second)
+
+
+def _before(moment: datetime) -> datetime:
+    return moment - timedelta(microseconds=1)
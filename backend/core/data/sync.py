@@ -0,0 +1,129 @@
+"""Incremental synchronization of broker history into the local Parquet store."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable
+
+import polars as pl
+from loguru import logger
+
+from .frames import HISTORY_SCHEMA
+from .parquet_store import ParquetMarketData, merge_ranges
+from .providers.motilal_async import AsyncMotilalClient
+
+
+@dataclass(slots=True)
+class SymbolSync:
+    symbol: str
+    gaps: int = 0
+    requests: int = 0
+    rows: int = 0
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class SyncReport:
+    start: datetime
+    end: datetime
+    symbols: list[SymbolSync] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return sum(result.requests for result in self.symbols)
+
+    @property
+    def rows(self) -> int:
+        return sum(result.rows for result in self.symbols)
+
+    @property
+    def failed(self) -> list[str]:
+        return [result.symbol for result in self.symbols if result.error is not None]
+
+
+class HistorySync:
+    """Fetch only the history a :class:`ParquetMarketData` store is missing.
+
+    Each symbol's missing ranges come from the store's coverage index and
+    are cut down to trading sessions by the store's calendar; neighbouring
+    sessions are then joined into requests spanning at most
+    ``max_days_per_request`` days. All requests of a sync go out together
+    through the client, whose token bucket and concurrency limit pace them.
+    A symbol's rows and coverage are appended atomically; when one of its
+    requests fails, only the ranges of its successful requests are marked
+    covered, so the next sync retries the rest.
+    """
+
+    def __init__(
+        self,
+        store: ParquetMarketData,
+        client: AsyncMotilalClient,
+        interval_minutes: int,
+        max_days_per_request: int = 30,
+    ) -> None:
+        if max_days_per_request < 1:
+            raise ValueError("max_days_per_request must be at least 1")
+        self.store = store
+        self.client = client
+        self.interval_minutes = interval_minutes
+        self.max_request_span = timedelta(days=max_days_per_request)
+
+    async def run(self, symbols: Iterable[str], start: datetime, end: datetime) -> SyncReport:
+        started = time.perf_counter()
+        symbols = list(dict.fromkeys(symbols))
+        gaps = await asyncio.to_thread(lambda: {symbol: self.store.missing(symbol, start, end) for symbol in symbols})
+        requests = {symbol: self._requests(symbol_gaps) for symbol, symbol_gaps in gaps.items()}
+        results = await asyncio.gather(
+            *(
+                asyncio.gather(
+                    *(self.client.history_frame(symbol, lo, hi, self.interval_minutes) for lo, hi in ranges),
+                    return_exceptions=True,
+                )
+                for symbol, ranges in requests.items()
+            )
+        )
+
+        report = SyncReport(start, end)
+        for symbol, frames in zip(requests, results):
+            result = SymbolSync(symbol, gaps=len(gaps[symbol]), requests=len(requests[symbol]))
+            fetched = [(rng, frame) for rng, frame in zip(requests[symbol], frames) if isinstance(frame, pl.DataFrame)]
+            failures = [frame for frame in frames if isinstance(frame, BaseException)]
+            covered = gaps[symbol]
+            if failures:
+                result.error = str(failures[0])
+                logger.warning(
+                    "History sync of {} failed for {} of {} requests: {}", symbol, len(failures), len(frames), result.error
+                )
+                covered = [rng for rng, _ in fetched]
+            if covered:
+                frame = pl.concat([frame for _, frame in fetched]) if fetched else pl.DataFrame(schema=HISTORY_SCHEMA)
+                await asyncio.to_thread(self.store.append, symbol, frame, covered)
+                result.rows = frame.height
+            report.symbols.append(result)
+
+        report.seconds = time.perf_counter() - started
+        logger.info(
+            "Synced {} symbols from {} to {}: {} requests, {} rows, {} failed in {:.1f}s",
+            len(symbols),
+            start,
+            end,
+            report.requests,
+            report.rows,
+            len(report.failed),
+            report.seconds,
+        )
+        return report
+
+    def _requests(self, gaps: list[tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+        """Trading sessions inside ``gaps``, joined into requests no longer than ``max_request_span``."""
+        requests: list[tuple[datetime, datetime]] = []
+        for lo, hi in merge_ranges(self.store.trading_ranges(gaps)):
+            if requests and hi - requests[-1][0] <= self.max_request_span:
+                requests[-1] = (requests[-1][0], hi)
+            else:
+                requests.append((lo, hi))
+        return requests
@@ -0,0 +1,206 @@
+"""Deterministic synthetic market data for load and scaling tests."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+from datetime import date, datetime, timedelta
+from typing import Iterator, Sequence
+
+import numpy as np
+import polars as pl
+
+from . import MarketDataEvent
+from .batches import DEFAULT_BATCH_SIZE, EVENT_DTYPE, MarketDataBatch, datetime_to_ns, iter_events
+from .calendar import NSE_CALENDAR, TradingCalendar
+from .frames import HISTORY_SCHEMA
+
+SESSIONS_PER_YEAR = 252
+# Calendar days of daily draws generated together from one seed.
+_BLOCK_DAYS = 1024
+
+
+class SyntheticMarketData:
+    """Seeded GBM-with-jumps ticks on a regular grid inside each trading session.
+
+    Every session of ``calendar`` carries ticks every ``interval`` from the
+    open to the close, and nothing between sessions. Each session's log
+    return is drawn as a diffusion (``drift`` and ``volatility`` are
+    annualised over 252 sessions) plus a Poisson number of normal jumps
+    (``jump_intensity`` is the expected count per session). The intraday
+    path is a Brownian bridge to that return whose variance follows a
+    U-shaped smile, ``1 + smile`` times the midday variance at the open and
+    close, with the jumps landing on random ticks. Tick volumes are
+    exponentially distributed around ``mean_volume`` scaled by the same smile.
+
+    The daily returns come from per-symbol seeds in blocks of calendar days
+    counted from ``origin`` and each session's path from a seed of its own,
+    so a tick's price depends only on the parameters, the symbol and its
+    time: any window, read in any order or batch size, sees the same data.
+    History is generated one session at a time as NumPy arrays and never
+    held beyond the batch being handed out.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        interval: timedelta = timedelta(seconds=1),
+        initial_price: float = 100.0,
+        drift: float = 0.05,
+        volatility: float = 0.2,
+        jump_intensity: float = 0.1,
+        jump_mean: float = -0.005,
+        jump_volatility: float = 0.02,
+        smile: float = 1.0,
+        mean_volume: float = 100.0,
+        calendar: TradingCalendar = NSE_CALENDAR,
+        origin: date = date(2010, 1, 1),
+    ) -> None:
+        session = datetime.combine(origin, calendar.close) - datetime.combine(origin, calendar.open)
+        if not timedelta(0) < interval <= session:
+            raise ValueError(f"interval must be positive and no longer than the {session} session")
+        self.seed = seed
+        self.interval = interval
+        self.initial_price = initial_price
+        self.drift = drift
+        self.volatility = volatility
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_volatility = jump_volatility
+        self.smile = smile
+        self.mean_volume = mean_volume
+        self.calendar = calendar
+        self.origin = origin
+
+        step_ns = interval // timedelta(microseconds=1) * 1_000
+        ticks = int(session // interval) + 1
+        self._offsets_ns = np.arange(ticks, dtype=np.int64) * step_ns
+        shape = 1.0 + smile * (2.0 * np.linspace(0.0, 1.0, ticks) - 1.0) ** 2
+        shape /= shape.mean()
+        variance = shape.copy()
+        variance[0] = 0.0  # the first tick is the open itself
+        variance /= variance.sum()
+        self._variance_share = np.cumsum(variance)
+        self._tick_sd = volatility * np.sqrt(variance / SESSIONS_PER_YEAR)
+        self._volume_rate = mean_volume * shape
+        self._lock = threading.Lock()
+        self._daily: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def historical(self, symbol: str, start: datetime, end: datetime) -> Iterator[MarketDataEvent]:
+        return iter_events(self.history_batches(symbol, start, end))
+
+    def history_frame(self, symbol: str, start: datetime, end: datetime) -> pl.DataFrame:
+        """The whole window as one frame; prefer ``history_batches`` for long windows."""
+        batches = [batch.records for batch in self.history_batches(symbol, start, end)]
+        if not batches:
+            return pl.DataFrame(schema=HISTORY_SCHEMA)
+        records = np.concatenate(batches)
+        timestamps = pl.from_epoch(pl.Series("timestamp", records["timestamp_ns"]), time_unit="ns")
+        timestamps = timestamps.dt.cast_time_unit("us")
+        if start.tzinfo is not None:
+            zone = getattr(start.tzinfo, "key", "UTC")
+            timestamps = timestamps.dt.replace_time_zone("UTC").dt.convert_time_zone(zone)
+        return pl.DataFrame({"timestamp": timestamps, "price": records["price"], "volume": records["volume"]})
+
+    def history_batches(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        symbol_id: int = 0,
+        symbols: Sequence[str] | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[MarketDataBatch]:
+        """Ticks in ``[start, end]`` as batches of ``batch_size`` rows, generated a session at a time."""
+        symbols = symbols if symbols is not None else (symbol,)
+        start_ns, end_ns = datetime_to_ns(start), datetime_to_ns(end)
+        pending: list[np.ndarray] = []
+        buffered = 0
+        for lo, _ in self.calendar.sessions(start, end):
+            day = lo.date()
+            if day < self.origin:
+                continue
+            records = self._session(symbol, day, datetime.combine(day, self.calendar.open, start.tzinfo))
+            timestamps = records["timestamp_ns"]
+            records = records[np.searchsorted(timestamps, start_ns) : np.searchsorted(timestamps, end_ns, side="right")]
+            records["symbol_id"] = symbol_id
+            pending.append(records)
+            buffered += len(records)
+            while buffered >= batch_size:
+                records = pending[0] if len(pending) == 1 else np.concatenate(pending)
+                yield MarketDataBatch(records[:batch_size], symbols, start.tzinfo)
+                pending, buffered = [records[batch_size:]], buffered - batch_size
+        if buffered:
+            yield MarketDataBatch(np.concatenate(pending), symbols, start.tzinfo)
+
+    def data_version(self, symbol: str, start: datetime, end: datetime) -> str:
+        """Digest of the generator parameters, which fully determine the data."""
+        parameters = (
+            self.seed,
+            self.interval,
+            self.initial_price,
+            self.drift,
+            self.volatility,
+            self.jump_intensity,
+            self.jump_mean,
+            self.jump_volatility,
+            self.smile,
+            self.mean_volume,
+            self.calendar.open,
+            self.calendar.close,
+            sorted(self.calendar.holidays),
+            sorted(self.calendar.weekend),
+            self.origin,
+        )
+        return hashlib.blake2b(repr(parameters).encode(), digest_size=16).hexdigest()
+
+    def _session(self, symbol: str, day: date, session_open: datetime) -> np.ndarray:
+        """Every tick of ``symbol``'s session on ``day``."""
+        index = (day - self.origin).days
+        diffusion, counts, jumps, log_open = self._daily_draws(symbol, index)
+        rng = np.random.default_rng([self.seed, _symbol_key(symbol), 1, index])
+        walk = np.cumsum(rng.standard_normal(len(self._tick_sd)) * self._tick_sd)
+        path = walk - self._variance_share * (walk[-1] - diffusion[index])
+        count = int(counts[index])
+        if count:
+            sizes = rng.normal(self.jump_mean, self.jump_volatility, count)
+            sizes += (jumps[index] - sizes.sum()) / count  # condition the sizes on the session's jump return
+            steps = np.zeros(len(path))
+            np.add.at(steps, rng.integers(1, len(path), count), sizes)
+            path += np.cumsum(steps)
+
+        records = np.empty(len(path), dtype=EVENT_DTYPE)
+        records["timestamp_ns"] = datetime_to_ns(session_open) + self._offsets_ns
+        records["price"] = np.exp(log_open[index] + path)
+        records["volume"] = np.ceil(self._volume_rate * rng.standard_exponential(len(path)))
+        return records
+
+    def _daily_draws(self, symbol: str, index: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Per-day diffusion return, jump count, jump return and opening log price, covering day ``index``."""
+        with self._lock:
+            draws = self._daily.get(symbol)
+            if draws is not None and index < len(draws[0]):
+                return draws
+            blocks = index // _BLOCK_DAYS + 1
+            parts = [self._block(symbol, block) for block in range(blocks)]
+            diffusion, counts, jumps = (np.concatenate(columns) for columns in zip(*parts))
+            days = [self.origin + timedelta(days=day) for day in range(len(diffusion))]
+            trading = np.fromiter((self.calendar.is_trading_day(day) for day in days), dtype=bool, count=len(days))
+            returns = np.where(trading, diffusion + jumps, 0.0)
+            log_open = math.log(self.initial_price) + np.concatenate(([0.0], np.cumsum(returns)[:-1]))
+            draws = self._daily[symbol] = (diffusion, counts, jumps, log_open)
+            return draws
+
+    def _block(self, symbol: str, block: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rng = np.random.default_rng([self.seed, _symbol_key(symbol), 0, block])
+        tau = 1.0 / SESSIONS_PER_YEAR
+        shocks = rng.standard_normal(_BLOCK_DAYS)
+        diffusion = (self.drift - self.volatility**2 / 2) * tau + self.volatility * math.sqrt(tau) * shocks
+        counts = rng.poisson(self.jump_intensity, _BLOCK_DAYS)
+        jumps = counts * self.jump_mean + np.sqrt(counts) * self.jump_volatility * rng.standard_normal(_BLOCK_DAYS)
+        return diffusion, counts, jumps
+
+
+def _symbol_key(symbol: str) -> int:
+    return int.from_bytes(hashlib.blake2b(symbol.encode(), digest_size=8).digest(), "little")
@@ -1,6 +1,7 @@
 """Execution related classes."""
 
 from .engine import SimulationEngine
+from .ledger import TradeLedger, leg_round_trips
 from .models import (
     OrderSide,
     OrderStatus,
@@ -18,6 +19,8 @@ __all__ = [
     "SimulationFill",
     "SimulationOrder",
     "SimulationResult",
+    "TradeLedger",
+    "leg_round_trips",
 ]
 
 
@@ -0,0 +1,88 @@
+"""Price-indexed book of parked LIMIT and STOP orders."""
+
+from __future__ import annotations
+
+import heapq
+
+from .models import OrderSide, OrderType, SimulationOrder
+
+# Heaps in the order their fills are emitted within a tick. The first two
+# trigger when the price falls to an order's price and pop the highest
+# price first; the last two trigger on a rise and pop the lowest first.
+_BUY_LIMIT, _SELL_STOP, _SELL_LIMIT, _BUY_STOP = range(4)
+_FALLING = (_BUY_LIMIT, _SELL_STOP)
+_RISING = (_SELL_LIMIT, _BUY_STOP)
+_HEAPS = {
+    (OrderType.LIMIT, OrderSide.BUY): _BUY_LIMIT,
+    (OrderType.STOP, OrderSide.SELL): _SELL_STOP,
+    (OrderType.LIMIT, OrderSide.SELL): _SELL_LIMIT,
+    (OrderType.STOP, OrderSide.BUY): _BUY_STOP,
+}
+
+
+class TriggerBook:
+    """Parked orders of one symbol in four heaps keyed by trigger price.
+
+    Buy limits and sell stops sit in max-heaps, sell limits and buy stops in
+    min-heaps, with ties broken by submission sequence, so each heap pops in
+    price-time priority and a tick only touches the orders it triggers.
+    Removed orders are dropped lazily when they reach the top of a heap, and
+    the heaps are rebuilt without them once they make up more than half of
+    the entries, so cancelling or re-parking orders cannot grow the book
+    without bound.
+    """
+
+    def __init__(self) -> None:
+        self._heaps: tuple[list[tuple[float, int, SimulationOrder]], ...] = ([], [], [], [])
+        self._live: dict[str, int] = {}  # order id -> sequence of its current entry
+        self._stale = 0  # heap entries of removed orders
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def add(self, order: SimulationOrder, sequence: int) -> bool:
+        """Index ``order``; False for orders without a trigger price, which can never fill."""
+        heap = _HEAPS.get((order.order_type, order.side))
+        if heap is None or order.price is None:
+            return False
+        price = float(order.price)
+        if order.order_id in self._live:
+            self._stale += 1
+        heapq.heappush(self._heaps[heap], (-price if heap in _FALLING else price, sequence, order))
+        self._live[order.order_id] = sequence
+        return True
+
+    def discard(self, order_id: str) -> None:
+        if self._live.pop(order_id, None) is None:
+            return
+        self._stale += 1
+        if self._stale > len(self._live):  # over half of the entries
+            self._compact()
+
+    def pop_triggered(self, price: float) -> list[SimulationOrder]:
+        """Remove and return the orders a tick at ``price`` fills, in fill order."""
+        triggered: list[SimulationOrder] = []
+        for heap in _FALLING:
+            self._pop_while(heap, -price, triggered)
+        for heap in _RISING:
+            self._pop_while(heap, price, triggered)
+        return triggered
+
+    def _pop_while(self, heap: int, level: float, out: list[SimulationOrder]) -> None:
+        """Pop entries of ``heap`` with keys at or below ``level``, skipping removed ones."""
+        entries, live = self._heaps[heap], self._live
+        while entries and entries[0][0] <= level:
+            _, sequence, order = heapq.heappop(entries)
+            if live.get(order.order_id) == sequence:
+                del live[order.order_id]
+                out.append(order)
+            else:
+                self._stale -= 1
+
+    def _compact(self) -> None:
+        """Rebuild every heap with only the entries of orders still live."""
+        live = self._live
+        for entries in self._heaps:
+            entries[:] = [entry for entry in entries if live.get(entry[2].order_id) == entry[1]]
+            heapq.heapify(entries)
+        self._stale = 0
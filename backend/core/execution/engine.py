@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Iterable, List, Optional
+from itertools import count
+from typing import Iterable, List, Mapping, Optional
 
 from ..portfolio.account import AccountState, PortfolioManager
 from ..data import MarketDataEvent
+from .book import TriggerBook
+from .ledger import TradeLedger
 from .models import (
     OrderSide,
     OrderStatus,
@@ -18,16 +21,38 @@ from .models import (
 
 
 class SimulationEngine:
-    """Core engine for processing simulated orders and market data"""
+    """Core engine for processing simulated orders and market data
+
+    Parked LIMIT and STOP orders are indexed per symbol in a ``TriggerBook``,
+    so a tick costs O(log n) per order it fills rather than a pass over every
+    resting order. Orders filled by the same tick are filled buy limits and
+    sell stops first, then sell limits and buy stops, each in price-time
+    priority.
+    """
 
     def __init__(
         self,
         portfolio: PortfolioManager,
         latency_ms: int = 0,
+        ledger: TradeLedger | None = None,
     ) -> None:
         self.portfolio = portfolio
         self.latency_ms = latency_ms
-        self.pending_orders: dict[str, SimulationOrder] = {}
+        self.ledger = ledger if ledger is not None else TradeLedger()
+        self._pending: dict[str, SimulationOrder] = {}
+        self._books: dict[str, TriggerBook] = {}
+        self._sequence = count()
+
+    @property
+    def pending_orders(self) -> dict[str, SimulationOrder]:
+        """Parked orders by id in submission order; change them through the engine, not this dict."""
+        return self._pending
+
+    @pending_orders.setter
+    def pending_orders(self, orders: Mapping[str, SimulationOrder]) -> None:
+        self._pending, self._books = {}, {}
+        for order in orders.values():
+            self._park(order)
 
     def submit_order(self, order: SimulationOrder, market_price: float) -> SimulationResult:
         """Simulate order execution assuming immediate-or-cancel semantics for now"""
@@ -43,7 +68,7 @@ class SimulationEngine:
         execution_price = self._determine_fill_price(order, market_price)
         if execution_price is None:
             status = OrderStatus.PENDING
-            self.pending_orders[order.order_id] = order
+            self._park(order)
             message = "Order parked in book awaiting trigger"
             return SimulationResult(order=order, status=status, fills=fills, message=message)
 
@@ -53,12 +78,13 @@ class SimulationEngine:
             symbol=order.symbol,
             fill_price=execution_price,
             quantity=order.quantity,
-            timestamp=datetime.utcnow(),
+            timestamp=order.timestamp or datetime.utcnow(),
         )
         fills.append(fill)
         status = OrderStatus.FILLED
 
         self.portfolio.apply_fill(fill, order.side)
+        self.ledger.append(order, fill)
 
         return SimulationResult(order=order, status=status, fills=fills, message=message)
 
@@ -81,36 +107,48 @@ class SimulationEngine:
 
     def process_market_data(self, event: MarketDataEvent) -> list[SimulationResult]:
         """Attempt to fill pending orders when market data arrives"""
+        return self.process_tick(event.symbol, event.price, event.timestamp)
 
-        to_remove: list[str] = []
+    def process_tick(self, symbol: str, price: float, timestamp: datetime) -> list[SimulationResult]:
+        """``process_market_data`` for a tick given as plain values, without an event object."""
+        book = self._books.get(symbol)
+        if not book:
+            return []
         results: list[SimulationResult] = []
-        for order_id, order in list(self.pending_orders.items()):
-            if order.symbol != event.symbol:
-                continue
-            fill_price = self._determine_fill_price(order, event.price)
-            if fill_price is None:
-                continue
-            fill = SimulationFill(
-                order_id=order.order_id,
-                fill_id=f"{order.order_id}-{len(results)+1}",
-                symbol=order.symbol,
-                fill_price=fill_price,
-                quantity=order.quantity,
-                timestamp=event.timestamp,
-            )
-            self.portfolio.apply_fill(fill, order.side)
-            results.append(
-                SimulationResult(order=order, status=OrderStatus.FILLED, fills=[fill])
-            )
-            to_remove.append(order_id)
-
-        for order_id in to_remove:
-            self.pending_orders.pop(order_id, None)
-
+        for order in book.pop_triggered(price):
+            del self._pending[order.order_id]
+            fill_price = self._determine_fill_price(order, price)
+            results.append(self._fill_pending(order, fill_price, timestamp, len(results) + 1))
         return results
 
+    def _park(self, order: SimulationOrder) -> None:
+        previous = self._pending.pop(order.order_id, None)
+        if previous is not None:
+            self._books[previous.symbol].discard(order.order_id)
+        self._pending[order.order_id] = order
+        book = self._books.get(order.symbol)
+        if book is None:
+            book = self._books[order.symbol] = TriggerBook()
+        book.add(order, next(self._sequence))
+
+    def _fill_pending(
+        self, order: SimulationOrder, fill_price: float, timestamp: datetime, sequence: int
+    ) -> SimulationResult:
+        fill = SimulationFill(
+            order_id=order.order_id,
+            fill_id=f"{order.order_id}-{sequence}",
+            symbol=order.symbol,
+            fill_price=fill_price,
+            quantity=order.quantity,
+            timestamp=timestamp,
+        )
+        self.portfolio.apply_fill(fill, order.side)
+        self.ledger.append(order, fill)
+        return SimulationResult(order=order, status=OrderStatus.FILLED, fills=[fill])
+
     def reset(self, account_state: Optional[AccountState] = None) -> None:
-        self.pending_orders.clear()
+        self._pending.clear()
+        self._books.clear()
         if account_state:
             self.portfolio.reset(account_state)
 
@@ -0,0 +1,133 @@
+"""Columnar record of simulated fills."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+import pyarrow as pa
+
+from .models import SimulationFill, SimulationOrder
+
+LEDGER_SCHEMA = {
+    "order_id": pl.String,
+    "leg_id": pl.String,
+    "symbol": pl.String,
+    "side": pl.String,
+    "quantity": pl.Int64,
+    "price": pl.Float64,
+    "timestamp": pl.Datetime("us"),
+    "reason": pl.String,
+}
+
+_COLUMNS = ("_order_id", "_leg_id", "_symbol", "_side", "_quantity", "_price", "_timestamp", "_reason")
+
+
+class TradeLedger:
+    """Append-only fill ledger kept as one typed column per field.
+
+    ``leg_id`` and ``reason`` come from the order's metadata (``leg_id`` and
+    ``exit_reason``), so fills can be grouped per leg without walking nested
+    order and fill objects.
+    """
+
+    def __init__(self) -> None:
+        self._order_id: list[str] = []
+        self._leg_id: list[str | None] = []
+        self._symbol: list[str] = []
+        self._side: list[str] = []
+        self._quantity: list[int] = []
+        self._price: list[float] = []
+        self._timestamp: list[datetime] = []
+        self._reason: list[str | None] = []
+
+    def __len__(self) -> int:
+        return len(self._order_id)
+
+    def append(self, order: SimulationOrder, fill: SimulationFill) -> None:
+        metadata = order.metadata or {}
+        self._order_id.append(order.order_id)
+        self._leg_id.append(metadata.get("leg_id"))
+        self._symbol.append(fill.symbol)
+        self._side.append(order.side.value)
+        self._quantity.append(fill.quantity)
+        self._price.append(fill.fill_price)
+        self._timestamp.append(fill.timestamp)
+        self._reason.append(metadata.get("exit_reason"))
+
+    def slice(self, start: int) -> TradeLedger:
+        """The fills from row ``start`` on, as a new ledger."""
+        tail = TradeLedger()
+        for name in _COLUMNS:
+            setattr(tail, name, getattr(self, name)[start:])
+        return tail
+
+    def extend(self, other: TradeLedger) -> None:
+        """Append every fill of ``other``, in order."""
+        for name in _COLUMNS:
+            getattr(self, name).extend(getattr(other, name))
+
+    def to_frame(self) -> pl.DataFrame:
+        columns = {
+            "order_id": self._order_id,
+            "leg_id": self._leg_id,
+            "symbol": self._symbol,
+            "side": self._side,
+            "quantity": self._quantity,
+            "price": self._price,
+            "timestamp": self._timestamp,
+            "reason": self._reason,
+        }
+        series = []
+        for name, dtype in LEDGER_SCHEMA.items():
+            if name == "timestamp" and self._timestamp:
+                # Keep the time zone of aware timestamps; the unit is always microseconds.
+                series.append(pl.Series(name, self._timestamp).dt.cast_time_unit("us"))
+            else:
+                series.append(pl.Series(name, columns[name], dtype=dtype))
+        return pl.DataFrame(series)
+
+    def to_arrow(self) -> pa.Table:
+        return self.to_frame().to_arrow()
+
+    def write_ipc(self, path: str | Path) -> None:
+        self.to_frame().write_ipc(path)
+
+    def write_parquet(self, path: str | Path) -> None:
+        self.to_frame().write_parquet(path)
+
+
+def leg_round_trips(ledger: pl.DataFrame) -> pl.DataFrame:
+    """One row per entry of each leg, paired with the exit fills that closed it.
+
+    Fills without a ``reason`` are entries; each entry opens a new round trip
+    for its leg and the following exit fills of that leg close it. ``pnl`` is
+    null while a trip is still open.
+    """
+    fills = ledger.filter(pl.col("leg_id").is_not_null()).with_columns(
+        is_entry=pl.col("reason").is_null(),
+    )
+    trips = (
+        fills.with_columns(trip=pl.col("is_entry").cum_sum().over("leg_id"))
+        .group_by("leg_id", "trip", maintain_order=True)
+        .agg(
+            symbol=pl.col("symbol").first(),
+            side=pl.col("side").filter(pl.col("is_entry")).first(),
+            quantity=pl.col("quantity").filter(pl.col("is_entry")).sum(),
+            entry_price=pl.col("price").filter(pl.col("is_entry")).first(),
+            entry_time=pl.col("timestamp").filter(pl.col("is_entry")).first(),
+            exit_price=pl.col("price").filter(~pl.col("is_entry")).last(),
+            exit_time=pl.col("timestamp").filter(~pl.col("is_entry")).last(),
+            exit_reason=pl.col("reason").filter(~pl.col("is_entry")).last(),
+            exit_value=(pl.col("price") * pl.col("quantity")).filter(~pl.col("is_entry")).sum(),
+            exit_quantity=pl.col("quantity").filter(~pl.col("is_entry")).sum(),
+        )
+        .filter(pl.col("trip") > 0)
+    )
+    direction = pl.when(pl.col("side") == "BUY").then(1.0).otherwise(-1.0)
+    return trips.with_columns(
+        pnl=pl.when(pl.col("exit_quantity") > 0)
+        .then((pl.col("exit_value") - pl.col("entry_price") * pl.col("exit_quantity")) * direction)
+        .otherwise(None)
+    ).drop("trip", "exit_value", "exit_quantity")
@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Any, Protocol
 
 from ..core.data import MarketDataEvent
+from ..core.data.bars import Bar
 from ..core.execution.engine import SimulationOrder
 
 
@@ -21,6 +22,8 @@ class Strategy(Protocol):
 
     def on_tick(self, context: StrategyContext, event: MarketDataEvent) -> list[SimulationOrder]: ...
 
+    def on_bar(self, context: StrategyContext, bar: Bar) -> list[SimulationOrder]: ...
+
     def on_signal(self, context: StrategyContext, payload: dict[str, Any]) -> list[SimulationOrder]: ...
 
 
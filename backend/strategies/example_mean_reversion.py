@@ -2,54 +2,63 @@
 
 from __future__ import annotations
 
-from collections import deque
 from dataclasses import dataclass, field
-from statistics import mean
-from typing import Deque, List
+from datetime import datetime
+from typing import List
 
 from ..core.data import MarketDataEvent
+from ..core.data.bars import Bar
 from ..core.execution.engine import OrderSide, OrderType, SimulationOrder
 from .base import StrategyContext
+from .indicators import SMA
 
 
 @dataclass(slots=True)
 class MeanReversionStrategy:
     lookback: int = 20
     qty: int = 1
-    _prices: Deque[float] = field(default_factory=lambda: deque(maxlen=20))
+    _average: SMA = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._average = SMA(self.lookback)
 
     def on_init(self, context: StrategyContext) -> None:  # pragma: no cover - placeholder
-        self._prices = deque(maxlen=self.lookback)
+        self._average = SMA(self.lookback)
 
     def on_tick(self, context: StrategyContext, event: MarketDataEvent) -> List[SimulationOrder]:
+        return self._evaluate(context, event.symbol, event.price, event.timestamp)
+
+    def on_bar(self, context: StrategyContext, bar: Bar) -> List[SimulationOrder]:
+        return self._evaluate(context, bar.symbol, bar.close, bar.end)
+
+    def _evaluate(self, context: StrategyContext, symbol: str, price: float, timestamp: datetime) -> List[SimulationOrder]:
         orders: list[SimulationOrder] = []
-        self._prices.append(event.price)
-        if len(self._prices) < self.lookback:
+        avg_price = self._average.update(price)
+        if not self._average.ready:
             return orders
-        avg_price = mean(self._prices)
-        if event.price < avg_price * 0.995:
+        if price < avg_price * 0.995:
             orders.append(
                 SimulationOrder(
-                    order_id=f"MR-{context.strategy_id}-{event.timestamp.timestamp()}",
-                    symbol=event.symbol,
+                    order_id=f"MR-{context.strategy_id}-{timestamp.timestamp()}",
+                    symbol=symbol,
                     side=OrderSide.BUY,
                     order_type=OrderType.MARKET,
                     quantity=self.qty,
-                    price=event.price,
-                    timestamp=event.timestamp,
+                    price=price,
+                    timestamp=timestamp,
                     strategy_id=context.strategy_id,
                 )
             )
-        elif event.price > avg_price * 1.005:
+        elif price > avg_price * 1.005:
             orders.append(
                 SimulationOrder(
-                    order_id=f"MR-{context.strategy_id}-{event.timestamp.timestamp()}",
-                    symbol=event.symbol,
+                    order_id=f"MR-{context.strategy_id}-{timestamp.timestamp()}",
+                    symbol=symbol,
                     side=OrderSide.SELL,
                     order_type=OrderType.MARKET,
                     quantity=self.qty,
-                    price=event.price,
-                    timestamp=event.timestamp,
+                    price=price,
+                    timestamp=timestamp,
                     strategy_id=context.strategy_id,
                 )
             )
@@ -0,0 +1,359 @@
+"""Streaming technical indicators with matching vectorized batch forms.
+
+Each streaming indicator updates in constant time per value and reports NaN
+until it has seen enough data. The lowercase batch functions, re-exported from
+``core.backtesting.indicators``, compute the same series over a whole NumPy
+array or Polars series, so signals can be precomputed for a history and then
+maintained tick by tick. Both sets share the names used in leg entry
+conditions.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+import polars as pl
+
+from ..core.backtesting.indicators import (
+    BATCH_INDICATORS,
+    atr,
+    bollinger,
+    ema,
+    rolling_std,
+    rsi,
+    sma,
+    vwap,
+    zscore,
+)
+from ..core.data.fingerprint import columns_fingerprint
+
+if TYPE_CHECKING:
+    from ..core.data.indicator_cache import IndicatorCache
+
+__all__ = [
+    "ATR",
+    "BATCH_INDICATORS",
+    "EMA",
+    "RSI",
+    "SMA",
+    "STREAMING_INDICATORS",
+    "VWAP",
+    "BollingerBands",
+    "RingBuffer",
+    "RollingStd",
+    "ZScore",
+    "atr",
+    "bollinger",
+    "ema",
+    "precompute",
+    "rolling_std",
+    "rsi",
+    "sma",
+    "vwap",
+    "zscore",
+]
+
+NAN = float("nan")
+
+
+class RingBuffer:
+    """Fixed-capacity float buffer; pushing into a full buffer overwrites the oldest value."""
+
+    __slots__ = ("_data", "_head", "_count")
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._data = np.zeros(capacity, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    @property
+    def full(self) -> bool:
+        return self._count == len(self._data)
+
+    def push(self, value: float) -> float:
+        """Store ``value``; returns the value it displaced, or 0.0 while the buffer is filling."""
+        evicted = float(self._data[self._head]) if self._count == len(self._data) else 0.0
+        self._data[self._head] = value
+        self._head = (self._head + 1) % len(self._data)
+        if self._count < len(self._data):
+            self._count += 1
+        return evicted
+
+    def values(self) -> np.ndarray:
+        """Stored values, oldest first."""
+        if self._count < len(self._data):
+            return self._data[: self._count].copy()
+        return np.concatenate((self._data[self._head :], self._data[: self._head]))
+
+    def sum(self) -> float:
+        return float(self._data.sum())  # slots not yet written hold zeros
+
+
+class SMA:
+    """Simple moving average over the last ``period`` values.
+
+    A running sum is resynced from the buffer every ``period`` updates, which
+    keeps rounding drift from accumulating at amortised constant cost.
+    """
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self._buffer = RingBuffer(period)
+        self._total = 0.0
+        self._updates = 0
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return self._buffer.full
+
+    def update(self, value: float) -> float:
+        self._total += value - self._buffer.push(value)
+        self._updates += 1
+        if self._updates % self.period == 0:
+            self._total = self._buffer.sum()  # drop accumulated rounding drift
+        self.value = self._total / self.period if self.ready else NAN
+        return self.value
+
+
+class EMA:
+    """Exponential moving average with ``alpha = 2 / (period + 1)``, seeded with the first value."""
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self._average = NAN
+        self._count = 0
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= self.period
+
+    def update(self, value: float) -> float:
+        self._average = value if self._count == 0 else self._average + self.alpha * (value - self._average)
+        self._count += 1
+        self.value = self._average if self.ready else NAN
+        return self.value
+
+
+class RollingStd:
+    """Rolling mean and standard deviation over the last ``period`` values.
+
+    The mean and the sum of squared deviations are updated Welford-style as
+    each value enters and the oldest leaves, and recomputed from the buffer
+    every ``period`` updates to drop rounding drift.
+    """
+
+    def __init__(self, period: int, ddof: int = 0) -> None:
+        if period <= ddof:
+            raise ValueError("period must exceed ddof")
+        self.period = period
+        self.ddof = ddof
+        self._buffer = RingBuffer(period)
+        self._mean = 0.0
+        self._squares = 0.0  # sum of squared deviations from the mean
+        self._updates = 0
+        self.mean = NAN
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return self._buffer.full
+
+    def update(self, value: float) -> float:
+        full = self._buffer.full
+        evicted = self._buffer.push(value)
+        previous = self._mean
+        if full:
+            self._mean += (value - evicted) / self.period
+            self._squares += (value - evicted) * (value - self._mean + evicted - previous)
+        else:
+            self._mean += (value - previous) / len(self._buffer)
+            self._squares += (value - previous) * (value - self._mean)
+        self._updates += 1
+        if self._updates % self.period == 0:
+            stored = self._buffer.values()
+            self._mean = float(stored.mean())
+            deviations = stored - self._mean
+            self._squares = float(deviations @ deviations)
+        if not self.ready:
+            self.mean = self.value = NAN
+            return NAN
+        self.mean = self._mean
+        self.value = math.sqrt(max(self._squares, 0.0) / (self.period - self.ddof))
+        return self.value
+
+
+class ZScore:
+    """Distance of the latest value from its rolling mean, in rolling standard deviations."""
+
+    def __init__(self, period: int, ddof: int = 0) -> None:
+        self._stats = RollingStd(period, ddof)
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return self._stats.ready
+
+    def update(self, value: float) -> float:
+        std = self._stats.update(value)
+        self.value = (value - self._stats.mean) / std if std > 0 else NAN
+        return self.value
+
+
+class BollingerBands:
+    """Rolling mean with bands ``num_std`` standard deviations above and below."""
+
+    def __init__(self, period: int = 20, num_std: float = 2.0) -> None:
+        self.num_std = num_std
+        self._stats = RollingStd(period)
+        self.middle = self.upper = self.lower = NAN
+
+    @property
+    def ready(self) -> bool:
+        return self._stats.ready
+
+    def update(self, value: float) -> tuple[float, float, float]:
+        """Returns (middle, upper, lower)."""
+        std = self._stats.update(value)
+        self.middle = self._stats.mean
+        self.upper = self.middle + self.num_std * std
+        self.lower = self.middle - self.num_std * std
+        return self.middle, self.upper, self.lower
+
+
+class RSI:
+    """Relative strength index with Wilder smoothing (``alpha = 1 / period``)."""
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.alpha = 1.0 / period
+        self._previous: float | None = None
+        self._gain = self._loss = 0.0
+        self._changes = 0
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return self._changes >= self.period
+
+    def update(self, value: float) -> float:
+        if self._previous is None:
+            self._previous = value
+            return NAN
+        change = value - self._previous
+        self._previous = value
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        if self._changes == 0:
+            self._gain, self._loss = gain, loss
+        else:
+            self._gain += self.alpha * (gain - self._gain)
+            self._loss += self.alpha * (loss - self._loss)
+        self._changes += 1
+        if not self.ready:
+            return NAN
+        self.value = 100.0 if self._loss == 0 else 100.0 - 100.0 / (1.0 + self._gain / self._loss)
+        return self.value
+
+
+class ATR:
+    """Average true range of high/low/close bars with Wilder smoothing."""
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.alpha = 1.0 / period
+        self._previous_close: float | None = None
+        self._average = 0.0
+        self._count = 0
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= self.period
+
+    def update(self, high: float, low: float, close: float) -> float:
+        true_range = high - low
+        if self._previous_close is not None:
+            true_range = max(true_range, abs(high - self._previous_close), abs(low - self._previous_close))
+        self._previous_close = close
+        self._average = true_range if self._count == 0 else self._average + self.alpha * (true_range - self._average)
+        self._count += 1
+        self.value = self._average if self.ready else NAN
+        return self.value
+
+
+class VWAP:
+    """Cumulative volume-weighted average price; call ``reset`` at each session start."""
+
+    def __init__(self) -> None:
+        self._value_traded = 0.0
+        self._volume = 0.0
+        self.value = NAN
+
+    def reset(self) -> None:
+        self._value_traded = self._volume = 0.0
+        self.value = NAN
+
+    def update(self, price: float, volume: float) -> float:
+        self._value_traded += price * volume
+        self._volume += volume
+        self.value = self._value_traded / self._volume if self._volume > 0 else NAN
+        return self.value
+
+
+# Streaming indicator factories by the names used in leg entry conditions
+# (see core.backtesting.conditions.ConditionInterpreter).
+STREAMING_INDICATORS: dict[str, Callable[[int], Any]] = {
+    "sma": SMA,
+    "ema": EMA,
+    "std": RollingStd,
+    "zscore": ZScore,
+    "rsi": RSI,
+}
+
+
+def _frame_column(frame: pl.DataFrame, name: str) -> np.ndarray:
+    if name == "close" and name not in frame.columns:
+        name = "price"
+    return frame[name].cast(pl.Float64).to_numpy()
+
+
+def precompute(
+    frame: pl.DataFrame,
+    indicator: str,
+    *,
+    symbol: str,
+    cache: "IndicatorCache | None" = None,
+    timeframe: str = "tick",
+    data_version: str | None = None,
+    **params: Any,
+) -> np.ndarray:
+    """Batch ``indicator`` over ``frame``, read from or stored in ``cache`` when one is given.
+
+    Without an explicit ``data_version`` the input columns are fingerprinted,
+    so a cached column is never served for different data.
+    """
+    if indicator not in BATCH_INDICATORS:
+        raise ValueError(f"Unknown indicator: {indicator}")
+    function, names = BATCH_INDICATORS[indicator]
+    columns = [_frame_column(frame, name) for name in names]
+
+    def compute() -> np.ndarray:
+        return function(*columns, **params)
+
+    if cache is None:
+        return compute()
+    version = data_version if data_version is not None else columns_fingerprint(*columns)
+    return cache.get_or_compute(symbol, timeframe, indicator, params, version, compute)
@@ -0,0 +1,61 @@
+"""Time ``performance_metrics`` and the rolling series on a long synthetic equity curve.
+
+The curve is a random walk sampled once a second across NSE sessions, with a
+position open roughly half of the time. Each measurement is the best of
+several repeats.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_analytics --points 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+import numpy as np
+
+from backend.core.analytics import performance_metrics, period_returns, rolling_drawdown, rolling_sharpe
+
+
+def build_curve(points: int, seed: int = 7) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    session_seconds = 22_500
+    day = np.arange(points) // session_seconds
+    timestamps_ns = (day * 86_400 + 33_300 + np.arange(points) % session_seconds) * 1_000_000_000
+    equity = 1_000_000.0 * np.exp(np.cumsum(rng.normal(0.0, 2e-5, points)))
+    position_value = np.where((np.arange(points) // 3_600) % 2 == 0, equity * 0.5, 0.0)
+    return timestamps_ns.astype(np.int64), equity, position_value
+
+
+def best_of(function: Callable[[], object], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=10_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    timestamps_ns, equity, position_value = build_curve(args.points)
+    returns = period_returns(timestamps_ns, equity)
+
+    metrics = best_of(lambda: performance_metrics(timestamps_ns, equity, position_value), args.repeats)
+    sharpe = best_of(lambda: rolling_sharpe(returns, 20), args.repeats)
+    drawdown = best_of(lambda: rolling_drawdown(equity, 22_500), args.repeats)
+    print(f"points:           {args.points}")
+    print(f"metrics:          {metrics * 1e3:.1f} ms")
+    print(f"rolling sharpe:   {sharpe * 1e3:.1f} ms ({len(returns.returns)} daily returns)")
+    print(f"rolling drawdown: {drawdown * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
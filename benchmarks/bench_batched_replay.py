@@ -0,0 +1,84 @@
+"""Cost per tick of replaying history as event objects versus array batches.
+
+Both sides replay the same symbols in global timestamp order and touch every
+tick's symbol, time and price. The event side builds a ``MarketDataEvent``
+and a ``datetime`` per tick; the batched side reads plain values out of the
+structured arrays the backtest loop consumes.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_batched_replay --symbols 20 --ticks 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+import numpy as np
+import polars as pl
+
+from backend.core.backtesting.merge import merge_histories
+from backend.core.data.batches import replay_batches
+from backend.core.data.frames import FrameMarketData
+
+START = datetime(2024, 1, 1, 9, 15)
+END = datetime(2024, 1, 2)
+
+
+def build_provider(symbols: list[str], ticks: int, seed: int = 5) -> FrameMarketData:
+    rng = np.random.default_rng(seed)
+    timestamps = pl.datetime_range(START, START + timedelta(seconds=ticks - 1), "1s", eager=True)
+    return FrameMarketData(
+        {
+            symbol: pl.DataFrame({"timestamp": timestamps, "price": 100.0 + np.cumsum(rng.normal(0, 0.5, ticks))})
+            for symbol in symbols
+        }
+    )
+
+
+def replay_events(provider: FrameMarketData, symbols: list[str]) -> float:
+    total = 0.0
+    for event in merge_histories(provider, symbols, START, END):
+        if event.symbol and event.timestamp:
+            total += event.price
+    return total
+
+
+def replay_arrays(provider: FrameMarketData, symbols: list[str]) -> float:
+    total = 0.0
+    for batch in replay_batches(provider, symbols, START, END):
+        names = batch.symbols
+        symbol_ids = batch.symbol_ids.tolist()
+        prices = batch.prices.tolist()
+        for row, timestamp_ns in enumerate(batch.timestamps_ns.tolist()):
+            if names[symbol_ids[row]] and timestamp_ns:
+                total += prices[row]
+    return total
+
+
+def measure(replay: Callable[[FrameMarketData, list[str]], float], provider, symbols) -> float:
+    started = time.perf_counter()
+    replay(provider, symbols)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--ticks", type=int, default=50_000, help="ticks per symbol")
+    args = parser.parse_args()
+
+    symbols = [f"SYM{index:03d}" for index in range(args.symbols)]
+    provider = build_provider(symbols, args.ticks)
+    events = len(symbols) * args.ticks
+    print(f"{'replay':>8} {'events':>10} {'seconds':>9} {'us/event':>9}")
+    for name, replay in (("events", replay_events), ("batches", replay_arrays)):
+        elapsed = measure(replay, provider, symbols)
+        print(f"{name:>8} {events:>10} {elapsed:>9.3f} {elapsed / events * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
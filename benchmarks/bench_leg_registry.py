@@ -0,0 +1,76 @@
+"""Per-event cost of leg handling as the number of configured legs grows.
+
+Each symbol carries one BUY and one SELL leg, so ``legs`` legs spread over
+``legs / 2`` symbols with a fixed number of ticks per symbol. With indexed
+leg lookups the cost per event stays flat as legs are added.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_leg_registry --ticks 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+
+from backend.core.backtesting.runner import BacktestConfig, BacktestRunner
+from backend.core.data.frames import FrameMarketData
+
+LEG_COUNTS = (2, 10, 50, 100, 250, 500)
+
+
+def build_provider(symbols: list[str], ticks: int, seed: int = 11) -> FrameMarketData:
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1, 9, 15)
+    timestamps = pl.datetime_range(start, start + timedelta(seconds=ticks - 1), "1s", eager=True)
+    frames = {
+        symbol: pl.DataFrame(
+            {"timestamp": timestamps, "price": 100.0 + np.cumsum(rng.normal(0, 0.5, ticks))}
+        )
+        for symbol in symbols
+    }
+    return FrameMarketData(frames)
+
+
+def build_legs(symbols: list[str]) -> list[dict]:
+    legs: list[dict] = []
+    for symbol in symbols:
+        legs.append({"symbol": symbol, "side": "BUY", "quantity": 1, "exit_target": 2.0, "exit_stop_loss": 2.0})
+        legs.append({"symbol": symbol, "side": "SELL", "quantity": 1, "trailing_stop_points": 1.5})
+    return legs
+
+
+def run(leg_count: int, ticks: int) -> tuple[int, float]:
+    symbols = [f"SYM{index:03d}" for index in range((leg_count + 1) // 2)]
+    provider = build_provider(symbols, ticks)
+    config = BacktestConfig(
+        strategy_id="bench",
+        symbols=symbols,
+        start=datetime(2024, 1, 1),
+        end=datetime(2024, 1, 2),
+        legs=build_legs(symbols)[:leg_count],
+    )
+    started = time.perf_counter()
+    BacktestRunner(provider).run(config)
+    return len(symbols) * ticks, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=2_000, help="ticks per symbol")
+    parser.add_argument("--legs", type=int, nargs="*", default=list(LEG_COUNTS))
+    args = parser.parse_args()
+
+    print(f"{'legs':>6} {'events':>10} {'seconds':>9} {'us/event':>9}")
+    for leg_count in args.legs:
+        events, elapsed = run(leg_count, args.ticks)
+        print(f"{leg_count:>6} {events:>10} {elapsed:>9.3f} {elapsed / events * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
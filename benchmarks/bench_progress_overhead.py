@@ -0,0 +1,66 @@
+"""Wall-clock overhead of progress reporting on ``BacktestRunner.run``.
+
+Runs the same event-mode backtest without a progress callback and with the
+job service's default throttling (every 10,000 events, at most four times a
+second), taking the best of several repeats of each.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_progress_overhead --ticks 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime
+
+from backend.core.backtesting.runner import BacktestConfig, BacktestProgress, BacktestRunner
+
+from .bench_leg_registry import build_legs, build_provider
+
+
+def best_of(runner: BacktestRunner, config: BacktestConfig, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        runner.run(config)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=200_000, help="ticks per symbol")
+    parser.add_argument("--symbols", type=int, default=2)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{index:03d}" for index in range(args.symbols)]
+    runner = BacktestRunner(build_provider(symbols, args.ticks))
+    updates: list[BacktestProgress] = []
+
+    def config(**progress) -> BacktestConfig:
+        return BacktestConfig(
+            strategy_id="bench",
+            symbols=symbols,
+            start=datetime(2024, 1, 1),
+            end=datetime(2024, 1, 31),
+            legs=build_legs(symbols),
+            **progress,
+        )
+
+    baseline = best_of(runner, config(), args.repeats)
+    reported = best_of(
+        runner,
+        config(progress_callback=updates.append, progress_interval=10_000, progress_min_seconds=0.25),
+        args.repeats,
+    )
+    print(f"events:      {len(symbols) * args.ticks}")
+    print(f"no progress: {baseline:.3f}s")
+    print(f"progress:    {reported:.3f}s ({len(updates) // args.repeats} updates per run)")
+    print(f"overhead:    {(reported / baseline - 1) * 100:+.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Throughput and peak memory of the backtest runner on synthetic history.
+
+Streams ``symbols`` x ``days`` sessions of synthetic ticks through
+``BacktestRunner`` with one leg per symbol, recording equity per minute so
+the curve stays small. History is generated a session at a time and
+dropped after each batch, so peak RSS levels off after the first few
+sessions instead of growing with ``days``.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_synthetic_scale --symbols 100 --days 5
+    python -m benchmarks.bench_synthetic_scale --symbols 100 --days 45   # about 100M events
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import time
+from datetime import datetime, timedelta
+
+from backend.core.backtesting.equity import EquitySampling
+from backend.core.backtesting.runner import BacktestConfig, BacktestProgress, BacktestRunner
+from backend.core.data.calendar import NSE_CALENDAR
+from backend.core.data.synthetic import SyntheticMarketData
+
+START = datetime(2024, 1, 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--days", type=int, default=5, help="trading sessions to replay")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between ticks")
+    args = parser.parse_args()
+
+    symbols = [f"SYM{index:03d}" for index in range(args.symbols)]
+    sessions = NSE_CALENDAR.sessions(START, START + timedelta(days=args.days * 2 + 7))[: args.days]
+    provider = SyntheticMarketData(seed=1, interval=timedelta(seconds=args.interval))
+    progress: list[BacktestProgress] = []
+    config = BacktestConfig(
+        strategy_id="bench",
+        symbols=symbols,
+        start=START,
+        end=sessions[-1][1],
+        legs=[{"symbol": symbol, "side": "BUY", "quantity": 1, "trailing_stop_points": 1.0} for symbol in symbols],
+        equity_sampling=EquitySampling.BAR,
+        progress_callback=progress.append,
+        progress_interval=10**12,  # only the final report
+    )
+
+    started = time.perf_counter()
+    result = BacktestRunner(provider).run(config)
+    elapsed = time.perf_counter() - started
+    events = progress[-1].events_processed
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # kilobytes on Linux
+    print(f"{'events':>12} {'seconds':>9} {'us/event':>9} {'trades':>7} {'peak MB':>8}")
+    print(f"{events:>12} {elapsed:>9.1f} {elapsed / events * 1e6:>9.2f} {len(result.trades):>7} {peak_mb:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Per-tick cost of filling parked LIMIT/STOP orders with a trigger book versus a scan.
+
+``orders`` resting orders are spread over ``symbols`` symbols at prices
+around the market, and ``ticks`` random-walk ticks are replayed through
+``SimulationEngine.process_tick``. The scan baseline is the previous
+implementation: one pass over every parked order per tick, skipping other
+symbols by string comparison. The trigger book only touches the orders a
+tick fills, so its cost does not grow with the number of resting orders.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_trigger_book --orders 100000 --ticks 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from backend.core.execution.engine import SimulationEngine
+from backend.core.execution.models import OrderSide, OrderType, SimulationOrder, SimulationResult
+from backend.core.portfolio.account import AccountState, PortfolioManager
+
+START = datetime(2024, 1, 1, 9, 15)
+
+
+class ScanEngine(SimulationEngine):
+    """The engine with the linear scan over every pending order it used before the trigger book."""
+
+    def process_tick(self, symbol: str, price: float, timestamp: datetime) -> list[SimulationResult]:
+        results: list[SimulationResult] = []
+        for order_id, order in list(self.pending_orders.items()):
+            if order.symbol != symbol:
+                continue
+            fill_price = self._determine_fill_price(order, price)
+            if fill_price is None:
+                continue
+            results.append(self._fill_pending(order, fill_price, timestamp, len(results) + 1))
+            del self.pending_orders[order_id]
+        return results
+
+
+def build_orders(orders: int, symbols: int, seed: int = 2) -> list[SimulationOrder]:
+    rng = np.random.default_rng(seed)
+    sides = [OrderSide.BUY if draw < 0.5 else OrderSide.SELL for draw in rng.random(orders)]
+    types = [OrderType.LIMIT if draw < 0.5 else OrderType.STOP for draw in rng.random(orders)]
+    offsets = rng.uniform(0.5, 30.0, orders)
+    built = []
+    for index in range(orders):
+        below = (sides[index] == OrderSide.BUY) == (types[index] == OrderType.LIMIT)
+        price = float(100.0 - offsets[index] if below else 100.0 + offsets[index])
+        built.append(SimulationOrder(f"o{index}", f"SYM{index % symbols:03d}", sides[index], types[index], 1, price))
+    return built
+
+
+def run(engine_type: type[SimulationEngine], orders: list[SimulationOrder], ticks, symbols: int) -> tuple[float, int]:
+    engine = engine_type(PortfolioManager(AccountState(cash_balance=1e12)))
+    for order in orders:
+        engine.submit_order(order, market_price=100.0)
+    names = [f"SYM{index:03d}" for index in range(symbols)]
+    fills = 0
+    started = time.perf_counter()
+    for symbol_id, price in ticks:
+        fills += len(engine.process_tick(names[symbol_id], price, START))
+    return time.perf_counter() - started, fills
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=1_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    symbol_ids = rng.integers(args.symbols, size=args.ticks)
+    walks = 100.0 + np.cumsum(rng.normal(0, 0.5, (args.symbols, args.ticks)), axis=1)
+    ticks = [(int(symbol_id), float(walks[symbol_id, tick])) for tick, symbol_id in enumerate(symbol_ids)]
+    orders = build_orders(args.orders, args.symbols)
+
+    print(f"{'engine':>8} {'orders':>8} {'ticks':>8} {'fills':>7} {'seconds':>9} {'us/tick':>9}")
+    for name, engine_type in (("scan", ScanEngine), ("book", SimulationEngine)):
+        elapsed, fills = run(engine_type, orders, ticks, args.symbols)
+        print(f"{name:>8} {args.orders:>8} {args.ticks:>8} {fills:>7} {elapsed:>9.3f} {elapsed / args.ticks * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+
+from backend.app.schemas.backtests import BacktestRequest
+from backend.app.services.backtesting import BacktestingService
+from backend.core.analytics import (
+    drawdown_series,
+    exposure,
+    performance_metrics,
+    period_returns,
+    rolling_drawdown,
+    rolling_sharpe,
+    round_trips,
+    trade_breakdown,
+    trade_stats,
+)
+from backend.core.backtesting.runner import BacktestRunner
+from backend.core.data import MarketDataEvent
+from backend.core.execution.ledger import LEDGER_SCHEMA
+
+START = datetime(2024, 1, 1, 9, 15)
+DAY_NS = 86_400 * 1_000_000_000
+
+
+def _ledger(rows: list[tuple[str | None, str, str, int, float]]) -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "order_id": [f"O{i}" for i in range(len(rows))],
+            "leg_id": [row[0] for row in rows],
+            "symbol": [row[1] for row in rows],
+            "side": [row[2] for row in rows],
+            "quantity": [row[3] for row in rows],
+            "price": [row[4] for row in rows],
+            "timestamp": [START + timedelta(minutes=i) for i in range(len(rows))],
+            "reason": [None] * len(rows),
+        },
+        schema=LEDGER_SCHEMA,
+    )
+
+
+def test_round_trips_split_reversing_fills():
+    ledger = _ledger(
+        [
+            (None, "AAA", "BUY", 2, 10.0),
+            (None, "AAA", "BUY", 2, 12.0),
+            (None, "BBB", "SELL", 1, 50.0),
+            (None, "AAA", "SELL", 6, 13.0),  # closes the long at 13 and opens a short of 2
+            (None, "AAA", "BUY", 1, 9.0),
+            (None, "BBB", "BUY", 1, 53.0),
+            (None, "AAA", "BUY", 1, 5.0),
+            (None, "AAA", "BUY", 3, 6.0),  # left open
+        ]
+    )
+    trips = round_trips(ledger)
+
+    assert trips.select("symbol", "side", "quantity", "entry_price", "exit_price", "pnl").rows() == [
+        ("AAA", "BUY", 4.0, 11.0, 13.0, 8.0),
+        ("BBB", "SELL", 1.0, 50.0, 53.0, -3.0),
+        ("AAA", "SELL", 2.0, 13.0, 7.0, 12.0),
+        ("AAA", "BUY", 3.0, 6.0, None, None),
+    ]
+    assert trips["holding_seconds"].to_list() == [180.0, 180.0, 180.0, None]
+
+    stats = trade_stats(trips)
+    assert (stats.closed_trades, stats.winning_trades, stats.losing_trades) == (3, 2, 1)
+    assert stats.win_rate == pytest.approx(2 / 3)
+    assert stats.profit_factor == pytest.approx(20.0 / 3.0)
+    assert stats.realized_pnl == pytest.approx(17.0)
+    assert stats.expectancy == pytest.approx(17.0 / 3)
+
+    by_symbol = {row["symbol"]: row for row in trade_breakdown(trips).iter_rows(named=True)}
+    assert by_symbol["AAA"]["closed_trades"] == 2 and by_symbol["AAA"]["profit_factor"] is None
+    assert by_symbol["BBB"]["realized_pnl"] == pytest.approx(-3.0)
+
+
+def test_legs_are_booked_separately_from_the_symbol():
+    ledger = _ledger(
+        [
+            ("AAA-BUY", "AAA", "BUY", 1, 100.0),
+            ("AAA-SELL", "AAA", "SELL", 1, 100.0),
+            ("AAA-BUY", "AAA", "SELL", 1, 104.0),
+            ("AAA-SELL", "AAA", "BUY", 1, 101.0),
+        ]
+    )
+    per_leg = trade_breakdown(round_trips(ledger), by="leg_id")
+
+    assert dict(per_leg.select("leg_id", "realized_pnl").rows()) == {"AAA-BUY": 4.0, "AAA-SELL": -1.0}
+
+
+def test_equity_metrics_match_direct_formulas():
+    rng = np.random.default_rng(5)
+    days = 400
+    timestamps = np.arange(days, dtype=np.int64) * DAY_NS
+    equity = 100_000.0 * np.cumprod(1.0 + rng.normal(0.0005, 0.01, days))
+    position_value = np.where(np.arange(days) % 4 == 0, 0.0, equity)
+
+    metrics = performance_metrics(timestamps, equity, position_value, initial_equity=100_000.0)
+
+    returns = np.diff(np.concatenate(([100_000.0], equity))) / np.concatenate(([100_000.0], equity[:-1]))
+    assert metrics.total_return == pytest.approx(equity[-1] / 100_000.0 - 1)
+    assert metrics.sharpe_ratio == pytest.approx(returns.mean() / returns.std(ddof=1) * np.sqrt(252))
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+    assert metrics.sortino_ratio == pytest.approx(returns.mean() / downside * np.sqrt(252))
+    drawdowns = equity / np.maximum.accumulate(equity) - 1
+    assert metrics.max_drawdown == pytest.approx(drawdowns.min())
+    assert metrics.calmar_ratio == pytest.approx(metrics.annualized_return / -drawdowns.min())
+    assert metrics.exposure == pytest.approx(0.75, abs=0.01)
+    np.testing.assert_allclose(drawdown_series(equity), drawdowns, atol=1e-12)
+
+
+def test_intraday_curves_use_minute_returns_and_underwater_time():
+    seconds = np.arange(0, 3_600, 10)
+    timestamps = seconds * 1_000_000_000
+    equity = np.full(len(seconds), 100.0)
+    equity[60:120] = 95.0  # ten minutes under water, recovered at 20:00
+    series = period_returns(timestamps, equity)
+
+    assert series.interval_seconds == 60 and len(series.returns) == 60
+    metrics = performance_metrics(timestamps, equity)
+    assert metrics.max_drawdown == pytest.approx(-0.05)
+    assert metrics.max_drawdown_seconds == pytest.approx(600.0)
+    assert exposure(timestamps, np.zeros(len(seconds))) == 0.0
+
+
+def test_rolling_series_match_naive_windows():
+    rng = np.random.default_rng(9)
+    equity = 100.0 + np.cumsum(rng.normal(0, 1, 500))
+    window = 25
+    naive = np.array([equity[i] / equity[max(0, i - window + 1) : i + 1].max() - 1 for i in range(len(equity))])
+    np.testing.assert_allclose(rolling_drawdown(equity, window), naive)
+
+    series = period_returns(np.arange(500, dtype=np.int64) * DAY_NS, equity)
+    sharpe = rolling_sharpe(series, window)
+    last = series.returns[-window:]
+    assert np.isnan(sharpe[: window - 1]).all()
+    assert sharpe[-1] == pytest.approx(last.mean() / last.std(ddof=1) * np.sqrt(252))
+
+
+class _Provider:
+    def historical(self, symbol, start, end):
+        prices = 100.0 + np.cumsum(np.random.default_rng(len(symbol)).normal(0, 0.5, 600))
+        for i, price in enumerate(prices):
+            yield MarketDataEvent(symbol=symbol, timestamp=START + timedelta(seconds=30 * i), price=float(price))
+
+
+def test_backtest_response_carries_trade_and_risk_metrics():
+    request = BacktestRequest(
+        strategy_id="analytics",
+        symbols=["AAA", "BB"],
+        start=START,
+        end=START + timedelta(days=1),
+        legs=[
+            {"symbol": "AAA", "side": "BUY", "quantity": 2, "exit_target": 1.0, "exit_stop_loss": 1.0},
+            {"symbol": "BB", "side": "SELL", "quantity": 1, "exit_target": 1.5, "exit_stop_loss": 0.5},
+        ],
+    )
+    response = BacktestingService(BacktestRunner(_Provider())).run_backtest(request)
+    metrics = response.metrics
+
+    assert metrics.closed_trades == metrics.winning_trades + metrics.losing_trades > 0
+    assert metrics.win_rate == pytest.approx(metrics.winning_trades / metrics.closed_trades)
+    assert 0.0 < metrics.exposure <= 1.0
+    assert metrics.max_drawdown <= 0.0
+    assert {row.key for row in response.symbol_breakdown} == {"AAA", "BB"}
+    assert {row.key for row in response.leg_breakdown} == {"AAA-BUY", "BB-SELL"}
+    assert sum(row.realized_pnl for row in response.symbol_breakdown) == pytest.approx(metrics.realized_pnl)
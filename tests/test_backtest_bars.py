@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+import numpy as np
+import polars as pl
+import pytest
+
+from backend.core.backtesting.runner import BacktestConfig, BacktestRunner, LegState
+from backend.core.data import MarketDataEvent
+from backend.core.data.bars import Bar, IntrabarPath, Timeframe, iter_bars
+from backend.core.data.frames import FrameMarketData
+from backend.strategies import MeanReversionStrategy, StrategyContext
+
+DAY = datetime(2024, 1, 2)
+
+
+def _ticks(symbol, start, prices, step=timedelta(seconds=1)):
+    return [MarketDataEvent(symbol=symbol, timestamp=start + i * step, price=p) for i, p in enumerate(prices)]
+
+
+def test_bars_align_to_the_nse_session():
+    ticks = _ticks("AAA", DAY.replace(hour=9, minute=14, second=58), [100.0, 101.0, 102.0, 99.0, 104.0, 103.0])
+    ticks[-2].timestamp = DAY.replace(hour=9, minute=20)
+    ticks[-1].timestamp = DAY.replace(hour=15, minute=30)
+    bars = list(iter_bars(ticks, Timeframe.M5))
+
+    # The two pre-open ticks are dropped; the 15:30 tick belongs to the session's last bar.
+    assert [(bar.start.time().isoformat(), bar.end.time().isoformat()) for bar in bars] == [
+        ("09:15:00", "09:20:00"),
+        ("09:20:00", "09:25:00"),
+        ("15:25:00", "15:30:00"),
+    ]
+    assert (bars[0].open, bars[0].high, bars[0].low, bars[0].close, bars[0].ticks) == (102.0, 102.0, 99.0, 99.0, 2)
+
+    daily = list(iter_bars(ticks, Timeframe.D1))
+    assert len(daily) == 1 and daily[0].close == 103.0 and daily[0].ticks == 4
+
+    utc_tick = MarketDataEvent(symbol="AAA", timestamp=datetime(2024, 1, 2, 4, 0, tzinfo=timezone.utc), price=1.0)
+    (bar,) = iter_bars([utc_tick], Timeframe.M15)
+    assert bar.start.isoformat() == "2024-01-02T09:30:00+05:30"
+
+
+@pytest.mark.parametrize(
+    ("path", "side", "expected"),
+    [
+        (IntrabarPath.OHLC, "BUY", ("TARGET", 103.0)),
+        (IntrabarPath.OLHC, "BUY", ("STOP_LOSS", 98.0)),
+        (IntrabarPath.PESSIMISTIC, "BUY", ("STOP_LOSS", 98.0)),
+        (IntrabarPath.PESSIMISTIC, "SELL", ("STOP_LOSS", 102.0)),
+        (IntrabarPath.NEAREST, "BUY", ("STOP_LOSS", 98.0)),
+    ],
+)
+def test_intrabar_path_decides_which_level_is_touched_first(path, side, expected):
+    bar = Bar("AAA", DAY, DAY + timedelta(minutes=1), open=100.0, high=104.0, low=97.0, close=100.5)
+    leg = LegState(symbol="AAA", side=side, quantity=1, entry_price=100.0, entry_time=DAY, exit_target=3.0, exit_stop_loss=2.0)
+
+    should_exit, reason, price = leg.should_exit_on_path(bar.path(path, side), bar.end)
+    assert should_exit and (reason, price) == expected
+
+
+def test_trailing_stop_uses_the_high_reached_inside_the_bar():
+    bar = Bar("AAA", DAY, DAY + timedelta(minutes=1), open=100.0, high=106.0, low=101.0, close=102.0)
+    leg = LegState(symbol="AAA", side="BUY", quantity=1, entry_price=100.0, entry_time=DAY, trailing_stop_points=3.0)
+
+    assert leg.should_exit_on_path(bar.path(IntrabarPath.OHLC), bar.end) == (True, "TRAILING_STOP", 103.0)
+
+
+def _provider(seconds=3 * 3600, seed=4):
+    start = DAY.replace(hour=9, minute=15)
+    prices = 100.0 + np.cumsum(np.random.default_rng(seed).normal(0, 0.05, seconds))
+    frame = pl.DataFrame({"timestamp": [start + timedelta(seconds=i) for i in range(seconds)], "price": prices})
+    return FrameMarketData({"AAA": frame})
+
+
+def test_bar_replay_keeps_stop_and_target_fidelity():
+    provider = _provider()
+    legs = [{"symbol": "AAA", "side": "BUY", "quantity": 1, "exit_target": 1.5, "exit_stop_loss": 1.5}]
+    config = partial(BacktestConfig, "bars", ["AAA"], DAY, DAY + timedelta(days=1), legs=legs)
+
+    ticks = BacktestRunner(provider).run(config())
+    bars = BacktestRunner(provider).run(config(bar_timeframe=Timeframe.M1))
+
+    tick_exit = next(trade for trade in ticks.trades if trade.order.order_id.endswith("EXIT"))
+    bar_exit = next(trade for trade in bars.trades if trade.order.order_id.endswith("EXIT"))
+    assert bar_exit.order.metadata["exit_reason"] == tick_exit.order.metadata["exit_reason"]
+    assert bar_exit.order.timestamp - timedelta(minutes=1) <= tick_exit.order.timestamp < bar_exit.order.timestamp
+    assert bar_exit.fills[0].fill_price == pytest.approx(tick_exit.fills[0].fill_price, abs=0.2)
+    assert len(bars.equity_curve) * 60 == len(ticks.equity_curve)
+
+
+def test_on_bar_hook_submits_strategy_orders():
+    strategy = MeanReversionStrategy(lookback=5, qty=2)
+    context = StrategyContext(strategy_id="mr", symbols=["AAA"])
+    strategy.on_init(context)
+    config = BacktestConfig(
+        "mr",
+        ["AAA"],
+        DAY,
+        DAY + timedelta(days=1),
+        bar_timeframe=Timeframe.M5,
+        on_bar=partial(strategy.on_bar, context),
+    )
+
+    result = BacktestRunner(_provider()).run(config)
+    assert result.trades and all(trade.order.order_id.startswith("MR-mr-") for trade in result.trades)
+    assert {trade.order.quantity for trade in result.trades} == {2}
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+from backend.app.schemas.backtests import BacktestRequest, ExecutionMode
+from backend.app.services.backtesting import BacktestingService
+from backend.app.services.result_cache import BacktestResultCache
+from backend.core.backtesting.runner import BacktestRunner
+from backend.core.data import MarketDataEvent
+
+
+class ListProvider:
+    def __init__(self, drift: float = 0.25) -> None:
+        self.drift = drift
+        self.calls = 0
+
+    def historical(self, symbol, start, end):
+        self.calls += 1
+        base = datetime(2024, 1, 1, 9, 15)
+        for i in range(300):
+            price = 100.0 + ((i * 7) % 13) * self.drift
+            yield MarketDataEvent(symbol=symbol, timestamp=base + timedelta(minutes=i), price=price)
+
+
+def _request(**overrides) -> BacktestRequest:
+    payload = {
+        "strategy_id": "cache",
+        "symbols": ["AAA"],
+        "start": datetime(2024, 1, 1),
+        "end": datetime(2024, 1, 2),
+        "legs": [{"symbol": "AAA", "side": "BUY", "quantity": 2, "exit_target": 1.0, "exit_stop_loss": 0.5}],
+    }
+    payload.update(overrides)
+    return BacktestRequest(**payload)
+
+
+def test_identical_request_is_served_from_cache(tmp_path):
+    service = BacktestingService(BacktestRunner(ListProvider()), BacktestResultCache(tmp_path, max_bytes=10_000_000))
+
+    first = service.run_with_artifacts(_request())
+    second = service.run_with_artifacts(_request())
+
+    assert second.response == first.response
+    assert second.equity_curve.equals(first.equity_curve)
+    assert second.trades.equals(first.trades)
+    stats = service.cache_stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    # Each execution mode keeps its own entry.
+    service.run_with_artifacts(_request(execution_mode=ExecutionMode.VECTORIZED))
+    stats = service.cache_stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
+
+
+def test_changed_market_data_or_request_misses(tmp_path):
+    cache = BacktestResultCache(tmp_path, max_bytes=10_000_000)
+    BacktestingService(BacktestRunner(ListProvider(drift=0.25)), cache).run_backtest(_request())
+    BacktestingService(BacktestRunner(ListProvider(drift=0.30)), cache).run_backtest(_request())
+    BacktestingService(BacktestRunner(ListProvider(drift=0.25)), cache).run_backtest(_request(initial_capital=5_00_000.0))
+
+    assert cache.stats().misses == 3
+    assert cache.stats().entries == 3
+
+
+def test_cache_evicts_least_recently_used_and_survives_restart(tmp_path):
+    service = BacktestingService(BacktestRunner(ListProvider()), BacktestResultCache(tmp_path, max_bytes=10_000_000))
+    service.run_backtest(_request())
+    entry_size = service.cache_stats().size_bytes
+
+    cache = BacktestResultCache(tmp_path, max_bytes=int(entry_size * 2.5))
+    service = BacktestingService(BacktestRunner(ListProvider()), cache)
+    assert cache.stats().entries == 1
+    service.run_backtest(_request(initial_capital=2_00_000.0))
+    service.run_backtest(_request())  # touch the oldest entry
+    service.run_backtest(_request(initial_capital=3_00_000.0))
+
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.entries == 2
+    assert stats.size_bytes <= stats.max_bytes
+    service.run_backtest(_request())
+    assert cache.stats().hits == 2
+
+
+def test_entries_written_by_one_instance_are_visible_to_another(tmp_path):
+    writer = BacktestResultCache(tmp_path, max_bytes=10_000_000)
+    reader = BacktestResultCache(tmp_path, max_bytes=10_000_000)
+    first = BacktestingService(BacktestRunner(ListProvider()), writer).run_backtest(_request())
+
+    provider = ListProvider()
+    second = BacktestingService(BacktestRunner(provider), reader).run_backtest(_request())
+    assert second == first
+    assert provider.calls == 1  # fingerprinting only; the run itself came from the writer's entry
+    assert reader.stats().hits == 1
+    assert reader.stats().size_bytes == writer.stats().size_bytes > 0
+
+    # A third process with a tighter budget evicts the shared entry for everyone.
+    BacktestingService(BacktestRunner(ListProvider()), BacktestResultCache(tmp_path, max_bytes=1)).run_backtest(
+        _request(initial_capital=2_00_000.0)
+    )
+    assert writer.stats().entries == reader.stats().entries == 1
+    assert reader.find(first.backtest_id) is None
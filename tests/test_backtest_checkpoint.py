@@ -0,0 +1,125 @@
+import pickle
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backend.core.backtesting.checkpoint import BacktestCheckpoint, CheckpointError
+from backend.core.backtesting.equity import EquitySampling
+from backend.core.backtesting.runner import BacktestCancelled, BacktestConfig, BacktestRunner
+from backend.core.data import MarketDataEvent
+from backend.core.data.bars import Timeframe
+from backend.core.execution.models import OrderSide, OrderType, SimulationOrder
+
+START = datetime(2024, 1, 1, 9, 15)
+
+
+class _Provider:
+    def __init__(self, spacing: int = 20) -> None:
+        self.spacing = spacing
+
+    def historical(self, symbol, start, end):
+        rng = np.random.default_rng(len(symbol))
+        prices = 100.0 + np.cumsum(rng.normal(0.0, 0.4, 900))
+        for i, price in enumerate(prices):
+            yield MarketDataEvent(symbol=symbol, timestamp=START + timedelta(seconds=self.spacing * i + len(symbol)), price=float(price))
+
+
+def _limit_orders(bar):
+    # Parks a resting buy below every tenth bar, so checkpoints carry pending orders.
+    if bar.start.minute % 10:
+        return []
+    order_id = f"{bar.symbol}-{bar.start:%H%M}"
+    return [SimulationOrder(order_id, bar.symbol, OrderSide.BUY, OrderType.LIMIT, 1, price=bar.low - 0.2, timestamp=bar.end)]
+
+
+def _config(checkpoint=None, bars=False, **overrides) -> BacktestConfig:
+    return BacktestConfig(
+        strategy_id="checkpoint",
+        symbols=["AAA", "BB"],
+        start=START,
+        end=START + timedelta(hours=6),
+        legs=[
+            {
+                "symbol": "AAA",
+                "side": "BUY",
+                "quantity": 2,
+                "exit_target": 1.0,
+                "exit_stop_loss": 1.0,
+                "entry_condition": "rsi(14) < 45",
+            },
+            {"symbol": "BB", "side": "SELL", "quantity": 1, "trailing_stop_points": 0.8},
+        ],
+        equity_sampling=EquitySampling.BAR,
+        equity_bar_seconds=60,
+        bar_timeframe=Timeframe.M1 if bars else None,
+        on_bar=_limit_orders if bars else None,
+        checkpoint=checkpoint,
+        **overrides,
+    )
+
+
+def _crash_after(events: int):
+    def report(update):
+        if update.events_processed >= events:
+            raise BacktestCancelled("simulated crash")
+
+    return report
+
+
+@pytest.mark.parametrize("bars", [False, True])
+def test_resumed_run_is_identical_to_uninterrupted_run(tmp_path, bars):
+    runner = BacktestRunner(_Provider())
+    expected = runner.run(_config(bars=bars))
+
+    checkpoint = BacktestCheckpoint(tmp_path / "run", interval_events=70)
+    with pytest.raises(BacktestCancelled):
+        runner.run(_config(checkpoint, bars, progress_callback=_crash_after(250), progress_interval=1))
+    assert checkpoint.exists()
+
+    resumed = runner.run(_config(BacktestCheckpoint(tmp_path / "run", interval_events=70), bars))
+
+    assert resumed.equity_curve.equals(expected.equity_curve)
+    assert resumed.ledger.to_frame().equals(expected.ledger.to_frame())
+    assert resumed.final_state == expected.final_state
+    assert [trade.order.order_id for trade in resumed.trades] == [trade.order.order_id for trade in expected.trades]
+    assert not checkpoint.exists()
+
+
+def test_fills_are_appended_instead_of_rewritten(tmp_path):
+    checkpoint = BacktestCheckpoint(tmp_path / "run", interval_events=70)
+    with pytest.raises(BacktestCancelled):
+        BacktestRunner(_Provider()).run(_config(checkpoint, True, progress_callback=_crash_after(500), progress_interval=1))
+
+    with checkpoint.state_path.open("rb") as handle:
+        _, state = pickle.load(handle)
+    assert state.trades == [] and not len(state.ledger)
+    assert checkpoint.fills_path.stat().st_size == state.fills_bytes
+
+    chunks = []
+    with checkpoint.fills_path.open("rb") as handle:
+        while handle.tell() < state.fills_bytes:
+            trades, _ = pickle.load(handle)
+            chunks.append(len(trades))
+    assert len(chunks) > 1 and all(chunks)
+
+
+def test_checkpoint_of_a_different_run_is_ignored(tmp_path):
+    runner = BacktestRunner(_Provider())
+    with pytest.raises(BacktestCancelled):
+        runner.run(_config(BacktestCheckpoint(tmp_path, 50), progress_callback=_crash_after(120), progress_interval=1))
+
+    changed = runner.run(_config(BacktestCheckpoint(tmp_path, 50), initial_capital=5_00_000.0))
+    fresh = runner.run(_config(initial_capital=5_00_000.0))
+
+    assert changed.equity_curve.equals(fresh.equity_curve)
+
+
+def test_changed_market_data_discards_the_checkpoint(tmp_path):
+    checkpoint = BacktestCheckpoint(tmp_path, 50)
+    with pytest.raises(BacktestCancelled):
+        BacktestRunner(_Provider()).run(_config(checkpoint, progress_callback=_crash_after(120), progress_interval=1))
+
+    with pytest.raises(CheckpointError):
+        BacktestRunner(_Provider(spacing=15)).run(_config(BacktestCheckpoint(tmp_path, 50)))
+    assert not checkpoint.exists()
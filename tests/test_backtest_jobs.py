@@ -0,0 +1,140 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+
+from backend.app.config.settings import AppSettings, BacktestJobSettings
+from backend.app.schemas.backtests import BacktestJob, BacktestJobStatus, BacktestRequest
+from backend.app.services.backtesting import BacktestingService
+from backend.app.services.jobs import BacktestJobService, BacktestQueueFull
+from backend.core.backtesting.runner import BacktestRunner
+from backend.core.data.frames import FrameMarketData
+
+
+def _frame_service(ticks: int = 2_000) -> BacktestingService:
+    start = datetime(2024, 1, 1, 9, 15)
+    frame = pl.DataFrame(
+        {
+            "timestamp": [start + timedelta(minutes=i) for i in range(ticks)],
+            "price": 100.0 + np.cumsum(np.random.default_rng(3).normal(0, 0.5, ticks)),
+        }
+    )
+    return BacktestingService(BacktestRunner(FrameMarketData({"AAA": frame})))
+
+
+def _slow_service() -> BacktestingService:
+    return _frame_service(ticks=400_000)
+
+
+def _request() -> BacktestRequest:
+    return BacktestRequest(
+        strategy_id="jobs",
+        symbols=["AAA"],
+        start=datetime(2024, 1, 1),
+        end=datetime(2025, 1, 1),
+        legs=[{"symbol": "AAA", "side": "BUY", "quantity": 1, "exit_target": 1.0, "exit_stop_loss": 1.0}],
+    )
+
+
+def _wait_for(jobs: BacktestJobService, job_id: str, statuses: set, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = jobs.get(job_id)
+        if job.status in statuses:
+            return job
+        time.sleep(0.05)
+    pytest.fail(f"job {job_id} did not reach {statuses}")
+
+
+def _settings(**limits) -> AppSettings:
+    return AppSettings(backtest_jobs=BacktestJobSettings(progress_interval_events=500, **limits))
+
+
+def test_job_completes_with_same_result_as_inline_run():
+    jobs = BacktestJobService(_settings(max_concurrent_jobs=1), service_factory=_frame_service)
+    try:
+        job = jobs.submit(_request())
+        assert job.status == BacktestJobStatus.QUEUED
+
+        done = _wait_for(jobs, job.job_id, {BacktestJobStatus.COMPLETED, BacktestJobStatus.FAILED})
+        assert done.status == BacktestJobStatus.COMPLETED
+        assert done.progress == 1.0
+        assert jobs.result(job.job_id).metrics == _frame_service().run_backtest(_request()).metrics
+    finally:
+        jobs.shutdown()
+
+
+def test_running_job_can_be_cancelled_and_queue_is_bounded():
+    jobs = BacktestJobService(_settings(max_concurrent_jobs=1, max_queued_jobs=0), service_factory=_slow_service)
+    try:
+        job = jobs.submit(_request())
+        with pytest.raises(BacktestQueueFull):
+            jobs.submit(_request())
+
+        _wait_for(jobs, job.job_id, {BacktestJobStatus.RUNNING})
+        jobs.cancel(job.job_id)
+        cancelled = _wait_for(jobs, job.job_id, {BacktestJobStatus.CANCELLED, BacktestJobStatus.COMPLETED})
+        assert cancelled.status == BacktestJobStatus.CANCELLED
+        assert jobs.result(job.job_id) is None
+    finally:
+        jobs.shutdown()
+
+
+def test_progress_reports_equity_trades_and_drawdown():
+    updates = []
+    _frame_service().run_backtest(_request(), progress_callback=updates.append, progress_interval=250)
+
+    assert len(updates) == 2_000 // 250 + 1
+    assert [update.events_processed for update in updates[:2]] == [250, 500]
+    assert updates[0].timestamp == datetime(2024, 1, 1, 9, 15) + timedelta(minutes=249)
+    final = updates[-1]
+    assert final.fraction == 1.0 and final.trade_count > 0
+    assert final.max_drawdown <= final.drawdown <= 0.0
+    assert min(update.max_drawdown for update in updates) == final.max_drawdown
+
+
+def test_progress_callbacks_are_throttled_by_wall_clock():
+    updates = []
+    _frame_service().run_backtest(
+        _request(), progress_callback=updates.append, progress_interval=1, progress_min_seconds=3600.0
+    )
+    assert len(updates) == 1  # only the final update
+
+
+def test_job_events_stream_ends_with_terminal_status():
+    jobs = BacktestJobService(_settings(max_concurrent_jobs=1, stream_poll_seconds=0.05), service_factory=_frame_service)
+
+    async def collect(job_id):
+        return [chunk async for chunk in jobs.stream(job_id)]
+
+    try:
+        job = jobs.submit(_request())
+        chunks = asyncio.run(collect(job.job_id))
+        assert all(chunk.endswith("\n\n") for chunk in chunks)
+        assert chunks[-1].startswith("event: completed\n")
+        last = BacktestJob.model_validate_json(chunks[-1].split("data: ", 1)[1])
+        assert last.progress == 1.0 and last.trade_count > 0 and last.simulated_time is not None
+    finally:
+        jobs.shutdown()
+
+
+def test_stale_checkpoints_are_expired_on_start(tmp_path):
+    root = tmp_path / "checkpoints"
+    stale, recent = root / "stale", root / "recent"
+    for directory in (stale, recent):
+        directory.mkdir(parents=True)
+        (directory / "state.pkl").write_bytes(b"")
+    day_ago = time.time() - 86_400
+    os.utime(stale, (day_ago, day_ago))
+
+    settings = AppSettings(
+        historical_cache_path=tmp_path,
+        backtest_jobs=BacktestJobSettings(checkpoint_retention_seconds=3_600),
+    )
+    BacktestJobService(settings, service_factory=_frame_service)
+
+    assert not stale.exists() and recent.exists()
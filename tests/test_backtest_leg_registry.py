@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+from backend.core.backtesting.runner import BacktestConfig, BacktestRunner, LegRegistry, LegState
+from backend.core.data import MarketDataEvent
+
+
+def _leg(symbol: str, side: str) -> LegState:
+    return LegState(symbol=symbol, side=side, quantity=1, entry_price=100.0, entry_time=datetime(2024, 1, 1))
+
+
+def test_registry_indexes_by_symbol_and_side():
+    registry = LegRegistry(
+        [
+            {"symbol": "AAA", "side": "BUY"},
+            {"symbol": "BBB", "side": "SELL"},
+            {"symbol": "AAA", "side": "SELL"},
+        ]
+    )
+    assert [cfg["side"] for cfg in registry.configs_by_symbol["AAA"]] == ["BUY", "SELL"]
+
+    first, second, third = _leg("AAA", "BUY"), _leg("BBB", "SELL"), _leg("AAA", "SELL")
+    for leg in (first, second, third):
+        registry.add(leg)
+    assert len(registry) == 3
+    assert registry.is_active("AAA", "SELL") and not registry.is_active("BBB", "BUY")
+    assert registry.for_symbol("AAA") == [first, third]
+
+    registry.remove(first)
+    registry.add(_leg("AAA", "BUY"))
+    assert [leg.side for leg in registry.for_symbol("AAA")] == ["SELL", "BUY"]
+    assert [leg.symbol for leg in registry] == ["BBB", "AAA", "AAA"]
+
+
+class _StepProvider:
+    def __init__(self, prices: dict[str, list[float]]) -> None:
+        start = datetime(2024, 1, 1, 9, 15)
+        self._events = {
+            symbol: [MarketDataEvent(symbol=symbol, timestamp=start + timedelta(minutes=i), price=p) for i, p in enumerate(series)]
+            for symbol, series in prices.items()
+        }
+
+    def historical(self, symbol, start, end):
+        return iter(self._events.get(symbol, []))
+
+
+def test_only_first_config_per_symbol_side_is_entered():
+    provider = _StepProvider({"AAA": [100.0, 103.0, 104.0], "BBB": [50.0, 49.0, 48.0]})
+    legs = [
+        {"symbol": "AAA", "side": "BUY", "quantity": 2, "exit_target": 2.0},
+        {"symbol": "AAA", "side": "BUY", "quantity": 9},
+        {"symbol": "BBB", "side": "SELL", "quantity": 1},
+    ]
+    result = BacktestRunner(provider).run(
+        BacktestConfig("s", ["AAA", "BBB"], datetime(2024, 1, 1), datetime(2024, 1, 2), legs=legs)
+    )
+
+    rows = [(trade.order.order_id, trade.order.quantity, (trade.order.metadata or {}).get("exit_reason")) for trade in result.trades]
+    assert rows == [
+        ("LEG-1-ENTRY", 2, None),
+        ("LEG-2-ENTRY", 1, None),
+        ("LEG-AAA-BUY-EXIT", 2, "TARGET"),
+        ("LEG-2-ENTRY", 2, None),
+        ("LEG-BBB-SELL-EXIT", 1, "END_OF_BACKTEST"),
+        ("LEG-AAA-BUY-EXIT", 2, "END_OF_BACKTEST"),
+    ]
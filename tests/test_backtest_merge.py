@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+from backend.core.backtesting.merge import merge_histories
+from backend.core.backtesting.runner import BacktestConfig, BacktestRunner
+from backend.core.data import MarketDataEvent
+
+
+class SteppedProvider:
+    """Yields lazily and records how far each symbol's stream has been consumed."""
+
+    def __init__(self, steps: dict[str, int], ticks: int) -> None:
+        self.steps = steps
+        self.ticks = ticks
+        self.consumed = {symbol: 0 for symbol in steps}
+
+    def historical(self, symbol, start, end):
+        base = datetime(2024, 1, 1, 9, 15)
+        for i in range(self.ticks):
+            self.consumed[symbol] += 1
+            yield MarketDataEvent(symbol=symbol, timestamp=base + timedelta(minutes=i * self.steps[symbol]), price=100.0 + i)
+
+
+def test_merge_histories_is_globally_time_ordered():
+    provider = SteppedProvider({"AAA": 3, "BBB": 2, "CCC": 5}, ticks=50)
+    events = list(merge_histories(provider, ["AAA", "BBB", "CCC"], datetime(2024, 1, 1), datetime(2024, 1, 2)))
+
+    assert len(events) == 150
+    keys = [event.timestamp for event in events]
+    assert keys == sorted(keys)
+    # Ties keep the order the symbols were requested in.
+    first_tick = [event.symbol for event in events if event.timestamp == datetime(2024, 1, 1, 9, 15)]
+    assert first_tick == ["AAA", "BBB", "CCC"]
+
+
+def test_merge_histories_streams_lazily():
+    provider = SteppedProvider({"AAA": 1, "BBB": 1}, ticks=1_000)
+    stream = merge_histories(provider, ["AAA", "BBB"], datetime(2024, 1, 1), datetime(2024, 1, 2))
+    for _ in range(10):
+        next(stream)
+
+    assert max(provider.consumed.values()) <= 6
+
+
+def test_equity_curve_is_monotonic_in_time():
+    provider = SteppedProvider({"AAA": 3, "BBB": 2}, ticks=40)
+    result = BacktestRunner(provider).run(
+        BacktestConfig(
+            strategy_id="merge",
+            symbols=["AAA", "BBB"],
+            start=datetime(2024, 1, 1),
+            end=datetime(2024, 1, 2),
+            legs=[
+                {"symbol": "AAA", "side": "BUY", "quantity": 1, "exit_target": 2.0},
+                {"symbol": "BBB", "side": "SELL", "quantity": 1, "exit_stop_loss": 3.0},
+            ],
+        )
+    )
+
+    timestamps = result.equity_curve["timestamp"].to_list()
+    assert timestamps == sorted(timestamps)
+    assert len(timestamps) == 80
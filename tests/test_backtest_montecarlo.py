@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+
+from backend.app.schemas.backtests import BacktestRequest, MonteCarloRequest
+from backend.app.services.backtesting import BacktestingService, BacktestNotFound
+from backend.app.services.result_cache import BacktestResultCache
+from backend.core.backtesting.montecarlo import (
+    ResamplingMethod,
+    band_steps,
+    batch_sizes,
+    simulate_paths,
+)
+from backend.core.backtesting.runner import BacktestRunner
+from backend.core.data.frames import FrameMarketData
+
+
+def test_shuffle_preserves_total_return_and_seeded_batches_are_reproducible():
+    pnls = np.random.default_rng(0).normal(100, 1_000, 300)
+    steps = band_steps(len(pnls))
+    shuffled = simulate_paths(pnls, 1e6, ResamplingMethod.SHUFFLE, steps, 500, seed=1)
+    np.testing.assert_allclose(shuffled.total_return, pnls.sum() / 1e6)
+    assert (shuffled.max_drawdown <= 0).all()
+    assert shuffled.equity_at_steps.shape == (500, len(steps))
+
+    first = simulate_paths(pnls, 1e6, ResamplingMethod.BOOTSTRAP, steps, 500, seed=1)
+    again = simulate_paths(pnls, 1e6, ResamplingMethod.BOOTSTRAP, steps, 500, seed=1)
+    np.testing.assert_array_equal(first.trade_sharpe_ratio, again.trade_sharpe_ratio)
+    assert sum(batch_sizes(10_000, 300, batch_elements=1_000_000)) == 10_000
+
+
+def _service(tmp_path) -> BacktestingService:
+    ticks = 3_000
+    start = datetime(2024, 1, 1, 9, 15)
+    frame = pl.DataFrame(
+        {
+            "timestamp": [start + timedelta(minutes=i) for i in range(ticks)],
+            "price": 100.0 + np.cumsum(np.random.default_rng(5).normal(0, 0.5, ticks)),
+        }
+    )
+    cache = BacktestResultCache(tmp_path / "backtests", max_bytes=1 << 30)
+    return BacktestingService(BacktestRunner(FrameMarketData({"AAA": frame})), result_cache=cache)
+
+
+def _backtest(**overrides) -> BacktestRequest:
+    fields = dict(
+        strategy_id="mc",
+        symbols=["AAA"],
+        start=datetime(2024, 1, 1),
+        end=datetime(2025, 1, 1),
+        legs=[{"symbol": "AAA", "side": "BUY", "quantity": 10, "exit_target": 1.0, "exit_stop_loss": 1.0}],
+    )
+    return BacktestRequest(**{**fields, **overrides})
+
+
+@pytest.mark.parametrize("capital", [10_00_000.0, 2_500.0])
+def test_monte_carlo_resamples_stored_round_trips_without_rerunning(tmp_path, capital):
+    service = _service(tmp_path)
+    backtest = service.run_backtest(_backtest(initial_capital=capital))
+    service.runner = None  # resampling must not touch the runner
+    response = service.run_monte_carlo(MonteCarloRequest(backtest_id=backtest.backtest_id, paths=2_000, seed=42, max_workers=1))
+
+    assert response.backtest_id == backtest.backtest_id
+    assert response.trades == backtest.metrics.closed_trades > 10
+    assert set(response.metrics) == {"total_return", "max_drawdown", "trade_sharpe_ratio"}
+    total_return = response.metrics["total_return"]
+    assert total_return.observed == pytest.approx(backtest.metrics.realized_pnl / capital)
+    assert sum(total_return.histogram_counts) == 2_000
+    assert total_return.percentiles["p5"] <= total_return.percentiles["p50"] <= total_return.percentiles["p95"]
+    assert response.band_trades[0] == 0 and response.band_trades[-1] == response.trades
+    # Paths start from the request's capital, stored with the run rather than derived from its rounded metrics.
+    assert all(band[0] == capital for band in response.equity_bands.values())
+
+
+def test_monte_carlo_rejects_unknown_backtests_and_ones_without_closed_trades(tmp_path):
+    service = _service(tmp_path)
+    with pytest.raises(BacktestNotFound):
+        service.run_monte_carlo(MonteCarloRequest(backtest_id="BT-missing"))
+
+    backtest = service.run_backtest(_backtest(legs=None))
+    with pytest.raises(ValueError):
+        service.run_monte_carlo(MonteCarloRequest(backtest_id=backtest.backtest_id))
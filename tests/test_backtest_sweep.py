@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backend.app.schemas.backtests import BacktestRequest, BacktestSweepRequest
+from backend.app.services.backtesting import BacktestingService
+from backend.core.backtesting.runner import BacktestRunner
+from backend.core.data import MarketDataEvent
+
+
+class RandomWalkProvider:
+    def __init__(self, symbols: list[str], ticks: int, seed: int = 11) -> None:
+        rng = np.random.default_rng(seed)
+        start = datetime(2024, 1, 1, 9, 15)
+        self.calls = 0
+        self._events = {
+            symbol: [
+                MarketDataEvent(symbol=symbol, timestamp=start + timedelta(minutes=i), price=float(price))
+                for i, price in enumerate(100.0 + np.cumsum(rng.normal(0, 0.5, ticks)))
+            ]
+            for symbol in symbols
+        }
+
+    def historical(self, symbol, start, end):
+        self.calls += 1
+        return iter(self._events.get(symbol, []))
+
+
+def _sweep_request(max_workers: int) -> BacktestSweepRequest:
+    return BacktestSweepRequest(
+        base=BacktestRequest(
+            strategy_id="sweep",
+            symbols=["AAA", "BBB"],
+            start=datetime(2024, 1, 1),
+            end=datetime(2024, 1, 2),
+            legs=[
+                {"symbol": "AAA", "side": "BUY", "quantity": 5},
+                {"symbol": "BBB", "side": "SELL", "quantity": 5, "exit_stop_loss": 1.0},
+            ],
+        ),
+        parameter_grid={"exit_target": [0.5, 1.0, 2.0], "0.time_based_exit_minutes": [15, 60]},
+        max_workers=max_workers,
+    )
+
+
+def test_run_sweep_ranks_every_combination_and_loads_data_once():
+    provider = RandomWalkProvider(["AAA", "BBB"], ticks=500)
+    service = BacktestingService(BacktestRunner(provider))
+
+    response = service.run_sweep(_sweep_request(max_workers=1))
+
+    assert response.combinations == 6
+    assert [result.rank for result in response.results] == [1, 2, 3, 4, 5, 6]
+    sharpes = [result.metrics.sharpe_ratio for result in response.results]
+    assert sharpes == sorted(sharpes, reverse=True)
+    assert provider.calls == 2
+
+
+def test_run_sweep_process_pool_matches_inline():
+    service = BacktestingService(BacktestRunner(RandomWalkProvider(["AAA", "BBB"], ticks=500)))
+
+    inline = service.run_sweep(_sweep_request(max_workers=1))
+    pooled = service.run_sweep(_sweep_request(max_workers=2))
+
+    assert [(r.parameters, r.metrics) for r in pooled.results] == [(r.parameters, r.metrics) for r in inline.results]
+
+
+def test_run_sweep_rejects_unknown_parameters():
+    service = BacktestingService(BacktestRunner(RandomWalkProvider(["AAA"], ticks=10)))
+    request = _sweep_request(max_workers=1)
+    request.parameter_grid = {"quantity": [1, 2]}
+
+    with pytest.raises(ValueError):
+        service.run_sweep(request)
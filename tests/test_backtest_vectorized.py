@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backend.core.backtesting.runner import BacktestConfig, BacktestRunner, ExecutionMode
+from backend.core.data import MarketDataEvent
+
+
+class RandomWalkProvider:
+    def __init__(self, symbols: list[str], ticks: int, seed: int = 7) -> None:
+        rng = np.random.default_rng(seed)
+        start = datetime(2024, 1, 1, 9, 15)
+        self._events: dict[str, list[MarketDataEvent]] = {}
+        for offset, symbol in enumerate(symbols):
+            prices = 100.0 + offset * 50 + np.cumsum(rng.normal(0, 0.8, ticks))
+            self._events[symbol] = [
+                MarketDataEvent(
+                    symbol=symbol,
+                    timestamp=start + timedelta(seconds=offset * 30 + i * (60 + offset * 15)),
+                    price=float(price),
+                )
+                for i, price in enumerate(prices)
+            ]
+
+    def historical(self, symbol, start, end):
+        return iter(self._events.get(symbol, []))
+
+
+LEG_SETS = [
+    [{"symbol": "AAA", "side": "BUY", "quantity": 10, "exit_target": 2.0, "exit_stop_loss": 1.5}],
+    [{"symbol": "AAA", "side": "SELL", "quantity": 5, "trailing_stop_points": 1.0}],
+    [{"symbol": "AAA", "side": "BUY", "quantity": 3, "trailing_stop_percent": 0.8, "time_based_exit_minutes": 45}],
+    [
+        {"symbol": "AAA", "side": "BUY", "quantity": 1, "exit_target": 1.0, "partial_square_off_percent": 50},
+        {"symbol": "AAA", "side": "BUY", "quantity": 7, "exit_stop_loss": 0.5},
+        {"symbol": "BBB", "side": "SELL", "quantity": 4, "exit_target": 3.0, "time_based_exit_minutes": 30},
+        {"symbol": "BBB", "side": "BUY", "quantity": 2, "exit_stop_loss": 2.0, "trailing_stop_points": 1.2},
+    ],
+    [{"symbol": "BBB", "side": "BUY", "quantity": 2, "exit_target": 500.0}],
+]
+
+
+def _trade_rows(result):
+    return [
+        (
+            trade.order.order_id,
+            trade.order.symbol,
+            trade.order.side,
+            trade.order.quantity,
+            trade.status,
+            trade.fills[0].fill_price if trade.fills else None,
+            (trade.order.metadata or {}).get("exit_reason"),
+        )
+        for trade in result.trades
+    ]
+
+
+@pytest.mark.parametrize("legs", LEG_SETS)
+def test_vectorized_mode_matches_event_mode(legs):
+    runner = BacktestRunner(RandomWalkProvider(["AAA", "BBB"], ticks=2_000))
+
+    def run(mode):
+        return runner.run(
+            BacktestConfig(
+                strategy_id="parity",
+                symbols=["AAA", "BBB"],
+                start=datetime(2024, 1, 1),
+                end=datetime(2024, 1, 31),
+                legs=legs,
+                execution_mode=mode,
+            )
+        )
+
+    event_result = run(ExecutionMode.EVENT)
+    vector_result = run(ExecutionMode.VECTORIZED)
+
+    assert _trade_rows(vector_result) == _trade_rows(event_result)
+    assert vector_result.final_state.cash_balance == event_result.final_state.cash_balance
+    assert vector_result.equity_curve["cash_balance"].to_list() == event_result.equity_curve["cash_balance"].to_list()
+    assert vector_result.equity_curve["timestamp"].to_list() == event_result.equity_curve["timestamp"].to_list()
+    np.testing.assert_allclose(
+        vector_result.equity_curve["equity"].to_numpy(), event_result.equity_curve["equity"].to_numpy(), rtol=1e-12
+    )
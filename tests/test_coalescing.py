@@ -0,0 +1,112 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.core.data import MarketDataEvent
+from backend.core.data.coalescing import CoalescingMarketData
+from backend.core.data.fingerprint import VersionedMarketDataProvider
+
+START = datetime(2024, 1, 1, 9, 15)
+
+
+class _SlowProvider:
+    def __init__(self, fail: bool = False) -> None:
+        self.calls = 0
+        self.fail = fail
+        self.release = threading.Event()
+
+    def historical(self, symbol, start, end):
+        self.calls += 1
+        self.release.wait(5)
+        if self.fail:
+            raise ConnectionError("upstream down")
+        for minute in range(int((end - start).total_seconds() // 60) + 1):
+            yield MarketDataEvent(symbol=symbol, timestamp=start + timedelta(minutes=minute), price=100.0 + minute)
+
+
+def _run_concurrently(provider, windows):
+    results, errors = [None] * len(windows), [None] * len(windows)
+
+    def load(index, window):
+        try:
+            results[index] = provider.history_frame("AAA", *window)
+        except Exception as exc:  # noqa: BLE001
+            errors[index] = exc
+
+    threads = [threading.Thread(target=load, args=(i, window)) for i, window in enumerate(windows)]
+    threads[0].start()
+    time.sleep(0.05)  # let the first request start the load the others join
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    return threads, results, errors
+
+
+def test_contained_requests_share_one_load():
+    upstream = _SlowProvider()
+    provider = CoalescingMarketData(upstream)
+    full = (START, START + timedelta(hours=6))
+    inner = (START + timedelta(hours=1), START + timedelta(hours=2))
+    threads, results, _ = _run_concurrently(provider, [full, full, inner, inner])
+    upstream.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert upstream.calls == 1
+    assert (provider.loads, provider.deduplicated) == (1, 3)
+    assert results[1].equals(results[0])
+    assert results[2]["timestamp"].to_list() == [inner[0] + timedelta(minutes=m) for m in range(61)]
+
+    # Once finished, nothing is held: the next request loads again.
+    provider.history_frame("AAA", *inner)
+    assert upstream.calls == 2
+
+
+def test_waiters_see_the_owner_failure():
+    upstream = _SlowProvider(fail=True)
+    provider = CoalescingMarketData(upstream)
+    window = (START, START + timedelta(hours=1))
+    threads, _, errors = _run_concurrently(provider, [window, window])
+    upstream.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert upstream.calls == 1
+    assert all(isinstance(error, ConnectionError) for error in errors)
+    with pytest.raises(ConnectionError):
+        provider.history_frame("AAA", *window)
+
+
+def test_versioned_only_when_upstream_is():
+    class _Versioned(_SlowProvider):
+        def data_version(self, symbol, start, end):
+            return "v1"
+
+    assert not isinstance(CoalescingMarketData(_SlowProvider()), VersionedMarketDataProvider)
+    versioned = CoalescingMarketData(_Versioned())
+    assert versioned.data_version("AAA", START, START) == "v1"
+
+
+def test_overlapping_request_loads_only_the_uncovered_remainder():
+    upstream = _SlowProvider()
+    provider = CoalescingMarketData(upstream)
+    first = (START, START + timedelta(hours=3))
+    overlapping = (START + timedelta(hours=2), START + timedelta(hours=5))
+    windows = []
+    original = upstream.historical
+
+    def historical(symbol, start, end):
+        windows.append((start, end))
+        return original(symbol, start, end)
+
+    upstream.historical = historical
+    threads, results, _ = _run_concurrently(provider, [first, overlapping])
+    upstream.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(windows) == [first, (first[1], overlapping[1])]
+    assert (provider.loads, provider.deduplicated) == (2, 1)
+    assert results[1]["timestamp"].to_list() == [overlapping[0] + timedelta(minutes=m) for m in range(181)]
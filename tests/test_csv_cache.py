@@ -0,0 +1,83 @@
+import os
+from datetime import datetime, timedelta
+
+import polars as pl
+
+from backend.core.data import MarketDataEvent
+from backend.core.data.csv_cache import CSVConversionCache
+
+START = datetime(2024, 1, 1, 9, 15)
+
+
+def _write_csv(path, minutes, offset=0.0):
+    lines = ["timestamp,price,volume"]
+    lines += [f"{(START + timedelta(minutes=i)).isoformat()},{100.0 + i + offset},{10 * i}" for i in range(minutes)]
+    path.write_text("\n".join(lines) + "\n")
+
+
+class _Fallback:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def historical(self, symbol, start, end):
+        self.calls += 1
+        yield MarketDataEvent(symbol=symbol, timestamp=START, price=1.0)
+
+
+def test_csv_is_converted_once_and_memory_mapped_afterwards(tmp_path):
+    data_dir = tmp_path / "mock"
+    data_dir.mkdir()
+    _write_csv(data_dir / "AAA.csv", 60)
+    cache = CSVConversionCache(data_dir, tmp_path / "cache")
+    window = (START + timedelta(minutes=10), START + timedelta(minutes=19))
+
+    first = cache.history_frame("AAA", *window)
+    assert first["price"].to_list() == [110.0 + i for i in range(10)]
+    assert first.schema["timestamp"] == pl.Datetime("us")
+    conversion = cache.convert("AAA")
+    assert not conversion.converted
+    assert list((tmp_path / "cache" / "AAA").glob("*.arrow")) == [conversion.path]
+
+    assert cache.history_frame("AAA", *window).equals(first)
+    events = list(cache.historical("AAA", *window))
+    assert [event.price for event in events] == first["price"].to_list()
+    assert cache.history_frame("ZZZ", *window).is_empty()
+    assert cache.data_version("ZZZ", *window) == "missing"
+
+
+def test_editing_the_csv_triggers_a_fresh_conversion(tmp_path):
+    data_dir = tmp_path / "mock"
+    data_dir.mkdir()
+    csv = data_dir / "AAA.csv"
+    _write_csv(csv, 30)
+    cache = CSVConversionCache(data_dir, tmp_path / "cache")
+    window = (START, START + timedelta(hours=1))
+    version = cache.data_version("AAA", *window)
+    stale = cache.convert("AAA").path
+
+    _write_csv(csv, 30, offset=0.5)
+    os.utime(csv, ns=(csv.stat().st_atime_ns, csv.stat().st_mtime_ns + 1_000_000))
+
+    assert cache.data_version("AAA", *window) != version
+    assert cache.history_frame("AAA", *window)["price"][0] == 100.5
+    assert not stale.exists()
+
+
+def test_unreadable_layouts_fall_back_and_bulk_conversion_reports_failures(tmp_path):
+    data_dir = tmp_path / "mock"
+    data_dir.mkdir()
+    _write_csv(data_dir / "AAA.csv", 5)
+    _write_csv(data_dir / "BBB.csv", 5)
+    (data_dir / "BAD.csv").write_text("when,last\n2024-01-01T09:15:00,1.0\n")
+    fallback = _Fallback()
+    cache = CSVConversionCache(data_dir, tmp_path / "cache", fallback=fallback)
+
+    results = cache.convert_all(workers=3)
+    assert sorted(results) == ["AAA", "BAD", "BBB"]
+    assert isinstance(results["BAD"], ValueError)
+    assert results["AAA"].converted and results["BBB"].converted
+    assert not cache.convert_all()["AAA"].converted
+
+    frame = cache.history_frame("BAD", START, START + timedelta(hours=1))
+    assert frame["price"].to_list() == [1.0]
+    assert fallback.calls == 1
@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+from pydantic import ValidationError
+
+from backend.app.schemas.backtests import LegConfig
+from backend.core.backtesting.conditions import INDICATOR_NAMES, ConditionError, ConditionInterpreter, parse_condition
+from backend.core.backtesting.runner import BacktestConfig, BacktestRunner, ExecutionMode
+from backend.core.data import MarketDataEvent
+from backend.core.data.bars import Timeframe
+from backend.core.data.indicator_cache import IndicatorCache
+from backend.strategies import indicators as ind
+from backend.strategies.indicators import STREAMING_INDICATORS
+
+START = datetime(2024, 1, 1, 9, 15)
+PRICES = 100.0 + np.cumsum(np.random.default_rng(21).normal(0, 0.4, 3_000))
+
+
+def _frame() -> pl.DataFrame:
+    return pl.DataFrame({"timestamp": [START + timedelta(seconds=5 * i) for i in range(len(PRICES))], "price": PRICES})
+
+
+class _ListProvider:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def historical(self, symbol, start, end):
+        self.calls += 1
+        for i, price in enumerate(PRICES):
+            yield MarketDataEvent(symbol=symbol, timestamp=START + timedelta(seconds=5 * i), price=float(price))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "__import__('os').system('true') > 0",
+        "close.real > 1",
+        "sma(period) > 1",
+        "sma(1) > close",
+        "macd(12) > 0",
+        "close + 1",
+        "close > 1 if True else False",
+        "time > '25:00'",
+        "close > True",
+        "close ** 2 > 1",
+    ],
+)
+def test_rejects_expressions_outside_the_language(text):
+    with pytest.raises(ConditionError):
+        parse_condition(text)
+
+
+def test_leg_config_validates_entry_condition():
+    with pytest.raises(ValidationError):
+        LegConfig(symbol="AAA", side="BUY", quantity=1, entry_condition="open(__file__)")
+    assert LegConfig(symbol="AAA", side="BUY", quantity=1, entry_condition="close > sma(5)").entry_condition
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "close > sma(20)",
+        "ema(10) < sma(30) and rsi(14) < 40",
+        "zscore(50) < -1.5 or not std(20) > 0.5",
+        "30 < rsi(7) < 70 and time >= '09:30' and time < \"12:00\"",
+        "(close - ema(25)) / ema(25) > 0.002",
+        "not (close > sma(40))",
+    ],
+)
+def test_vectorized_signal_matches_tick_interpreter(text):
+    condition = parse_condition(text)
+    frame = _frame()
+    interpreter = ConditionInterpreter(condition, STREAMING_INDICATORS)
+
+    streamed = np.array([interpreter.update(price, timestamp) for timestamp, price in frame.iter_rows()])
+
+    np.testing.assert_array_equal(condition.evaluate(frame), streamed)
+    assert 0 < streamed.sum() < len(streamed)
+
+
+def test_condition_indicators_are_the_batch_indicators_under_the_same_names():
+    assert set(INDICATOR_NAMES) == set(STREAMING_INDICATORS) <= set(ind.BATCH_INDICATORS)
+    condition = parse_condition("std(20) > 0.5 and zscore(30) < 1")
+    columns = {series.name: series.fill_null(np.nan).to_numpy() for series in condition.indicator_columns(PRICES)}
+
+    np.testing.assert_array_equal(columns["std(20)"], ind.rolling_std(PRICES, 20))
+    np.testing.assert_array_equal(columns["zscore(30)"], ind.zscore(PRICES, 30))
+    np.testing.assert_array_equal(
+        ind.precompute(_frame(), "std", symbol="AAA", period=20), ind.BATCH_INDICATORS["std"][0](PRICES, 20)
+    )
+
+
+def _run(mode: ExecutionMode, cache: IndicatorCache | None = None, provider: _ListProvider | None = None, **overrides):
+    legs = [
+        {
+            "symbol": "AAA",
+            "side": "BUY",
+            "quantity": 3,
+            "entry_condition": "close < sma(40) and rsi(14) < 35",
+            "exit_target": 0.8,
+            "exit_stop_loss": 1.2,
+        }
+    ]
+    config = BacktestConfig(
+        "cond",
+        ["AAA"],
+        START,
+        START + timedelta(days=1),
+        legs=legs,
+        execution_mode=mode,
+        indicator_cache=cache,
+        **overrides,
+    )
+    return BacktestRunner(provider or _ListProvider()).run(config)
+
+
+def _fills(result):
+    return [
+        (trade.order.order_id, trade.order.timestamp, trade.fills[0].fill_price, (trade.order.metadata or {}).get("exit_reason"))
+        for trade in result.trades
+    ]
+
+
+def test_legs_enter_only_when_the_condition_holds(tmp_path):
+    condition = parse_condition("close < sma(40) and rsi(14) < 35")
+    signal = condition.evaluate(_frame())
+    event = _run(ExecutionMode.EVENT)
+    vectorized = _run(ExecutionMode.VECTORIZED, cache=IndicatorCache(tmp_path, max_bytes=10_000_000))
+
+    assert _fills(event) == _fills(vectorized)
+    entries = [(timestamp, price) for order_id, timestamp, price, reason in _fills(event) if order_id.endswith("ENTRY")]
+    assert len(entries) > 2
+    for timestamp, price in entries:
+        index = int((timestamp - START).total_seconds() // 5)
+        assert signal[index] and price == PRICES[index]
+
+
+def test_indicator_columns_are_reused_from_the_cache(tmp_path):
+    cache = IndicatorCache(tmp_path, max_bytes=10_000_000)
+    first = _run(ExecutionMode.EVENT, cache=cache, batch_size=97)
+    second = _run(ExecutionMode.VECTORIZED, cache=cache)
+
+    assert _fills(first) == _fills(second) == _fills(_run(ExecutionMode.EVENT))
+    assert (cache.misses, cache.hits) == (2, 2)
+
+
+@pytest.mark.parametrize("batch_size", [7, 250])
+def test_event_signals_are_computed_per_batch(batch_size):
+    provider = _ListProvider()
+    batched = _run(ExecutionMode.EVENT, provider=provider, batch_size=batch_size)
+
+    # The replay is the only pass over the history; no full copy is loaded for the signals.
+    assert provider.calls == 1
+    assert _fills(batched) == _fills(_run(ExecutionMode.VECTORIZED))
+
+
+@pytest.mark.parametrize(("batch_size", "cached"), [(3, False), (10_000, False), (3, True)])
+def test_bar_entries_use_the_previous_bar_close(tmp_path, batch_size, cached):
+    cache = IndicatorCache(tmp_path, max_bytes=10_000_000) if cached else None
+    result = _run(ExecutionMode.EVENT, cache, bar_timeframe=Timeframe.M1, batch_size=batch_size)
+    bars = (
+        _frame()
+        .group_by_dynamic("timestamp", every="1m", closed="left", label="left")
+        .agg(open=pl.col("price").first(), close=pl.col("price").last())
+    )
+    bars = bars.with_columns(timestamp=pl.col("timestamp").dt.offset_by("1m"))
+    signal = parse_condition("close < sma(40) and rsi(14) < 35").evaluate(bars, price="close")
+
+    entries = [(timestamp, price) for order_id, timestamp, price, _ in _fills(result) if order_id.endswith("ENTRY")]
+    assert entries
+    for timestamp, price in entries:
+        index = bars["timestamp"].to_list().index(timestamp + timedelta(minutes=1))
+        assert signal[index - 1] and price == bars["open"][index]
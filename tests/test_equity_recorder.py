@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from backend.core.backtesting.equity import EquityRecorder, EquitySampling
+from backend.core.backtesting.runner import BacktestConfig, BacktestResult
+from backend.core.portfolio.account import AccountState
+
+MINUTE_NS = 60 * 1_000_000_000
+
+
+def _series(n: int = 1_000):
+    rng = np.random.default_rng(5)
+    timestamps = np.cumsum(rng.integers(1, 40, n)) * 1_000_000_000
+    cash = np.repeat(rng.normal(1e6, 1e3, n // 50), 50)
+    position_value = np.where(rng.random(n) < 0.7, 0.0, rng.normal(0, 500, n))
+    return timestamps.astype(np.int64), cash, position_value
+
+
+@pytest.mark.parametrize("sampling", list(EquitySampling))
+def test_scalar_and_bulk_recording_agree(sampling):
+    timestamps, cash, position_value = _series()
+    scalar = EquityRecorder(sampling, bar_seconds=60, chunk_size=64)
+    for ts, c, v in zip(timestamps, cash, position_value):
+        scalar.record(int(ts), float(c), float(v))
+    bulk = EquityRecorder(sampling, bar_seconds=60)
+    bulk.record_many(timestamps[:333], cash[:333], position_value[:333])
+    bulk.record_many(timestamps[333:], cash[333:], position_value[333:])
+
+    assert len(scalar) == len(bulk)
+    np.testing.assert_array_equal(scalar.timestamps_ns, bulk.timestamps_ns)
+    np.testing.assert_array_equal(scalar.equity, bulk.equity)
+    np.testing.assert_array_equal(scalar.cash + scalar.position_value, scalar.equity)
+
+
+def test_bar_sampling_keeps_last_point_per_bucket():
+    recorder = EquityRecorder(EquitySampling.BAR, bar_seconds=60)
+    for second, value in [(0, 1.0), (30, 2.0), (59, 3.0), (60, 4.0), (179, 5.0)]:
+        recorder.record(second * 1_000_000_000, value, 0.0)
+
+    assert recorder.cash.tolist() == [3.0, 4.0, 5.0]
+    assert (recorder.timestamps_ns // MINUTE_NS).tolist() == [0, 1, 2]
+
+
+def test_columns_are_views_and_frame_wraps_them():
+    recorder = EquityRecorder(chunk_size=8)
+    for i in range(20):
+        recorder.record(i * MINUTE_NS, 100.0 + i, 1.0)
+
+    equity = recorder.equity
+    assert equity.base is not None
+    assert recorder.equity is equity or np.shares_memory(recorder.equity, equity)
+    frame = recorder.to_frame()
+    assert frame.columns == ["timestamp", "cash_balance", "position_value", "equity"]
+    assert frame["equity"].to_list() == [101.0 + i for i in range(20)]
+
+
+@pytest.mark.parametrize("sampling", list(EquitySampling))
+def test_rows_restore_into_a_recorder_that_continues_identically(sampling):
+    timestamps, cash, position_value = _series()
+    whole = EquityRecorder(sampling, bar_seconds=60, chunk_size=64)
+    for ts, c, v in zip(timestamps, cash, position_value):
+        whole.record(int(ts), float(c), float(v))
+
+    first = EquityRecorder(sampling, bar_seconds=60, chunk_size=64)
+    for ts, c, v in zip(timestamps[:500], cash[:500], position_value[:500]):
+        first.record(int(ts), float(c), float(v))
+    head_ts, head_values = first.rows(0)
+    tail_ts, tail_values = first.rows(100)
+    np.testing.assert_array_equal(tail_ts, head_ts[100:])
+    np.testing.assert_array_equal(tail_values, head_values[:, 100:])
+
+    resumed = EquityRecorder(sampling, bar_seconds=60, chunk_size=64)
+    resumed.restore(head_ts, head_values)
+    for ts, c, v in zip(timestamps[500:], cash[500:], position_value[500:]):
+        resumed.record(int(ts), float(c), float(v))
+    np.testing.assert_array_equal(resumed.timestamps_ns, whole.timestamps_ns)
+    np.testing.assert_array_equal(resumed.equity, whole.equity)
+
+
+def test_result_return_includes_open_positions_at_their_last_mark():
+    recorder = EquityRecorder()
+    recorder.record(MINUTE_NS, 1_00_000.0, 0.0)
+    recorder.record(2 * MINUTE_NS, 40_000.0, 75_000.0)
+    config = BacktestConfig("eq", ["AAA"], datetime(2024, 1, 1), datetime(2024, 1, 2), initial_capital=1_00_000.0)
+    result = BacktestResult(config, recorder.to_frame(), [], AccountState(cash_balance=40_000.0), equity=recorder)
+
+    assert result.final_equity == 1_15_000.0
+    assert result.total_return == pytest.approx(0.15)
+
+    empty = BacktestResult(config, EquityRecorder().to_frame(), [], AccountState(cash_balance=1_00_000.0))
+    assert (empty.final_equity, empty.total_return) == (1_00_000.0, 0.0)
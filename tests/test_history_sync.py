@@ -0,0 +1,80 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+import polars as pl
+
+from backend.core.data.calendar import TradingCalendar
+from backend.core.data.parquet_store import ParquetMarketData
+from backend.core.data.providers.motilal_async import MotilalAPIError
+from backend.core.data.sync import HistorySync
+
+# Friday to Wednesday, with Monday an exchange holiday.
+FRIDAY = datetime(2024, 1, 5)
+CALENDAR = TradingCalendar(holidays=frozenset({date(2024, 1, 8)}))
+
+
+class _Unused:
+    def historical(self, symbol, start, end):
+        raise AssertionError(f"unexpected upstream fetch of {symbol}")
+
+
+class _Client:
+    """Returns three 5-minute candles from the start of each requested range."""
+
+    def __init__(self, failing=()) -> None:
+        self.requests: list[tuple[str, datetime, datetime]] = []
+        self.failing = set(failing)
+
+    async def history_frame(self, symbol, start, end, interval_minutes):
+        self.requests.append((symbol, start, end))
+        if symbol in self.failing:
+            self.failing.discard(symbol)
+            raise MotilalAPIError("HTTP 503")
+        timestamps = [start + timedelta(minutes=interval_minutes * i) for i in range(3)]
+        return pl.DataFrame({"timestamp": timestamps, "price": [100.0, 101.0, 102.0]})
+
+
+def _sync(tmp_path, client, max_days_per_request=1):
+    store = ParquetMarketData(_Unused(), tmp_path, interval="5m", calendar=CALENDAR)
+    return HistorySync(store, client, 5, max_days_per_request)
+
+
+def test_only_missing_trading_sessions_are_requested(tmp_path):
+    client = _Client()
+    sync = _sync(tmp_path, client)
+    window = (FRIDAY, FRIDAY + timedelta(days=5))
+
+    report = asyncio.run(sync.run(["AAA"], *window))
+    assert [(start, end) for _, start, end in client.requests] == [
+        (datetime(2024, 1, 5, 9, 15), datetime(2024, 1, 5, 15, 30)),
+        (datetime(2024, 1, 9, 9, 15), datetime(2024, 1, 9, 15, 30)),
+    ]
+    assert (report.requests, report.rows, report.failed) == (2, 6, [])
+
+    # Covered now, weekend and holiday included: nothing to fetch.
+    assert asyncio.run(sync.run(["AAA"], *window)).requests == 0
+    assert sync.store.history_frame("AAA", *window).height == 6
+
+    # A day later only the new session is requested.
+    asyncio.run(sync.run(["AAA"], window[0], window[1] + timedelta(days=1)))
+    assert client.requests[-1][1:] == (datetime(2024, 1, 10, 9, 15), datetime(2024, 1, 10, 15, 30))
+    assert len(client.requests) == 3
+
+    # Wider requests join neighbouring sessions.
+    assert _sync(tmp_path / "joined", client, max_days_per_request=30)._requests([window]) == [
+        (datetime(2024, 1, 5, 9, 15), datetime(2024, 1, 9, 15, 30))
+    ]
+
+
+def test_failed_symbols_stay_missing(tmp_path):
+    client = _Client(failing={"BBB"})
+    sync = _sync(tmp_path, client, max_days_per_request=30)
+    window = (FRIDAY, FRIDAY + timedelta(days=1))
+
+    report = asyncio.run(sync.run(["AAA", "BBB"], *window))
+    assert report.failed == ["BBB"]
+    assert report.symbols[1].error == "HTTP 503"
+    assert not list(tmp_path.glob("symbol=BBB/*/date=*"))
+
+    retry = asyncio.run(sync.run(["AAA", "BBB"], *window))
+    assert [(result.symbol, result.requests, result.rows) for result in retry.symbols] == [("AAA", 0, 0), ("BBB", 1, 3)]
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+
+from backend.core.backtesting.runner import BacktestConfig, BacktestRunner
+from backend.core.backtesting.vectorized import SymbolHistory
+from backend.core.data.indicator_cache import IndicatorCache
+from backend.strategies import indicators as ind
+
+PRICES = 500.0 + np.cumsum(np.random.default_rng(3).normal(0, 1.0, 2_000))
+
+
+def _frame(prices=PRICES) -> pl.DataFrame:
+    base = datetime(2024, 1, 1, 9, 15)
+    return pl.DataFrame({"timestamp": [base + timedelta(seconds=i) for i in range(len(prices))], "price": prices})
+
+
+def test_second_lookup_is_a_memory_mapped_hit(tmp_path):
+    cache = IndicatorCache(tmp_path, max_bytes=10_000_000)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ind.sma(PRICES, 20)
+
+    first = cache.get_or_compute("AAA", "tick", "sma", {"period": 20}, "v1", compute)
+    second = cache.get_or_compute("AAA", "tick", "sma", {"period": 20}, "v1", compute)
+
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert isinstance(second, np.memmap)
+    assert not second.flags.writeable
+    np.testing.assert_array_equal(first, ind.sma(PRICES, 20))
+
+    cache.get_or_compute("AAA", "tick", "sma", {"period": 20}, "v2", compute)
+    cache.get_or_compute("AAA", "tick", "sma", {"period": 21}, "v1", compute)
+    assert len(calls) == 3
+
+
+def test_least_recently_used_columns_are_evicted_over_budget(tmp_path):
+    column = np.zeros(1_000)
+    cache = IndicatorCache(tmp_path, max_bytes=3 * (column.nbytes + 256))
+    keys = [cache.key("AAA", "tick", "sma", {"period": period}, "v1") for period in range(4)]
+    for key in keys[:3]:
+        cache.put(key, column)
+    cache.get(keys[0])
+    cache.put(keys[3], column)
+
+    assert len(cache) == 3
+    assert cache.evictions == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.size_bytes <= cache.max_bytes
+
+
+def test_index_is_rebuilt_from_disk(tmp_path):
+    key = IndicatorCache.key("AAA", "5m", "rsi", {"period": 14}, "v1")
+    IndicatorCache(tmp_path, max_bytes=10_000_000).put(key, ind.rsi(PRICES, 14))
+
+    reopened = IndicatorCache(tmp_path, max_bytes=10_000_000)
+
+    assert len(reopened) == 1
+    np.testing.assert_array_equal(reopened.get(key), ind.rsi(PRICES, 14))
+
+
+def test_columns_stored_by_one_instance_are_hits_in_another(tmp_path):
+    key = IndicatorCache.key("AAA", "tick", "ema", {"period": 9}, "v1")
+    writer = IndicatorCache(tmp_path, max_bytes=10_000_000)
+    reader = IndicatorCache(tmp_path, max_bytes=10_000_000)
+    assert reader.get(key) is None
+
+    writer.put(key, ind.ema(PRICES, 9))
+
+    np.testing.assert_array_equal(reader.get(key), ind.ema(PRICES, 9))
+    assert (reader.hits, reader.misses) == (1, 1)
+    assert reader.size_bytes == writer.size_bytes > 0
+
+    # Another process over its budget evicts the shared column for everyone.
+    IndicatorCache(tmp_path, max_bytes=1).put(IndicatorCache.key("AAA", "tick", "ema", {"period": 10}, "v1"), PRICES)
+    assert len(writer) == len(reader) == 1
+    assert writer.get(key) is None
+
+
+def test_precompute_matches_batch_and_keys_on_the_data(tmp_path):
+    cache = IndicatorCache(tmp_path, max_bytes=10_000_000)
+
+    cached = ind.precompute(_frame(), "zscore", symbol="AAA", cache=cache, period=30)
+    again = ind.precompute(_frame(), "zscore", symbol="AAA", cache=cache, period=30)
+    shifted = ind.precompute(_frame(PRICES + 1.0), "ema", symbol="AAA", cache=cache, period=30)
+
+    np.testing.assert_array_equal(cached, ind.zscore(PRICES, 30))
+    np.testing.assert_array_equal(again, cached)
+    np.testing.assert_allclose(shifted, ind.ema(PRICES + 1.0, 30))
+    assert (cache.hits, cache.misses) == (1, 2)
+    with pytest.raises(ValueError):
+        ind.precompute(_frame(), "macd", symbol="AAA")
+
+
+def test_runner_indicator_column_uses_the_configured_cache(tmp_path):
+    cache = IndicatorCache(tmp_path, max_bytes=10_000_000)
+    runner = BacktestRunner(data_provider=None)
+    config = BacktestConfig(
+        strategy_id="cache",
+        symbols=["AAA"],
+        start=datetime(2024, 1, 1),
+        end=datetime(2024, 1, 2),
+        indicator_cache=cache,
+    )
+    history = SymbolHistory("AAA", _frame())
+
+    first = runner.indicator_column(config, history, "sma", {"period": 10}, lambda: ind.sma(history.prices, 10))
+    second = runner.indicator_column(config, SymbolHistory("AAA", _frame()), "sma", {"period": 10}, lambda: 1 / 0)
+
+    np.testing.assert_array_equal(first, second)
+    assert cache.hits == 1
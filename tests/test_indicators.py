@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+from statistics import mean
+
+import numpy as np
+import polars as pl
+import pytest
+
+from backend.core.data import MarketDataEvent
+from backend.strategies import MeanReversionStrategy, StrategyContext
+from backend.strategies import indicators as ind
+
+PRICES = 2_000.0 + np.cumsum(np.random.default_rng(11).normal(0, 1.5, 5_000))
+VOLUME = np.random.default_rng(12).integers(0, 500, 5_000).astype(float)
+
+
+def _stream(indicator, *columns):
+    return np.array([indicator.update(*values) for values in zip(*columns)])
+
+
+@pytest.mark.parametrize(
+    ("streaming", "batch"),
+    [
+        (lambda: ind.SMA(20), lambda p: ind.sma(p, 20)),
+        (lambda: ind.EMA(20), lambda p: ind.ema(p, 20)),
+        (lambda: ind.RollingStd(30), lambda p: ind.rolling_std(p, 30)),
+        (lambda: ind.RollingStd(30, ddof=1), lambda p: ind.rolling_std(p, 30, ddof=1)),
+        (lambda: ind.ZScore(30), lambda p: ind.zscore(p, 30)),
+        (lambda: ind.RSI(14), lambda p: ind.rsi(p, 14)),
+    ],
+)
+def test_streaming_indicators_match_batch_series(streaming, batch):
+    expected = batch(pl.Series(PRICES))
+    np.testing.assert_allclose(_stream(streaming(), PRICES), expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(batch(PRICES), expected, equal_nan=True)
+
+
+def test_bar_and_volume_indicators_match_batch_series():
+    high, low = PRICES + 2.0, PRICES - 2.5
+    np.testing.assert_allclose(_stream(ind.ATR(14), high, low, PRICES), ind.atr(high, low, PRICES, 14), equal_nan=True)
+    np.testing.assert_allclose(_stream(ind.VWAP(), PRICES, VOLUME), ind.vwap(PRICES, VOLUME), equal_nan=True)
+
+    bands = ind.BollingerBands(20, 2.0)
+    streamed = np.array([bands.update(price) for price in PRICES])
+    for column, expected in zip(streamed.T, ind.bollinger(PRICES, 20, 2.0)):
+        np.testing.assert_allclose(column, expected, rtol=1e-9, equal_nan=True)
+
+
+def test_warm_up_and_ring_buffer_order():
+    sma = ind.SMA(3)
+    assert np.isnan(sma.update(1.0)) and np.isnan(sma.update(2.0)) and not sma.ready
+    assert sma.update(6.0) == 3.0 and sma.ready
+
+    buffer = ind.RingBuffer(3)
+    for value in (1.0, 2.0, 3.0, 4.0):
+        buffer.push(value)
+    assert buffer.values().tolist() == [2.0, 3.0, 4.0]
+
+
+@pytest.mark.parametrize("period", [2, 3, 5, 14, 40, 203])
+def test_rolling_indicators_track_batch_on_flat_and_tick_rounded_prices(period):
+    walk = np.round((100.0 + np.cumsum(np.random.default_rng(period).normal(0, 0.3, 5_000))) / 0.05) * 0.05
+    prices = np.round(np.concatenate((walk, np.full(period + 5, 96.7))), 2)
+    streamed = _stream(ind.SMA(period), prices)
+
+    np.testing.assert_allclose(streamed, ind.sma(prices, period), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(streamed[-6:], 96.7, rtol=1e-12)
+    # A deviation is the root of a cancelling sum, so near zero only its absolute error is small.
+    stds = _stream(ind.RollingStd(period), prices)
+    np.testing.assert_allclose(stds, ind.rolling_std(prices, period), rtol=1e-9, atol=1e-6, equal_nan=True)
+    np.testing.assert_allclose(stds[-6:], 0.0, atol=1e-6)
+
+
+def test_mean_reversion_signals_match_full_window_mean():
+    strategy = MeanReversionStrategy(lookback=10)
+    context = StrategyContext(strategy_id="mr", symbols=["AAA"])
+    start = datetime(2024, 1, 1, 9, 15)
+    prices = 100.0 + np.cumsum(np.random.default_rng(13).normal(0, 0.6, 500))
+    sides = []
+    expected = []
+    for i, price in enumerate(prices):
+        event = MarketDataEvent(symbol="AAA", timestamp=start + timedelta(seconds=i), price=float(price))
+        sides.extend(order.side.value for order in strategy.on_tick(context, event))
+        if i >= 9:
+            average = mean(prices[i - 9 : i + 1])
+            if price < average * 0.995:
+                expected.append("BUY")
+            elif price > average * 1.005:
+                expected.append("SELL")
+    assert sides == expected and sides
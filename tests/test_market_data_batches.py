@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import polars as pl
+
+from backend.core.backtesting.merge import merge_histories
+from backend.core.backtesting.runner import BacktestConfig, BacktestRunner
+from backend.core.data import MarketDataEvent
+from backend.core.data.batches import MarketDataBatch, iter_events, ns_to_datetime, replay_batches
+from backend.core.data.frames import FrameMarketData
+
+BASE = datetime(2024, 1, 1, 9, 15)
+
+
+class _EventProvider:
+    """Per-event provider with shared timestamps across symbols and repeated ones within a symbol."""
+
+    steps = {"AAA": 2, "BBB": 3, "CCC": 1}
+
+    def historical(self, symbol, start, end):
+        for i in range(40):
+            # Every fifth tick is repeated, so runs of equal timestamps straddle small batches.
+            for repeat in range(2 if i % 5 == 0 else 1):
+                price = 100.0 + np.sin(i / 3.0 + len(symbol)) * 5 + repeat
+                yield MarketDataEvent(symbol=symbol, timestamp=BASE + timedelta(minutes=i * self.steps[symbol]), price=price)
+
+
+def _key(events):
+    return [(event.symbol, event.timestamp, event.price) for event in events]
+
+
+def test_batched_replay_matches_event_merge():
+    provider = _EventProvider()
+    symbols = ["AAA", "BBB", "CCC"]
+    window = (BASE, BASE + timedelta(days=1))
+    expected = _key(merge_histories(provider, symbols, *window))
+
+    for batch_size in (1, 3, 7, 1_000):
+        assert _key(iter_events(replay_batches(provider, symbols, *window, batch_size=batch_size))) == expected
+
+    frames = {}
+    for symbol in symbols:
+        events = list(provider.historical(symbol, *window))
+        frames[symbol] = pl.DataFrame({"timestamp": [e.timestamp for e in events], "price": [e.price for e in events]})
+    frames = FrameMarketData(frames)
+    assert _key(iter_events(replay_batches(frames, symbols, *window, batch_size=4))) == expected
+
+
+def test_aware_timestamps_round_trip():
+    tz = timezone(timedelta(hours=5, minutes=30))
+    events = [MarketDataEvent(symbol="AAA", timestamp=datetime(2024, 1, 2, 9, 15, 0, 250, tzinfo=tz), price=1.0)]
+    batch = MarketDataBatch.from_events(events, ["AAA"])
+
+    assert batch.timestamp_at(0) == events[0].timestamp
+    assert batch.timestamp_at(0).tzinfo == tz
+    assert ns_to_datetime(int(batch.timestamps_ns[0])) == datetime(2024, 1, 2, 3, 45, 0, 250)
+
+
+def test_runner_results_do_not_depend_on_batch_size():
+    provider = _EventProvider()
+    legs = [
+        {"symbol": "AAA", "side": "BUY", "quantity": 2, "exit_target": 3.0, "exit_stop_loss": 2.0},
+        {"symbol": "BBB", "side": "SELL", "quantity": 1, "time_based_exit_minutes": 10},
+        {"symbol": "CCC", "side": "BUY", "quantity": 1, "trailing_stop_points": 1.5},
+    ]
+
+    def run(batch_size):
+        config = BacktestConfig(
+            strategy_id="batches",
+            symbols=["AAA", "BBB", "CCC"],
+            start=BASE,
+            end=BASE + timedelta(days=1),
+            legs=legs,
+            batch_size=batch_size,
+        )
+        return BacktestRunner(provider).run(config)
+
+    small, large = run(3), run(10_000)
+    assert [trade.fills for trade in small.trades] == [trade.fills for trade in large.trades]
+    assert any(trade.order.metadata.get("exit_reason") == "TIME_BASED" for trade in small.trades)
+    assert small.equity_curve.equals(large.equity_curve)
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.core.data.providers.motilal_async import AsyncMotilalClient, MotilalAPIError, TokenBucket
+
+
+class _MockMotilal(BaseHTTPRequestHandler):
+    """Broker stand-in: answers after a short delay, tracking concurrency and failing on demand."""
+
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    attempts: dict[str, int] = {}
+    flaky = {"FLAKY": 2}  # symbol -> leading attempts answered with 503
+    broken = {"BROKEN"}
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        symbol = payload["symbol"]
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+            cls.attempts[symbol] = cls.attempts.get(symbol, 0) + 1
+            attempt = cls.attempts[symbol]
+        time.sleep(0.02)
+        with cls.lock:
+            cls.in_flight -= 1
+
+        if symbol in cls.broken or attempt <= cls.flaky.get(symbol, 0):
+            self._reply(503 if symbol not in cls.broken else 500, {"status": "ERROR"})
+        elif self.path.endswith("getcandledata"):
+            rows = [{"timestamp": f"2024-01-01 09:{15 + i}:00", "close": 100.0 + i} for i in range(3)]
+            self._reply(200, {"status": "SUCCESS", "data": rows})
+        else:
+            self._reply(200, {"status": "SUCCESS", "data": {"name": symbol.title(), "ticksize": 0.05}})
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def api_base():
+    _MockMotilal.in_flight = _MockMotilal.peak = 0
+    _MockMotilal.attempts = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MockMotilal)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _client(api_base, **options):
+    options = {"requests_per_second": 1_000.0, "burst": 100, "max_concurrency": 4, "backoff_seconds": 0.01, **options}
+    return AsyncMotilalClient({"ApiKey": "test"}, api_base, **options)
+
+
+def test_batch_refresh_is_concurrent_bounded_and_retried(api_base):
+    symbols = [f"SYM{i}" for i in range(20)] + ["FLAKY", "BROKEN"]
+
+    async def refresh():
+        async with _client(api_base) as client:
+            return await client.instrument_metadata_many(symbols), list(client.timings)
+
+    results, timings = asyncio.run(refresh())
+
+    assert results["SYM3"] == {"name": "Sym3", "ticksize": 0.05, "symbol": "SYM3"}
+    assert results["FLAKY"]["symbol"] == "FLAKY"
+    assert isinstance(results["BROKEN"], MotilalAPIError)
+    assert 1 < _MockMotilal.peak <= 4
+    assert {timing.attempts for timing in timings if timing.status == 200} == {1, 3}
+    assert _MockMotilal.attempts["BROKEN"] == 4  # the first try and three retries
+
+
+def test_token_bucket_paces_requests(api_base):
+    async def fetch():
+        async with _client(api_base, requests_per_second=50.0, burst=5, max_concurrency=8) as client:
+            await client.instrument_metadata_many(f"SYM{i}" for i in range(25))
+
+    started = time.perf_counter()
+    asyncio.run(fetch())
+    assert time.perf_counter() - started >= (25 - 5) / 50.0 * 0.9
+
+    async def burst():
+        bucket = TokenBucket(rate=10.0, capacity=3)
+        started = time.perf_counter()
+        for _ in range(3):
+            await bucket.acquire()
+        return time.perf_counter() - started
+
+    assert asyncio.run(burst()) < 0.05
+
+
+def test_history_frames_parse_candles(api_base):
+    async def fetch():
+        async with _client(api_base) as client:
+            return await client.history_frames(["AAA", "BBB"], datetime(2024, 1, 1), datetime(2024, 1, 2), 1)
+
+    frames = asyncio.run(fetch())
+
+    assert frames["AAA"]["price"].to_list() == [100.0, 101.0, 102.0]
+    assert frames["BBB"]["timestamp"][0] == datetime(2024, 1, 1, 9, 15)
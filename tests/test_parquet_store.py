@@ -0,0 +1,97 @@
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+
+from backend.core.data import MarketDataEvent
+from backend.core.data.parquet_store import ParquetMarketData, merge_ranges, missing_ranges
+
+START = datetime(2024, 1, 1, 9, 15)
+
+
+class _Upstream:
+    """Minute ticks over six days; records every range it is asked for."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[datetime, datetime]] = []
+        timestamps = [START + timedelta(days=day, minutes=minute) for day in range(6) for minute in range(375)]
+        prices = 100.0 + np.cumsum(np.random.default_rng(1).normal(0, 0.2, len(timestamps)))
+        self.frame = pl.DataFrame({"timestamp": timestamps, "price": prices})
+
+    def historical(self, symbol, start, end):
+        self.requests.append((start, end))
+        window = self.frame.filter(pl.col("timestamp").is_between(start, end))
+        for timestamp, price in window.iter_rows():
+            yield MarketDataEvent(symbol=symbol, timestamp=timestamp, price=price)
+
+
+def test_reads_match_upstream_and_only_missing_ranges_are_fetched(tmp_path):
+    upstream = _Upstream()
+    store = ParquetMarketData(upstream, tmp_path, interval="1m")
+    first = (START + timedelta(days=1, hours=2), START + timedelta(days=3, hours=1))
+
+    window = store.history_frame("AAA", *first)
+    expected = upstream.frame.filter(pl.col("timestamp").is_between(*first))
+    assert window.equals(expected.with_columns(pl.col("timestamp").dt.cast_time_unit("us")))
+    assert upstream.requests == [first]
+    assert sorted(path.parent.name for path in tmp_path.rglob("data.parquet")) == [
+        "date=2024-01-02",
+        "date=2024-01-03",
+        "date=2024-01-04",
+    ]
+
+    wider = (START, START + timedelta(days=5, hours=7))
+    events = list(store.historical("AAA", *wider))
+    assert upstream.requests[1:] == [(wider[0], first[0]), (first[1], wider[1])]
+    assert [event.price for event in events] == upstream.frame["price"].to_list()
+    assert len({event.timestamp for event in events}) == len(events)
+
+    # Fully covered: served from Parquet without touching the upstream provider.
+    inner = (START + timedelta(days=2), START + timedelta(days=4, minutes=30))
+    assert store.history_frame("AAA", *inner).height == 375 * 2 + 31
+    assert len(upstream.requests) == 3
+
+
+def test_different_symbols_are_fetched_concurrently(tmp_path):
+    both_fetching = threading.Barrier(2, timeout=5)
+
+    class _Blocking(_Upstream):
+        def historical(self, symbol, start, end):
+            both_fetching.wait()  # broken, and raising, if the other symbol's fetch is held back
+            return super().historical(symbol, start, end)
+
+    store = ParquetMarketData(_Blocking(), tmp_path, interval="1m")
+    window = (START, START + timedelta(hours=1))
+    threads = [threading.Thread(target=store.ensure, args=(symbol, *window)) for symbol in ("AAA", "BBB")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not both_fetching.broken
+    assert store.upstream_fetches == 2
+    assert store.history_frame("BBB", *window).height == 61
+
+
+def test_data_version_tracks_stored_partitions(tmp_path):
+    store = ParquetMarketData(_Upstream(), tmp_path)
+    window = (START, START + timedelta(days=1))
+    version = store.data_version("AAA", *window)
+
+    assert store.data_version("AAA", *window) == version
+    store.invalidate("AAA")
+    assert not list(tmp_path.rglob("data.parquet"))
+    store.history_frame("AAA", START + timedelta(days=1), START + timedelta(days=2))
+    assert store.data_version("AAA", *window) != version
+
+
+def test_range_arithmetic():
+    t = [START + timedelta(hours=hour) for hour in range(10)]
+    covered = merge_ranges([(t[5], t[6]), (t[1], t[2]), (t[2], t[3])])
+
+    assert covered == [(t[1], t[3]), (t[5], t[6])]
+    assert missing_ranges(covered, t[0], t[9]) == [(t[0], t[1]), (t[3], t[5]), (t[6], t[9])]
+    assert missing_ranges(covered, t[1], t[3]) == []
+    assert missing_ranges(covered, t[4], t[4]) == [(t[4], t[4])]
+    assert missing_ranges(covered, t[2], t[6]) == [(t[3], t[5])]
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+import polars as pl
+import pytest
+
+from backend.core.data import MarketDataEvent
+from backend.core.data.bars import Timeframe, iter_bars
+from backend.core.data.parquet_store import ParquetMarketData
+from backend.core.data.resample import BarResampler, resample_bars
+from backend.core.data.synthetic import SyntheticMarketData
+
+START = datetime(2024, 1, 1)
+
+
+def _ticks() -> pl.DataFrame:
+    frame = SyntheticMarketData(seed=4, interval=timedelta(seconds=20)).history_frame("AAA", START, START + timedelta(days=3))
+    outside = pl.DataFrame(
+        {
+            "timestamp": [datetime(2024, 1, 1, 9, 0), datetime(2024, 1, 2, 15, 45)],
+            "price": [1.0, 2.0],
+            "volume": [5.0, 5.0],
+        }
+    ).with_columns(pl.col("timestamp").dt.cast_time_unit("us"))
+    return pl.concat([frame, outside]).sort("timestamp")
+
+
+@pytest.mark.parametrize("timeframe", list(Timeframe))
+def test_resampled_bars_match_streaming_aggregation(timeframe):
+    ticks = _ticks()
+    events = (MarketDataEvent(symbol="AAA", timestamp=t, price=p) for t, p in ticks.select("timestamp", "price").iter_rows())
+    expected = [(b.start, b.end, b.open, b.high, b.low, b.close, b.ticks) for b in iter_bars(events, timeframe)]
+
+    bars = resample_bars(ticks, timeframe)
+    assert bars.drop("volume").rows() == expected
+    assert bars["volume"].sum() == ticks["volume"].sum() - 10.0
+
+
+def test_cached_bars_are_extended_from_the_last_session(tmp_path):
+    upstream = SyntheticMarketData(seed=2, interval=timedelta(minutes=1))
+    store = ParquetMarketData(upstream, tmp_path, interval="1m")
+    resampler = BarResampler(store, base_interval=timedelta(minutes=1))
+    first_end, later_end = datetime(2024, 1, 4, 23, 59), datetime(2024, 1, 8, 23, 59)
+
+    bars = resampler.bars("AAA", Timeframe.M15, START, first_end)
+    assert resampler.bars("AAA", Timeframe.M15, START, first_end) is bars
+    assert (resampler.misses, resampler.hits) == (1, 1)
+
+    extended = resampler.bars("AAA", Timeframe.M15, START, later_end)
+    assert resampler.extensions == 1
+    fresh = resample_bars(upstream.history_frame("AAA", START, later_end), Timeframe.M15)
+    assert extended.drop("volume").equals(fresh.drop("volume"))  # the store keeps prices only
+    assert extended.filter(pl.col("start") < datetime(2024, 1, 4)).equals(bars.filter(pl.col("start") < datetime(2024, 1, 4)))
+
+    store.invalidate("AAA")  # the prefix changes, so the next read starts over
+    resampler.bars("AAA", Timeframe.M15, START, datetime(2024, 1, 9, 23, 59))
+    assert (resampler.misses, resampler.extensions) == (2, 1)
+
+    daily = resampler.bars("AAA", Timeframe.D1, START, later_end)
+    assert daily.height == 6 and daily["ticks"].to_list() == [376] * 6
+    with pytest.raises(ValueError):
+        BarResampler(store, base_interval=timedelta(minutes=5)).bars("AAA", Timeframe.M1, START, later_end)
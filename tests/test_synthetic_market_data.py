@@ -0,0 +1,87 @@
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+import polars as pl
+
+from backend.core.backtesting.equity import EquitySampling
+from backend.core.backtesting.runner import BacktestConfig, BacktestRunner
+from backend.core.data.batches import replay_batches
+from backend.core.data.calendar import TradingCalendar
+from backend.core.data.frames import FrameMarketData
+from backend.core.data.synthetic import SyntheticMarketData
+
+# Friday to the following Wednesday, with Monday a holiday.
+START, END = datetime(2024, 1, 5), datetime(2024, 1, 10, 23, 59)
+CALENDAR = TradingCalendar(holidays=frozenset({date(2024, 1, 8)}))
+
+
+def test_ticks_are_deterministic_and_only_inside_sessions():
+    provider = SyntheticMarketData(seed=7, interval=timedelta(seconds=30), jump_intensity=2.0, calendar=CALENDAR)
+    frame = provider.history_frame("AAA", START, END)
+
+    days = frame["timestamp"].dt.date().unique(maintain_order=True).to_list()
+    assert days == [date(2024, 1, 5), date(2024, 1, 9), date(2024, 1, 10)]
+    assert frame.height == 3 * 751
+    times = frame["timestamp"].dt.time()
+    assert times.min() == time(9, 15) and times.max() == time(15, 30)
+    assert (frame["price"] > 0).all() and (frame["volume"] >= 1).all()
+
+    # Each session opens where the previous one closed.
+    sessions = frame.group_by(pl.col("timestamp").dt.date(), maintain_order=True).agg(
+        pl.col("price").first().alias("open"), pl.col("price").last().alias("close")
+    )
+    assert np.allclose(sessions["open"][1:].to_numpy(), sessions["close"][:-1].to_numpy())
+
+    window = (datetime(2024, 1, 9, 11, 2, 10), datetime(2024, 1, 10, 10))
+    again = SyntheticMarketData(seed=7, interval=timedelta(seconds=30), jump_intensity=2.0, calendar=CALENDAR)
+    assert again.history_frame("AAA", *window).equals(frame.filter(pl.col("timestamp").is_between(*window)))
+    assert not provider.history_frame("BBB", START, END)["price"].equals(frame["price"])
+    assert provider.data_version("AAA", START, END) == again.data_version("BBB", *window)
+    assert provider.data_version("AAA", START, END) != SyntheticMarketData(seed=8).data_version("AAA", START, END)
+
+    small = [len(batch) for batch in provider.history_batches("AAA", START, END, batch_size=500)]
+    assert small == [500] * 4 + [253]
+
+
+def test_daily_returns_and_intraday_smile_follow_the_parameters():
+    provider = SyntheticMarketData(seed=3, interval=timedelta(minutes=1), volatility=0.3, jump_intensity=0.0, smile=3.0)
+    frame = provider.history_frame("AAA", datetime(2020, 1, 1), datetime(2023, 12, 31, 23, 59))
+    closes = frame.group_by(pl.col("timestamp").dt.date(), maintain_order=True).agg(pl.col("price").last())["price"]
+    assert abs(np.diff(np.log(closes.to_numpy())).std() * np.sqrt(252) - 0.3) < 0.02
+
+    moves = frame.select(
+        pl.col("timestamp").dt.time().alias("time"), pl.col("price").log().diff().abs().alias("move")
+    ).filter(pl.col("time") > time(9, 15))
+    open_move = moves.filter(pl.col("time") < time(9, 45))["move"].mean()
+    midday_move = moves.filter(pl.col("time").is_between(time(12, 10), time(12, 40)))["move"].mean()
+    assert open_move > 1.7 * midday_move
+
+
+def test_runner_streams_synthetic_batches():
+    provider = SyntheticMarketData(seed=1, interval=timedelta(seconds=15), jump_intensity=1.0, calendar=CALENDAR)
+    symbols = ["AAA", "BBB", "CCC"]
+    batches = list(replay_batches(provider, symbols, START, END, batch_size=1_000))
+    assert max(len(batch) for batch in batches) <= 3 * 1_000  # one batch per symbol per merge round
+    assert sum(len(batch) for batch in batches) == 3 * 3 * 1_501
+
+    legs = [
+        {"symbol": "AAA", "side": "BUY", "quantity": 1, "exit_target": 0.5, "exit_stop_loss": 0.5},
+        {"symbol": "BBB", "side": "SELL", "quantity": 1, "trailing_stop_points": 0.3},
+    ]
+
+    def run(data):
+        config = BacktestConfig(
+            strategy_id="synthetic",
+            symbols=symbols,
+            start=START,
+            end=END,
+            legs=legs,
+            equity_sampling=EquitySampling.BAR,
+            batch_size=2_048,
+        )
+        return BacktestRunner(data).run(config)
+
+    streamed = run(provider)
+    loaded = run(FrameMarketData({symbol: provider.history_frame(symbol, START, END) for symbol in symbols}))
+    assert streamed.trades and [t.fills for t in streamed.trades] == [t.fills for t in loaded.trades]
+    assert streamed.equity_curve.equals(loaded.equity_curve)
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+import polars as pl
+
+from backend.app.schemas.backtests import BacktestRequest
+from backend.app.services.backtesting import BacktestingService
+from backend.core.backtesting.runner import BacktestConfig, BacktestRunner, ExecutionMode
+from backend.core.data.frames import FrameMarketData
+from backend.core.execution.ledger import LEDGER_SCHEMA, leg_round_trips
+
+START = datetime(2024, 1, 1, 9, 15)
+PRICES = [100.0, 101.0, 102.5, 102.0, 99.0, 100.0, 103.0]
+LEGS = [
+    {"symbol": "AAA", "side": "BUY", "quantity": 10, "exit_target": 2.0},
+    {"symbol": "AAA", "side": "SELL", "quantity": 4, "exit_stop_loss": 2.5},
+]
+
+
+def _provider() -> FrameMarketData:
+    frame = pl.DataFrame({"timestamp": [START + timedelta(minutes=i) for i in range(len(PRICES))], "price": PRICES})
+    return FrameMarketData({"AAA": frame})
+
+
+def _run(mode: ExecutionMode = ExecutionMode.EVENT):
+    config = BacktestConfig("ledger", ["AAA"], datetime(2024, 1, 1), datetime(2024, 1, 2), legs=LEGS, execution_mode=mode)
+    return BacktestRunner(_provider()).run(config)
+
+
+def test_ledger_records_fills_with_leg_ids_and_simulated_times(tmp_path):
+    ledger = _run().ledger.to_frame()
+
+    assert ledger.schema == pl.Schema(LEDGER_SCHEMA)
+    assert ledger.rows()[:3] == [
+        ("LEG-1-ENTRY", "AAA-BUY", "AAA", "BUY", 10, 100.0, START, None),
+        ("LEG-2-ENTRY", "AAA-SELL", "AAA", "SELL", 4, 100.0, START, None),
+        ("LEG-AAA-BUY-EXIT", "AAA-BUY", "AAA", "SELL", 10, 102.5, START + timedelta(minutes=2), "TARGET"),
+    ]
+    assert ledger.equals(_run(ExecutionMode.VECTORIZED).ledger.to_frame())
+
+    _run().ledger.write_parquet(tmp_path / "ledger.parquet")
+    _run().ledger.write_ipc(tmp_path / "ledger.arrow")
+    assert pl.read_parquet(tmp_path / "ledger.parquet").equals(ledger)
+    assert pl.read_ipc(tmp_path / "ledger.arrow").equals(ledger)
+
+
+def test_round_trips_pair_entries_with_exits():
+    trips = leg_round_trips(_run().ledger.to_frame())
+    buy = trips.filter(pl.col("leg_id") == "AAA-BUY")
+
+    assert buy["entry_price"].to_list()[0] == 100.0
+    assert buy["exit_reason"].to_list()[0] == "TARGET"
+    assert buy["pnl"].to_list()[0] == 25.0
+    assert trips["pnl"].null_count() == 0  # every leg is closed by END_OF_BACKTEST
+
+
+def test_leg_results_and_trade_counts_come_from_the_ledger():
+    request = BacktestRequest(
+        strategy_id="ledger", symbols=["AAA"], start=datetime(2024, 1, 1), end=datetime(2024, 1, 2), legs=LEGS
+    )
+    artifacts = BacktestingService(BacktestRunner(_provider())).run_with_artifacts(request)
+    trips = leg_round_trips(artifacts.trades)
+
+    metrics = artifacts.response.metrics
+    assert metrics.total_trades == artifacts.trades.height
+    assert metrics.winning_trades == (trips["pnl"] > 0).sum()
+    assert metrics.losing_trades == (trips["pnl"] < 0).sum()
+    for leg in artifacts.response.leg_results:
+        leg_trips = trips.filter(pl.col("leg_id") == f"{leg.symbol}-{leg.side}")
+        assert leg.pnl == leg_trips["pnl"].sum()
+        assert leg.exit_reason == leg_trips["exit_reason"].last()
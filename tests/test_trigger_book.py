@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from backend.core.execution.engine import SimulationEngine
+from backend.core.execution.models import OrderSide, OrderType, SimulationOrder
+from backend.core.portfolio.account import AccountState, PortfolioManager
+
+START = datetime(2024, 1, 1, 9, 15)
+
+
+def _engine() -> SimulationEngine:
+    return SimulationEngine(PortfolioManager(AccountState(cash_balance=10_000_000.0)))
+
+
+def test_a_tick_fills_triggered_orders_in_price_time_priority():
+    engine = _engine()
+    for order_id, side, order_type, price in [
+        ("bl-99", OrderSide.BUY, OrderType.LIMIT, 99.0),
+        ("bl-98", OrderSide.BUY, OrderType.LIMIT, 98.0),
+        ("bl-99-later", OrderSide.BUY, OrderType.LIMIT, 99.0),
+        ("bl-90", OrderSide.BUY, OrderType.LIMIT, 90.0),
+        ("ss-97", OrderSide.SELL, OrderType.STOP, 97.0),
+        ("sl-101", OrderSide.SELL, OrderType.LIMIT, 101.0),
+        ("other", OrderSide.BUY, OrderType.LIMIT, 99.0),
+    ]:
+        symbol = "BBB" if order_id == "other" else "AAA"
+        engine.submit_order(SimulationOrder(order_id, symbol, side, order_type, quantity=1, price=price), market_price=100.0)
+
+    results = engine.process_tick("AAA", 97.5, START)
+    assert [result.order.order_id for result in results] == ["bl-99", "bl-99-later", "bl-98"]
+    assert [result.fills[0].fill_price for result in results] == [99.0, 99.0, 98.0]
+    assert [result.order.order_id for result in engine.process_tick("AAA", 96.0, START)] == ["ss-97"]
+    assert engine.process_tick("AAA", 100.5, START) == []
+    assert list(engine.pending_orders) == ["bl-90", "sl-101", "other"]
+
+    # Resubmitting an id replaces the resting order; restoring a book re-indexes it.
+    engine.submit_order(SimulationOrder("sl-101", "AAA", OrderSide.SELL, OrderType.LIMIT, 1, price=105.0), 100.0)
+    assert engine.process_tick("AAA", 102.0, START) == []
+    restored = _engine()
+    restored.pending_orders = engine.pending_orders
+    assert [result.order.order_id for result in restored.process_tick("AAA", 105.0, START)] == ["sl-101"]
+    assert [result.order.order_id for result in restored.process_tick("BBB", 99.0, START)] == ["other"]
+
+
+def test_fills_match_a_scan_of_every_resting_order():
+    rng = np.random.default_rng(9)
+    engine = _engine()
+    resting: dict[str, SimulationOrder] = {}
+    for index in range(2_000):
+        side = OrderSide.BUY if rng.random() < 0.5 else OrderSide.SELL
+        order_type = OrderType.LIMIT if rng.random() < 0.5 else OrderType.STOP
+        offset = float(np.round(rng.uniform(0.5, 15.0), 1))
+        below = (side == OrderSide.BUY) == (order_type == OrderType.LIMIT)
+        order = SimulationOrder(
+            f"o{index}", f"S{index % 7}", side, order_type, quantity=1, price=100.0 - offset if below else 100.0 + offset
+        )
+        engine.submit_order(order, market_price=100.0)
+        resting[order.order_id] = order
+
+    prices = {f"S{index}": 100.0 for index in range(7)}
+    for tick in range(3_000):
+        symbol = f"S{rng.integers(7)}"
+        prices[symbol] = float(np.round(prices[symbol] + rng.normal(0, 0.4), 1))
+        expected = {
+            order_id
+            for order_id, order in resting.items()
+            if order.symbol == symbol and engine._determine_fill_price(order, prices[symbol]) is not None
+        }
+        filled = [result.order.order_id for result in engine.process_tick(symbol, prices[symbol], START + timedelta(seconds=tick))]
+        assert len(filled) == len(expected) and set(filled) == expected
+        for order_id in filled:
+            del resting[order_id]
+    assert engine.pending_orders.keys() == resting.keys()
+    assert len(resting) < 2_000
+
+
+def test_repricing_an_order_does_not_grow_the_book():
+    engine = _engine()
+    engine.submit_order(SimulationOrder("anchor", "AAA", OrderSide.BUY, OrderType.LIMIT, 1, price=90.0), 100.0)
+    for step in range(1_000):
+        # A trailing stop re-parked on every tick, as strategies amend resting orders.
+        stop = SimulationOrder("trail", "AAA", OrderSide.SELL, OrderType.STOP, 1, price=95.0 + step * 0.001)
+        engine.submit_order(stop, market_price=100.0)
+
+    book = engine._books["AAA"]
+    assert len(book) == 2 and sum(len(entries) for entries in book._heaps) <= 4
+    results = engine.process_tick("AAA", 89.0, START)
+    assert [result.order.order_id for result in results] == ["anchor", "trail"]
+    assert results[1].order.price == 95.0 + 999 * 0.001